@@ -46,6 +46,7 @@ INSTALLED_APPS = [
     'order',
     'kit',
     'creator',
+    'core',
 ]
 
 MIDDLEWARE = [
@@ -57,6 +58,8 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
+    'core.query_profiler.QueryProfilerMiddleware',
+    'core.nplusone.NPlusOneMiddleware',
 ]
 
 ROOT_URLCONF = 'clnass_101.urls'
@@ -157,6 +160,89 @@ AWS_SECRET_ACCESS_KEY   = my_settings.S3_SECRET_KEY
 AWS_STORAGE_BUCKET_NAME = my_settings.S3_BUCKET_NAME
 S3_BUCKET_URL           = my_settings.S3_BUCKET_URL
 
+##CACHES (문서, 좋아요 집합, 메인 피드, 변경 로그 등이 함께 사용. 여러 프로세스 실행 시 공유 캐시(memcached/redis)로 교체)
+CACHES = {
+    'default': {
+        'BACKEND'  : 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION' : 'clnass-101',
+        'TIMEOUT'  : 60 * 5,
+        'OPTIONS'  : {
+            'MAX_ENTRIES'    : 100000, # 기본값(300)이면 version 키와 변경 로그 항목이 금방 축출된다
+            'CULL_FREQUENCY' : 10,
+        },
+    }
+}
+
+##PRINCIPAL_CACHE (login_decorator 유저 캐시)
+PRINCIPAL_CACHE_MAX_SIZE = 10000
+PRINCIPAL_CACHE_TTL      = 60
+
+##ACCESS_TOKEN (True: 토큰에 유저 클레임을 담아 인증 시 DB 조회 생략, 클레임 토큰 유효 시간(초))
+ACCESS_TOKEN_CLAIMS_ENABLED = False
+ACCESS_TOKEN_CLAIMS_TTL     = 900
+
+##PASSWORD_HASHING (bcrypt 전용 워커 풀)
+BCRYPT_ROUNDS               = 12
+PASSWORD_HASHING_WORKERS    = os.cpu_count() or 1
+PASSWORD_HASHING_QUEUE_SIZE = 32
+PASSWORD_HASHING_TIMEOUT    = 10
+
+##LOGIN_THROTTLE (토큰 버킷, refill_rate: 초당 충전 토큰 수)
+LOGIN_THROTTLE_IP_CAPACITY       = 30
+LOGIN_THROTTLE_IP_REFILL_RATE    = 0.5
+LOGIN_THROTTLE_EMAIL_CAPACITY    = 5
+LOGIN_THROTTLE_EMAIL_REFILL_RATE = 1 / 30
+LOGIN_THROTTLE_CACHE_ALIAS       = None # 프로세스 간 공유 시 CACHES 의 alias 지정
+LOGIN_THROTTLE_TRUST_FORWARDED   = False
+
+##QUERY_PROFILER (요청 단위 쿼리 통계, /debug/query-stats)
+QUERY_PROFILER_SAMPLE_RATE = 0.1 # 0 ~ 1, 프로파일링할 요청 비율
+QUERY_PROFILER_WINDOW_SIZE = 1000 # 엔드포인트별 유지할 최근 요청 수
+QUERY_PROFILER_ALLOWED_IPS = ('127.0.0.1', '::1') # 통계 조회, X-Query-Profile 헤더 허용 IP
+
+##COMMUNITY (상품 상세 커뮤니티 커서 페이지네이션)
+COMMUNITY_PAGE_SIZE     = 20 # 상세 페이지에 포함되는 첫 페이지 크기, limit 기본값
+COMMUNITY_MAX_PAGE_SIZE = 100
+
+##MAIN_PAGE (메인 페이지 상품 목록 커서 페이지네이션)
+MAIN_PAGE_SIZE     = 40 # limit 기본값
+MAIN_MAX_PAGE_SIZE = 100
+
+##MAIN_FEED (메인 페이지 결과 캐시, stale-while-revalidate, product/main_feed.py)
+MAIN_FEED_CACHE_ALIAS = 'default' # 여러 프로세스 실행 시 공유 캐시(memcached/redis) 지정
+MAIN_FEED_TTL         = 30 # 초, 이 시간 동안은 캐시를 그대로 사용 (좋아요 수 반영 지연)
+MAIN_FEED_STALE_TTL   = 60 * 5 # 초, TTL 이후 이 시간 동안은 이전 결과로 응답하며 백그라운드에서 갱신
+
+##SEARCH (상품 검색 메모리 역색인, product/search.py)
+SEARCH_RESULT_LIMIT      = 100 # 검색 결과 한 페이지 최대 개수 (limit 기본값/최대값, offset 으로 다음 페이지)
+SEARCH_INDEX_CACHE_ALIAS = 'default' # 변경 로그 저장, 여러 프로세스 실행 시 공유 캐시(memcached/redis) 지정
+SEARCH_INDEX_MAX_AGE     = 60 * 60 # 초, 이 시간이 지나면 색인 전체를 다시 만듦 (signal 없는 변경의 최대 지연)
+SEARCH_INDEX_BATCH_SIZE  = 1000 # 색인 구성 시 한 번에 읽는 상품 수
+SEARCH_SUGGEST_LIMIT     = 10 # 자동완성 후보 수 limit 기본값 (최대 product/suggest_index.py MAX_SUGGESTIONS)
+SEARCH_PRICE_BUCKETS     = (0, 50000, 100000, 200000, 300000) # 가격 facet 구간 시작 값 (할인 적용 가격)
+
+##PRODUCT_DOCUMENT (상품 상세 중 유저와 무관한 부분 캐시, product/documents.py)
+PRODUCT_DOCUMENT_CACHE_ALIAS = 'default' # 여러 프로세스 실행 시 공유 캐시(memcached/redis) 지정
+PRODUCT_DOCUMENT_TTL         = 60 * 60 # 초, signal 로 무효화되지 않는 변경(카테고리명 등)의 최대 지연
+
+##RECENTLY_VIEW (최근 본 클래스 write-behind 저장, user/recently_views.py)
+RECENTLY_VIEW_BUFFER_SIZE    = 500 # 이 개수가 쌓이면 바로 저장
+RECENTLY_VIEW_FLUSH_INTERVAL = 2 # 초, None 이면 백그라운드 저장 없이 BUFFER_SIZE 도달 시에만 저장
+RECENTLY_VIEW_MAX_PER_USER   = 20 # 유저별 보관 개수
+
+##LIKED_PRODUCTS (유저별 좋아요한 상품 id 집합 캐시, user/liked_products.py)
+LIKED_PRODUCTS_CACHE_ALIAS = 'default' # 여러 프로세스 실행 시 공유 캐시(memcached/redis) 지정
+LIKED_PRODUCTS_TTL         = 60 * 10 # 초, 토글 외의 변경(유저 삭제 등)이 반영되는 최대 지연
+
+##SINGLE_FLIGHT (캐시 miss 시 같은 키의 동시 계산을 하나로 합침, core/singleflight.py)
+SINGLE_FLIGHT_TIMEOUT     = 5 # 초, 기다리던 요청이 직접 계산으로 넘어가는 시간
+SINGLE_FLIGHT_CACHE_ALIAS = None # 프로세스 간에도 합칠 때 공유 캐시(memcached/redis)의 alias 지정
+
+##N+1 QUERY DETECTION (/debug/n-plus-one)
+NPLUSONE_ENABLED   = DEBUG
+NPLUSONE_THRESHOLD = 5 # 요청 하나에서 같은 형태의 쿼리가 이 횟수를 넘으면 탐지
+NPLUSONE_RAISE     = False # True: 탐지 즉시 NPlusOneDetected 발생 (테스트용)
+
 LOGGING = {
     'disable_existing_loggers': False,
     'version': 1,
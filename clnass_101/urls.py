@@ -4,5 +4,6 @@ urlpatterns = [
     path('user', include('user.urls')),
     path('products', include('product.urls')),
     path('order', include('order.urls')),
-    path('creator', include('creator.urls'))
+    path('creator', include('creator.urls')),
+    path('debug', include('core.urls'))
 ]
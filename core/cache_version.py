@@ -0,0 +1,35 @@
+""" 캐시 무효화용 version 키
+
+    캐시 항목 키에 version 을 넣고, 무효화할 때 version 을 올려 이전 항목을 더 이상 조회하지 않는다.
+    (product/documents.py, user/liked_products.py, core/stale_cache.py)
+
+    - version 키가 축출되었을 때 1 처럼 고정된 값으로 다시 만들면, 아직 TTL 이 남은 이전 version 의 항목이
+      현재 값으로 조회된다. 없는 version 은 현재 시각(ns)으로 만들어 이전에 쓴 어떤 version 과도 겹치지 않게 한다.
+      (이전 version 은 예전 시각에서 무효화 횟수만큼만 커졌으므로 지금 시각보다 작다)
+    - 동시에 여러 곳에서 만들 때는 cache.add 로 먼저 저장한 값을 함께 사용한다.
+
+    History:
+        2026-10-18 - 초기 생성
+"""
+import time
+
+
+def get_version(cache, key):
+    """ key 의 현재 version (없으면 만들어서 저장) """
+    version = cache.get(key)
+
+    if version is None:
+        seed    = time.time_ns()
+        version = seed if cache.add(key, seed, None) else cache.get(key, seed)
+
+    return version
+
+
+def bump_version(cache, key):
+    """ version 을 올려 이전 version 의 항목을 무효화 """
+    try:
+        cache.incr(key)
+
+    except ValueError:
+        # 축출되어 없는 경우: 새 version 은 이전 version 보다 항상 크다
+        cache.add(key, time.time_ns(), None)
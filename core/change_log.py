@@ -0,0 +1,89 @@
+""" 변경 로그 (프로세스별 메모리 색인 동기화)
+
+    메모리 색인(검색 색인 등)은 프로세스마다 따로 있고 signal 은 저장한 프로세스에서만 발생한다.
+    변경된 객체 id 를 캐시에 순번과 함께 기록해 두고, 각 프로세스의 색인은
+    마지막으로 반영한 순번 이후의 변경만 읽어서 반영한다.
+
+    - 순번: <name>-seq (cache.incr), 항목: <name>:<순번> = 객체 id (ttl 초 후 만료)
+    - 순번을 올린 뒤 항목을 저장하므로, 읽는 쪽은 비어 있는 순번에서 멈추고 다음에 다시 읽는다.
+      같은 순번이 gap_grace 초가 지나도 비어 있으면(캐시 축출, 저장 실패) 잃어버린 것으로 보고 전체 재구성을 요청한다.
+    - ttl 보다 오래 동기화하지 않은 색인은 항목이 만료되었을 수 있으므로 전체를 다시 만들어야 한다.
+    - 여러 프로세스 실행 시 cache_alias 를 공유 캐시(memcached/redis)로 지정해야 한다.
+
+    History:
+        2026-10-18 - 초기 생성
+"""
+import time
+
+from django.core.cache import caches
+
+
+class ChangeLog:
+    def __init__(self, name, cache_alias='default', ttl=60 * 60 * 2, max_changes=10000, gap_grace=5):
+        self.name        = name
+        self.cache_alias = cache_alias
+        self.ttl         = ttl
+        self.max_changes = max_changes
+        self.gap_grace   = gap_grace
+        self._gap        = None # (비어 있는 순번, 처음 발견한 시각)
+
+    def get_cache(self):
+        return caches[self.cache_alias]
+
+    def seq_key(self):
+        return f'{self.name}-seq'
+
+    def entry_key(self, seq):
+        return f'{self.name}:{seq}'
+
+    def last_seq(self):
+        return self.get_cache().get(self.seq_key(), 0)
+
+    def record(self, object_id):
+        cache = self.get_cache()
+
+        try:
+            seq = cache.incr(self.seq_key())
+
+        except ValueError:
+            cache.add(self.seq_key(), 0, None)
+            seq = cache.incr(self.seq_key())
+
+        cache.set(self.entry_key(seq), object_id, self.ttl)
+
+    def changes_since(self, seq, now=None):
+        """ (읽은 마지막 순번, seq 이후 변경된 객체 id 집합)
+
+            밀린 변경이 max_changes 를 넘거나 순번이 줄었거나(캐시 초기화)
+            비어 있는 순번이 gap_grace 초 넘게 채워지지 않으면 (마지막 순번, None) 을 반환한다.
+            (전체 재구성 필요)
+        """
+        last = self.last_seq()
+
+        if last == seq:
+            return seq, set()
+
+        if last < seq or last - seq > self.max_changes:
+            return last, None
+
+        entries = self.get_cache().get_many([self.entry_key(n) for n in range(seq + 1, last + 1)])
+        changed = set()
+
+        for n in range(seq + 1, last + 1):
+            key = self.entry_key(n)
+
+            if key not in entries:
+                now = time.monotonic() if now is None else now
+
+                if self._gap is None or self._gap[0] != n:
+                    self._gap = (n, now)
+
+                elif now - self._gap[1] >= self.gap_grace:
+                    self._gap = None
+                    return last, None
+
+                return n - 1, changed
+
+            changed.add(entries[key])
+
+        return last, changed
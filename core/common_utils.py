@@ -8,34 +8,62 @@
 import jwt
 import bcrypt
 import re
-import uuid
 import time
-import functools
+import uuid
 
 from django.http import JsonResponse
-from django.db import connection, reset_queries
+from django.db import DEFAULT_DB_ALIAS
 
 from my_settings import SECRET_KEY, ALGORITHM, ENCODE
-from user.models import User
-
-def query_debugger(func):
-    @functools.wraps(func)
-    def wrapper(*args, **kwargs):
-        reset_queries()
-        number_of_start_queries = len(connection.queries)
-        start                   = time.perf_counter()
-        result                  = func(*args, **kwargs)
-        end                     = time.perf_counter()
-        number_of_end_queries   = len(connection.queries)
-        
-        print(f"-------------------------------------------------------------------")
-        print(f"Function : {func.__name__}")
-        print(f"Number of Queries : {number_of_end_queries-number_of_start_queries}")
-        print(f"Finished in : {(end - start):.2f}s")
-        print(f"-------------------------------------------------------------------")
-        
-        return result
-    return wrapper
+from user.models import User, Principal
+from core.principal_cache import PrincipalCache
+from core.exception import InvalidPrincipal
+from core.hashing import HashingPool, get_hash_rounds
+from core.throttle import TokenBucketLimiter, LoginThrottle
+from clnass_101.settings import (
+    PRINCIPAL_CACHE_MAX_SIZE,
+    PRINCIPAL_CACHE_TTL,
+    ACCESS_TOKEN_CLAIMS_ENABLED,
+    ACCESS_TOKEN_CLAIMS_TTL,
+    BCRYPT_ROUNDS,
+    PASSWORD_HASHING_WORKERS,
+    PASSWORD_HASHING_QUEUE_SIZE,
+    PASSWORD_HASHING_TIMEOUT,
+    LOGIN_THROTTLE_IP_CAPACITY,
+    LOGIN_THROTTLE_IP_REFILL_RATE,
+    LOGIN_THROTTLE_EMAIL_CAPACITY,
+    LOGIN_THROTTLE_EMAIL_REFILL_RATE,
+    LOGIN_THROTTLE_CACHE_ALIAS
+)
+
+ACCESS_TOKEN_CLAIMS_VERSION = 1
+ACCESS_TOKEN_CLAIM_FIELDS   = ('id', 'name', 'phone_number', 'is_creator')
+
+principal_cache = PrincipalCache(
+    max_size = PRINCIPAL_CACHE_MAX_SIZE,
+    ttl      = PRINCIPAL_CACHE_TTL
+)
+
+password_hashing_pool = HashingPool(
+    max_workers = PASSWORD_HASHING_WORKERS,
+    max_pending = PASSWORD_HASHING_QUEUE_SIZE,
+    timeout     = PASSWORD_HASHING_TIMEOUT
+)
+
+login_throttle = LoginThrottle(
+    ip_limiter    = TokenBucketLimiter(
+        name        = 'login_ip',
+        capacity    = LOGIN_THROTTLE_IP_CAPACITY,
+        refill_rate = LOGIN_THROTTLE_IP_REFILL_RATE,
+        cache_alias = LOGIN_THROTTLE_CACHE_ALIAS
+    ),
+    email_limiter = TokenBucketLimiter(
+        name        = 'login_email',
+        capacity    = LOGIN_THROTTLE_EMAIL_CAPACITY,
+        refill_rate = LOGIN_THROTTLE_EMAIL_REFILL_RATE,
+        cache_alias = LOGIN_THROTTLE_CACHE_ALIAS
+    )
+)
 
 def login_decorator(login_required=False):
     def real_decorator(func):
@@ -50,31 +78,121 @@ def login_decorator(login_required=False):
                 payload = jwt.decode(
                     access_token,
                     SECRET_KEY,
-                    algorithm=ALGORITHM
+                    algorithms=[ALGORITHM]
                 )
                 
-                user = User.objects.get(id=payload['user_id'])
+                user = get_claims_principal(payload) or get_principal(payload['user_id'])
                 request.user = user
                 
-            except jwt.exceptions.DecodeError as e:
+            except (jwt.exceptions.ExpiredSignatureError, jwt.exceptions.DecodeError) as e:
+                if not login_required:
+                    # 로그인이 필요 없는 뷰: 잘못되었거나 만료된 토큰은 토큰이 없는 요청과 같이 익명으로 처리
+                    request.user = User.objects.filter(id=0)
+                    return func(self, request, *args, **kwargs)
+                
+                if isinstance(e, jwt.exceptions.ExpiredSignatureError):
+                    return JsonResponse({"message": "TOKEN_EXPIRED"}, status=401)
+                
                 return JsonResponse({"message": "UNAUTHORIZED"}, status=401)
             
             except User.DoesNotExist:
                 return JsonResponse({"message": "INVALID_USER"}, status=401)
             
-            return func(self, request, *args, **kwargs)
+            try:
+                return func(self, request, *args, **kwargs)
+            
+            except InvalidPrincipal as e:
+                return JsonResponse({"message": f"{e}"}, status=401)
         
         return wrapper
     return real_decorator
 
-def get_hashed_pw(password):
-    return bcrypt.hashpw(password.encode(ENCODE), bcrypt.gensalt()).decode(ENCODE)
+def get_principal(user_id):
+    """ 인증된 유저 조회 (principal_cache 경유)
+        
+        캐시에는 컬럼 값 튜플만 저장하고 요청마다 새 User 인스턴스를 만들어
+        뷰에서 request.user 를 수정해도 다른 요청에 영향이 없도록 한다.
+        
+        반환값은 읽기 전용으로 사용한다. 캐시는 프로세스마다 따로 있어 TTL 동안 오래된 값일 수 있으므로
+        이 값을 수정하여 save() 하면 다른 프로세스가 저장한 최신 값을 덮어쓴다. (lost update)
+        유저를 수정하는 뷰는 User.objects.filter(id=...).update(F(...)) 나
+        select_for_update() 로 다시 조회한 인스턴스를 사용한다.
+        
+        Raise:
+            User.DoesNotExist - 존재하지 않는 유저
+    """
+    values = principal_cache.get_or_load(user_id, _load_principal_values)
+    return User.from_db(DEFAULT_DB_ALIAS, None, values)
+
+def get_claims_principal(payload):
+    """ 클레임 토큰으로 Principal 생성 (DB 조회 없음)
+        
+        클레임이 없거나 버전이 다르면 None 을 반환하여 DB 조회로 대체한다.
+    """
+    claims = payload.get('claims')
+    
+    if not claims or payload.get('ver') != ACCESS_TOKEN_CLAIMS_VERSION:
+        return None
+    
+    claims = dict(claims, id=payload['user_id'])
+    fields = [
+        field.attname for field in User._meta.concrete_fields
+        if field.attname in ACCESS_TOKEN_CLAIM_FIELDS
+    ]
+    
+    return Principal.from_db(DEFAULT_DB_ALIAS, fields, [claims[field] for field in fields])
+
+def _load_principal_values(user_id):
+    user = User.objects.get(id=user_id)
+    return tuple(getattr(user, field.attname) for field in User._meta.concrete_fields)
+
+def get_hashed_pw(password, rounds=None):
+    """ 비밀번호 해싱 (password_hashing_pool 에서 실행)
+        
+        Raise:
+            HashingQueueFull - 해싱 풀 포화
+    """
+    return password_hashing_pool.run(hash_password, password, rounds or BCRYPT_ROUNDS)
 
 def check_password(password, user_password):
+    """ 비밀번호 확인 (password_hashing_pool 에서 실행)
+        
+        Raise:
+            HashingQueueFull - 해싱 풀 포화
+    """
+    return password_hashing_pool.run(_check_password, password, user_password)
+
+def password_needs_rehash(user_password):
+    return get_hash_rounds(user_password) != BCRYPT_ROUNDS
+
+def hash_password(password, rounds):
+    """ bcrypt 해싱 (현재 스레드에서 실행, 풀 실행과 벤치마크용. 뷰에서는 get_hashed_pw 사용) """
+    return bcrypt.hashpw(password.encode(ENCODE), bcrypt.gensalt(rounds)).decode(ENCODE)
+
+def _check_password(password, user_password):
     return bcrypt.checkpw(password.encode(ENCODE), user_password.encode(ENCODE))
 
-def issue_access_token(user_id):
-    return jwt.encode({'user_id': user_id}, SECRET_KEY, algorithm=ALGORITHM)
+def issue_access_token(user_id, user=None):
+    """ 액세스 토큰 발행
+        
+        ACCESS_TOKEN_CLAIMS_ENABLED 이고 user 가 주어지면 뷰에서 주로 사용하는 필드를
+        버전이 있는 클레임으로 함께 담아, login_decorator 가 DB 조회 없이 인증할 수 있게 한다.
+        클레임 값은 재발행 전까지 갱신되지 않으므로 클레임 토큰은 ACCESS_TOKEN_CLAIMS_TTL 후 만료(exp)된다.
+    """
+    payload = {'user_id': user_id}
+    
+    if ACCESS_TOKEN_CLAIMS_ENABLED and user is not None:
+        issued_at = int(time.time())
+        
+        payload['iat']    = issued_at
+        payload['exp']    = issued_at + ACCESS_TOKEN_CLAIMS_TTL
+        payload['ver']    = ACCESS_TOKEN_CLAIMS_VERSION
+        payload['claims'] = {
+            field: getattr(user, field)
+            for field in ACCESS_TOKEN_CLAIM_FIELDS if field != 'id'
+        }
+    
+    return jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
 
 
 class CommonUtil:
@@ -0,0 +1,551 @@
+""" 벤치마크/부하 테스트용 데이터 생성기
+
+    user, product, order, kit, creator 앱의 모든 모델을 채운다.
+
+    - seed 가 같으면 항상 같은 데이터를 만든다.
+      날짜/시각은 실행 시각 대신 고정된 기준 시각(base_datetime, 기본 BASE_DATETIME)에서 계산한다.
+    - 행은 제너레이터로 만들어 batch_size 단위로 bulk_create 하므로 수천만 행도 메모리를 적게 쓴다.
+    - id 를 직접 지정한다(MySQL/SQLite 는 bulk_create 후 pk 를 돌려주지 않음). 모델별 id 는 range 로 보관한다.
+    - 좋아요/커뮤니티/댓글 등은 순위에 따라 1/rank^skew 로 치우치게 분배한다.
+      (앞쪽 id 의 상품이 가장 인기가 많다)
+
+    History:
+        2026-10-18 - 초기 생성
+        2026-10-18 - 전체 모델, 스트리밍 삽입, 치우침(skew) 분배 지원
+        2026-10-18 - 좋아요 수 카운터(like_count) 채우기
+        2026-10-18 - 생성 후 메인 피드 캐시 무효화 (bulk_create 는 signal 을 보내지 않음)
+        2026-10-18 - 날짜를 실행 시각 대신 고정 기준 시각에서 계산 (같은 seed 면 실행 날짜와 무관하게 같은 데이터)
+"""
+import itertools
+import random
+
+from datetime import datetime, timedelta
+
+from django.db        import transaction
+from django.db.models import Max
+
+from user.models    import (
+    User,
+    ApplyChannel,
+    Coupon,
+    UserCoupon,
+    RecentlyView,
+    UserProduct,
+    ProductLike
+)
+from product.models import (
+    Product,
+    ProductSubImage,
+    ProductContentImageUrl,
+    ProductContentDescription,
+    ProductContent,
+    Community,
+    CommunityComment,
+    CommunityLike,
+    MainCategory,
+    SubCategory,
+    Difficulty,
+    DetailCategory,
+    ProductDetailCategory,
+    Chapter,
+    Lecture,
+    LectureVideo,
+    LectureComment,
+    LectureContentDescription,
+    LectureContentImageUrl,
+    LectureContent,
+    LectureProgress,
+    Signature,
+    ProductKit
+)
+from kit.models     import Kit, KitSubImageUrl, KitLike
+from order.models   import Order, OrderStatus, PaymentMethod
+from creator.models import (
+    TemporaryProduct,
+    TemporaryProductImage,
+    TemporaryChapter,
+    TemporaryLecture,
+    TemporaryLectureContentImage,
+    TemporaryLectureContentDescription,
+    TemporaryLectureContent,
+    TemporaryKit,
+    TemporaryKitImage
+)
+from product.like_counts import reconcile_like_counts
+from product.main_feed   import invalidate_main_feed
+
+CATEGORIES = {
+    '크리에이티브' : ['드로잉', '공예', '요리', '사진/영상', '음악'],
+    '커리어'      : ['데이터/개발', '디자인', '마케팅', '업무 생산성'],
+    '머니'        : ['재테크', '부업', '창업'],
+}
+KEYWORDS       = ['코딩', '파이썬', '드로잉', '수채화', '베이킹', '영상 편집', '사진', '주식', '부동산', '마케팅']
+DIFFICULTIES   = ['입문자', '초급자', '중급자', '준전문가']
+DETAIL_NAMES   = ['취미', '자기계발', '온라인', '준비물 포함', '자격증']
+SIGNATURES     = ['클래스101 오리지널', '시그니처']
+APPLY_CHANNELS = ['인스타그램', '유튜브', '지인 추천', '검색']
+FAMILY_NAMES   = '김이박최정강조윤장임'
+GIVEN_NAMES    = ['민구', '원두', '재훈', '상혁', '영준', '혜수', '소헌', '은우']
+ORDER_STATUS   = ['결제대기', '결제완료', '배송준비', '배송중', '배송완료', '취소', '수강신청']
+PAYMENT_NAMES  = ['무통장 입금', '신용카드', '카카오페이']
+BASE_DATETIME  = datetime(2026, 10, 18)
+
+DEFAULT_CARDINALITIES = {
+    'users'                   : 500,
+    'creators'                : 50,
+    'products'                : 2000,
+    'chapters_per_product'    : 3,
+    'lectures_per_chapter'    : 3,
+    'contents_per_lecture'    : 2,
+    'product_contents'        : 1000,
+    'likes'                   : 20000,
+    'communities'             : 5000,
+    'comments_per_community'  : 2,
+    'community_likes'         : 10000,
+    'lecture_comments'        : 5000,
+    'recently_views_per_user' : 10,
+    'user_products'           : 2000,
+    'progress_per_purchase'   : 3,
+    'coupons'                 : 20,
+    'coupons_per_user'        : 2,
+    'kit_likes'               : 2000,
+    'temporary_products'      : 20,
+}
+
+
+class DatasetGenerator:
+    def __init__(self, seed=0, skew=1.0, batch_size=1000, log=None, base_datetime=BASE_DATETIME, **cardinalities):
+        unknown = set(cardinalities) - set(DEFAULT_CARDINALITIES)
+
+        if unknown:
+            raise TypeError(f'unknown cardinalities: {", ".join(sorted(unknown))}')
+
+        self.random        = random.Random(seed)
+        self.skew          = skew
+        self.base_datetime = base_datetime
+        self.batch_size    = batch_size
+        self.log           = log or (lambda table, rows: None)
+        self.counts        = dict(DEFAULT_CARDINALITIES, **cardinalities)
+        self.ids           = {}
+
+        for name, value in self.counts.items():
+            setattr(self, name, value)
+
+    def generate(self):
+        for step in (
+            self.generate_lookups,
+            self.generate_users,
+            self.generate_kits,
+            self.generate_products,
+            self.generate_product_contents,
+            self.generate_curriculums,
+            self.generate_likes,
+            self.generate_communities,
+            self.generate_purchases,
+            self.generate_coupons,
+            self.generate_temporary_products,
+        ):
+            with transaction.atomic():
+                step()
+
+        invalidate_main_feed()
+        return self
+
+    def insert(self, model, rows):
+        """ rows(id 를 제외한 필드 dict iterable)를 batch_size 단위로 삽입. 생성한 id range 반환 """
+        start_id = (model.objects.aggregate(max_id=Max('id'))['max_id'] or 0) + 1
+        next_id  = start_id
+        rows     = iter(rows)
+
+        while True:
+            batch = [
+                model(id=row_id, **row)
+                for row_id, row in zip(itertools.count(next_id), itertools.islice(rows, self.batch_size))
+            ]
+
+            if not batch:
+                break
+
+            model.objects.bulk_create(batch)
+            next_id += len(batch)
+
+        ids = self.ids[model.__name__] = range(start_id, next_id)
+        self.log(model._meta.db_table, len(ids))
+        return ids
+
+    def popularity(self, size):
+        """ 1/rank^skew 누적 가중치 (random.choices 의 cum_weights) """
+        return list(itertools.accumulate(1 / (rank ** self.skew) for rank in range(1, size + 1)))
+
+    def distribute(self, total, size, cap):
+        """ total 을 size 개 항목에 1/rank^skew 비율로 나눈 개수 (항목별 최대 cap) """
+        cum_weights = self.popularity(size)
+        weight_sum  = cum_weights[-1] if cum_weights else 1
+        previous    = 0
+
+        for cumulative in cum_weights:
+            yield min(cap, int(total * (cumulative - previous) / weight_sum))
+            previous = cumulative
+
+    def popular_sample(self, population, cum_weights, count):
+        """ 인기 가중치를 적용한 중복 없는 count 개 선택 """
+        count  = min(count, len(population))
+        chosen = set()
+
+        while len(chosen) < count:
+            chosen.update(self.random.choices(population, cum_weights=cum_weights, k=count - len(chosen)))
+
+        return sorted(chosen)
+
+    def random_datetime(self, days=365):
+        return self.base_datetime - timedelta(seconds=self.random.randrange(days * 24 * 60 * 60))
+
+    def generate_lookups(self):
+        main_ids = self.insert(MainCategory, ({'name': name} for name in CATEGORIES))
+        sub_ids  = self.insert(SubCategory, (
+            {'name': sub_name, 'main_category_id': main_id}
+            for main_id, sub_names in zip(main_ids, CATEGORIES.values())
+            for sub_name in sub_names
+        ))
+        self.sub_main = dict(zip(
+            sub_ids,
+            (main_id for main_id, names in zip(main_ids, CATEGORIES.values()) for _ in names)
+        ))
+
+        self.insert(Difficulty, ({'name': name} for name in DIFFICULTIES))
+        self.insert(DetailCategory, ({'name': name} for name in DETAIL_NAMES))
+        self.insert(Signature, ({'name': name} for name in SIGNATURES))
+        self.insert(ApplyChannel, ({'name': name} for name in APPLY_CHANNELS))
+        self.insert(PaymentMethod, ({'name': name} for name in PAYMENT_NAMES))
+
+        # OrderProductView 는 order_status id=7(수강신청)을 사용한다
+        OrderStatus.objects.bulk_create(
+            OrderStatus(id=index, status=status)
+            for index, status in enumerate(ORDER_STATUS, 1)
+            if not OrderStatus.objects.filter(id=index).exists()
+        )
+
+    def generate_users(self):
+        total   = self.users + self.creators
+        user_id = (User.objects.aggregate(max_id=Max('id'))['max_id'] or 0) + 1
+
+        ids = self.insert(User, (
+            {
+                'name'                   : self.random.choice(FAMILY_NAMES) + self.random.choice(GIVEN_NAMES),
+                'nick_name'              : f'클래스러버{index}',
+                'email'                  : f'user{user_id + index}@clnass101.com',
+                'password'               : None,
+                'phone_number'           : f'010{self.random.randrange(10 ** 8):08d}',
+                'is_creator'             : index >= self.users,
+                'profile_image_url'      : f'https://example.com/profiles/{index}.png',
+                'point'                  : self.random.randrange(0, 10000),
+                'recommend_id'           : user_id + self.random.randrange(index)
+                                           if index and self.random.random() < 0.1 else None,
+                'application_channel_id' : self.random.choice(self.ids['ApplyChannel']),
+            } for index in range(total)
+        ))
+        self.user_ids    = ids[:self.users]
+        self.creator_ids = ids[self.users:]
+
+    def generate_kits(self):
+        kit_ids = self.insert(Kit, (
+            {
+                'name'           : f'{self.random.choice(KEYWORDS)} 준비물 키트 {index}',
+                'main_image_url' : f'https://example.com/kits/{index}.png',
+                'price'          : self.random.randrange(1, 10) * 10000,
+                'description'    : '클래스에 필요한 준비물',
+            } for index in range(max(1, self.products // 4))
+        ))
+        self.insert(KitSubImageUrl, (
+            {'image_url': f'https://example.com/kits/{kit_id}/{index}.png', 'kit_id': kit_id}
+            for kit_id in kit_ids for index in range(2)
+        ))
+        self.insert(KitLike, (
+            {'user_id': user_id, 'kit_id': kit_id}
+            for kit_id, count in zip(kit_ids, self.distribute(self.kit_likes, len(kit_ids), len(self.user_ids)))
+            for user_id in self.random.sample(self.user_ids, count)
+        ))
+        self.kit_ids = kit_ids
+
+    def generate_products(self):
+        today   = self.base_datetime.date()
+        sub_ids = self.ids['SubCategory']
+
+        product_ids = self.insert(Product, (
+            {
+                'name'             : f'{self.random.choice(KEYWORDS)} 클래스 {index} - 누구나 쉽게 시작하기',
+                'effective_time'   : self.random.choice([None, timedelta(days=90), timedelta(days=365)]),
+                'price'            : self.random.randrange(5, 40) * 10000,
+                'sale'             : self.random.choice([0, 0.1, 0.2, 0.35]),
+                'start_date'       : today - timedelta(days=self.random.randrange(-30, 365)),
+                'thumbnail_image'  : f'https://example.com/products/{index}.png',
+                'main_category_id' : self.sub_main[sub_id],
+                'sub_category_id'  : sub_id,
+                'difficulty_id'    : self.random.choice(self.ids['Difficulty']),
+                'creator_id'       : self.random.choice(self.creator_ids),
+                'signature_id'     : self.random.choice(self.ids['Signature'])
+                                     if self.random.random() < 0.05 else None,
+            } for index, sub_id in enumerate(
+                self.random.choice(sub_ids) for _ in range(self.products)
+            )
+        ))
+        self.product_ids         = product_ids
+        self.product_cum_weights = self.popularity(len(product_ids))
+
+        self.insert(ProductSubImage, (
+            {'image_url': f'https://example.com/products/{product_id}/{index}.png', 'product_id': product_id}
+            for product_id in product_ids for index in range(3)
+        ))
+        self.insert(ProductKit, (
+            {'product_id': product_id, 'kit_id': self.random.choice(self.kit_ids)}
+            for product_id in product_ids if self.random.random() < 0.5
+        ))
+        self.insert(ProductDetailCategory, (
+            {'product_id': product_id, 'detail_category_id': detail_id}
+            for product_id in product_ids
+            for detail_id in self.random.sample(self.ids['DetailCategory'], 2)
+        ))
+
+    def generate_product_contents(self):
+        image_ids       = self.insert(ProductContentImageUrl, (
+            {'image_url': f'https://example.com/contents/{index}.png'} for index in range(self.product_contents)
+        ))
+        description_ids = self.insert(ProductContentDescription, (
+            {'description': f'클래스 소개 {index}'} for index in range(self.product_contents)
+        ))
+        self.insert(ProductContent, (
+            {'image_url_id': image_id, 'description_id': description_id, 'order': index % 10 + 1}
+            for index, (image_id, description_id) in enumerate(zip(image_ids, description_ids))
+        ))
+
+    def generate_curriculums(self):
+        chapter_ids = self.insert(Chapter, (
+            {
+                'name'            : f'챕터 {order}',
+                'product_id'      : product_id,
+                'order'           : order,
+                'thumbnail_image' : f'https://example.com/chapters/{product_id}/{order}.png',
+            }
+            for product_id in self.product_ids
+            for order in range(1, self.chapters_per_product + 1)
+        ))
+
+        lecture_count = len(chapter_ids) * self.lectures_per_chapter
+        video_ids     = self.insert(LectureVideo, (
+            {
+                'video_url' : f'videos/{index}.mp4',
+                'duration'  : timedelta(minutes=self.random.randrange(3, 30)),
+            } for index in range(lecture_count)
+        ))
+
+        # 상품 -> 챕터 -> 강의 순서로 만들었으므로 상품별 강의 id 는 연속 구간이다
+        self.lectures_per_product = self.chapters_per_product * self.lectures_per_chapter
+        lecture_ids = self.insert(Lecture, (
+            {
+                'name'       : f'강의 {order}',
+                'product_id' : self.product_ids[index // self.chapters_per_product],
+                'chapter_id' : chapter_id,
+                'video_id'   : video_ids[index * self.lectures_per_chapter + order - 1],
+                'order'      : order,
+            }
+            for index, chapter_id in enumerate(chapter_ids)
+            for order in range(1, self.lectures_per_chapter + 1)
+        ))
+        self.lecture_ids = lecture_ids
+
+        content_count   = len(lecture_ids) * self.contents_per_lecture
+        description_ids = self.insert(LectureContentDescription, (
+            {'description': f'강의 설명 {index}'} for index in range(content_count)
+        ))
+        image_ids       = self.insert(LectureContentImageUrl, (
+            {'image_url': f'lectures/{index}.png'} for index in range(content_count)
+        ))
+        self.insert(LectureContent, (
+            {
+                'description_id' : description_ids[index],
+                'image_url_id'   : image_ids[index],
+                'lecture_id'     : lecture_ids[index // self.contents_per_lecture],
+                'product_id'     : self.product_ids[
+                                       index // self.contents_per_lecture // self.lectures_per_product
+                                   ],
+                'order'          : index % self.contents_per_lecture + 1,
+            } for index in range(content_count)
+        ))
+
+        lecture_weights = self.popularity(len(lecture_ids))
+        comment_start   = (LectureComment.objects.aggregate(max_id=Max('id'))['max_id'] or 0) + 1
+        self.insert(LectureComment, (
+            {
+                'content'    : f'강의 질문 {index}',
+                'image_url'  : None,
+                'user_id'    : self.random.choice(self.user_ids),
+                'parent_id'  : comment_start + self.random.randrange(index)
+                               if index and self.random.random() < 0.2 else None,
+                'lecture_id' : lecture_id,
+            } for index, lecture_id in enumerate(
+                self.random.choices(lecture_ids, cum_weights=lecture_weights, k=self.lecture_comments)
+            )
+        ))
+
+    def generate_likes(self):
+        self.insert(ProductLike, (
+            {'user_id': user_id, 'product_id': product_id}
+            for product_id, count in zip(
+                self.product_ids,
+                self.distribute(self.likes, len(self.product_ids), len(self.user_ids))
+            )
+            for user_id in self.random.sample(self.user_ids, count)
+        ))
+        self.insert(RecentlyView, (
+            {'user_id': user_id, 'product_id': product_id, 'viewed_at': self.random_datetime(days=30)}
+            for user_id in self.user_ids
+            for product_id in self.popular_sample(
+                self.product_ids, self.product_cum_weights, self.recently_views_per_user
+            )
+        ))
+        reconcile_like_counts('product', self.batch_size)
+
+    def generate_communities(self):
+        author_ids    = range(self.user_ids.start, self.creator_ids.stop)
+        community_ids = self.insert(Community, (
+            {
+                'description' : f'클래스 후기 {index}',
+                'user_id'     : self.random.choice(author_ids),
+                'product_id'  : product_id,
+            } for index, product_id in enumerate(
+                self.random.choices(self.product_ids, cum_weights=self.product_cum_weights, k=self.communities)
+            )
+        ))
+        self.insert(CommunityComment, (
+            {
+                'content'      : '좋은 후기 감사합니다',
+                'user_id'      : self.random.choice(author_ids),
+                'community_id' : community_id,
+            }
+            for community_id in community_ids
+            for _ in range(self.random.randint(0, self.comments_per_community * 2))
+        ))
+        self.insert(CommunityLike, (
+            {'user_id': user_id, 'community_id': community_id}
+            for community_id, count in zip(
+                community_ids,
+                self.distribute(self.community_likes, len(community_ids), len(self.user_ids))
+            )
+            for user_id in self.random.sample(self.user_ids, count)
+        ))
+        reconcile_like_counts('community', self.batch_size)
+
+    def generate_purchases(self):
+        per_user  = max(1, self.user_products // max(1, len(self.user_ids)))
+        purchases = [
+            (user_id, product_id)
+            for user_id in self.user_ids[:max(1, self.user_products // per_user)]
+            for product_id in self.random.sample(self.product_ids, min(per_user, len(self.product_ids)))
+        ]
+
+        self.insert(UserProduct, (
+            {'user_id': user_id, 'product_id': product_id} for user_id, product_id in purchases
+        ))
+        self.insert(Order, (
+            {
+                'name'              : '구매자',
+                'phone_number'      : '01012345678',
+                'address'           : '서울시 강남구 테헤란로 427 06234',
+                'order_number'      : f'{self.random_datetime():%Y%m%d%H%M%S%f}{index:010d}',
+                'request_option'    : None,
+                'order_status_id'   : 7,
+                'product_id'        : product_id,
+                'payment_method_id' : self.random.choice(self.ids['PaymentMethod']),
+                'user_id'           : user_id,
+            } for index, (user_id, product_id) in enumerate(purchases, 1)
+        ))
+        self.insert(LectureProgress, (
+            {
+                'user_id'    : user_id,
+                'product_id' : product_id,
+                'lecture_id' : self.lecture_ids[
+                                   (product_id - self.product_ids.start) * self.lectures_per_product + order
+                               ],
+            }
+            for user_id, product_id in purchases
+            for order in range(min(self.progress_per_purchase, self.lectures_per_product))
+        ))
+
+    def generate_coupons(self):
+        coupon_ids = self.insert(Coupon, (
+            {
+                'name'            : f'{index + 1}만원 할인 쿠폰',
+                'discount_cost'   : (index % 10 + 1) * 10000,
+                'is_kit_free'     : index % 5 == 0,
+                'expire_date'     : None if index % 2 else self.base_datetime.date() + timedelta(days=30),
+                'sub_category_id' : self.random.choice(self.ids['SubCategory']),
+                'product_id'      : self.random.choice(self.product_ids) if index % 3 == 0 else None,
+            } for index in range(self.coupons)
+        ))
+        self.insert(UserCoupon, (
+            {'user_id': user_id, 'coupon_id': coupon_id}
+            for user_id in self.user_ids
+            for coupon_id in self.random.sample(coupon_ids, min(self.coupons_per_user, len(coupon_ids)))
+        ))
+
+    def generate_temporary_products(self):
+        product_ids = self.insert(TemporaryProduct, (
+            {
+                'main_category_id' : self.sub_main[sub_id],
+                'sub_category_id'  : sub_id,
+                'name'             : f'작성 중인 클래스 {index}',
+                'price'            : self.random.randrange(5, 40) * 10000,
+                'sale'             : 0,
+                'difficulty_id'    : self.random.choice(self.ids['Difficulty']),
+                'user_id'          : self.random.choice(self.creator_ids),
+            } for index, sub_id in enumerate(
+                self.random.choice(self.ids['SubCategory']) for _ in range(self.temporary_products)
+            )
+        ))
+        self.insert(TemporaryProductImage, (
+            {'image_url': f'temporary/{product_id}.png', 'temporary_product_id': product_id}
+            for product_id in product_ids
+        ))
+        chapter_ids = self.insert(TemporaryChapter, (
+            {'name': f'챕터 {order}', 'temporary_product_id': product_id, 'order': order}
+            for product_id in product_ids for order in range(1, 3)
+        ))
+        lecture_ids = self.insert(TemporaryLecture, (
+            {
+                'name'                 : f'강의 {order}',
+                'temporary_chapter_id' : chapter_id,
+                'temporary_product_id' : product_ids[index // 2],
+                'order'                : order,
+            }
+            for index, chapter_id in enumerate(chapter_ids) for order in range(1, 3)
+        ))
+        lecture_products = [product_ids[index // 4] for index in range(len(lecture_ids))]
+        image_ids        = self.insert(TemporaryLectureContentImage, (
+            {'image_url': f'temporary/lectures/{lecture_id}.png', 'temporary_lecture_id': lecture_id,
+             'temporary_product_id': product_id}
+            for lecture_id, product_id in zip(lecture_ids, lecture_products)
+        ))
+        description_ids  = self.insert(TemporaryLectureContentDescription, (
+            {'description': '강의 설명', 'temporary_lecture_id': lecture_id, 'temporary_product_id': product_id}
+            for lecture_id, product_id in zip(lecture_ids, lecture_products)
+        ))
+        self.insert(TemporaryLectureContent, (
+            {
+                'image_id'             : image_id,
+                'description_id'       : description_id,
+                'temporary_lecture_id' : lecture_id,
+                'temporary_product_id' : product_id,
+                'order'                : 1,
+            } for image_id, description_id, lecture_id, product_id in zip(
+                image_ids, description_ids, lecture_ids, lecture_products
+            )
+        ))
+        kit_ids = self.insert(TemporaryKit, (
+            {'name': '준비물 키트', 'price': 10000, 'temporary_product_id': product_id}
+            for product_id in product_ids
+        ))
+        self.insert(TemporaryKitImage, (
+            {'image_url': f'temporary/kits/{kit_id}.png', 'temporary_kit_id': kit_id,
+             'temporary_product_id': product_id}
+            for kit_id, product_id in zip(kit_ids, product_ids)
+        ))
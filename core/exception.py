@@ -39,4 +39,23 @@ class NotExistUser(Exception):
 
 class WrongPassword(Exception):
     def __init__(self):
-        super().__init__('WRONG_PASSWORD')
\ No newline at end of file
+        super().__init__('WRONG_PASSWORD')
+
+class HashingQueueFull(Exception):
+    def __init__(self):
+        super().__init__('SERVICE_UNAVAILABLE')
+
+
+class TooManyLoginAttempts(Exception):
+    def __init__(self):
+        super().__init__('TOO_MANY_REQUESTS')
+
+
+class InvalidPrincipal(Exception):
+    def __init__(self):
+        super().__init__('INVALID_USER')
+
+
+class InvalidCursor(Exception):
+    def __init__(self):
+        super().__init__('INVALID_CURSOR')
@@ -0,0 +1,78 @@
+""" 비밀번호 해싱 전용 워커 풀
+
+    bcrypt 는 한 번에 수백 ms 의 CPU 를 사용하므로 요청 스레드에서 바로 실행하면
+    로그인이 몰릴 때 모든 워커가 해싱에 묶인다.
+    동시에 실행되는 해싱 수와 대기열 길이를 제한하고, 가득 차면 즉시 HashingQueueFull 을 발생시켜
+    뷰에서 503 으로 응답하도록 한다.
+
+    History:
+        2026-10-18 - 초기 생성
+"""
+import threading
+
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+from core.exception import HashingQueueFull
+
+
+class HashingPool:
+    def __init__(self, max_workers, max_pending, timeout):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.timeout     = timeout
+        self.completed   = 0
+        self.rejected    = 0
+        self.timed_out   = 0
+        self._slots      = threading.BoundedSemaphore(max_workers + max_pending)
+        self._lock       = threading.Lock()
+        self._executor   = ThreadPoolExecutor(
+            max_workers        = max_workers,
+            thread_name_prefix = 'password-hashing'
+        )
+
+    def run(self, func, *args):
+        """ func(*args) 를 풀에서 실행하고 결과를 반환
+
+            Raise:
+                HashingQueueFull - 실행 중 + 대기 작업이 한도에 도달했거나 timeout 초과
+        """
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise HashingQueueFull
+
+        future = self._executor.submit(func, *args)
+        future.add_done_callback(self._release)
+
+        try:
+            return future.result(timeout=self.timeout)
+
+        except TimeoutError:
+            with self._lock:
+                self.timed_out += 1
+            raise HashingQueueFull
+
+    def _release(self, future):
+        self._slots.release()
+
+        with self._lock:
+            self.completed += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                'maxWorkers' : self.max_workers,
+                'maxPending' : self.max_pending,
+                'completed'  : self.completed,
+                'rejected'   : self.rejected,
+                'timedOut'   : self.timed_out,
+            }
+
+
+def get_hash_rounds(hashed_password):
+    """ bcrypt 해시 문자열($2b$<cost>$...)에서 cost 추출 """
+    try:
+        return int(hashed_password.split('$')[2])
+
+    except (AttributeError, IndexError, ValueError):
+        return None
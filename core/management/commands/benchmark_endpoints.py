@@ -0,0 +1,264 @@
+""" 엔드포인트별 쿼리 수 예산(budget) 회귀 벤치마크
+
+    테스트 DB 를 만들고 DatasetGenerator 로 데이터를 채운 뒤 주요 엔드포인트를 호출하여
+    쿼리 수(캐시가 비어 있는 첫 호출 cold / 이후 호출 warm), 응답 시간, 응답 크기,
+    요청 하나의 최대 Python 메모리 할당량(tracemalloc peak, 측정 호출은 시간/쿼리 수에서 제외)을 기록한다.
+    core/query_budgets.json 의 예산을 넘거나 2xx 가 아닌 응답(예외 포함)이 있으면 실패(exit code 1)한다.
+    성능 개선으로 쿼리 수가 줄면 --update-budgets 로 예산 파일을 갱신하여 함께 커밋한다.
+
+    사용법:
+        python manage.py benchmark_endpoints
+        python manage.py benchmark_endpoints --products 5000 --likes 100000 --output result.json
+"""
+import json
+import statistics
+import time
+import tracemalloc
+
+from pathlib import Path
+
+from django.conf                 import settings
+from django.core.cache           import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.db                   import connection
+from django.test                 import RequestFactory
+
+from core.common_utils   import issue_access_token, principal_cache
+from core.datagen        import DatasetGenerator
+from core.query_profiler import RequestProfile
+from order.views         import OrderProductView
+from product.search      import product_search
+from product.views       import MainPageView, ProductDetailView
+from user.recently_views import recently_view_buffer
+from user.views          import SearchView, MyPageView
+
+BUDGET_FILE = Path(__file__).resolve().parents[2] / 'query_budgets.json'
+
+
+class Command(BaseCommand):
+    help = '주요 엔드포인트의 쿼리 수/응답 시간/응답 크기 측정 및 쿼리 예산 검사'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--users', type=int, default=500)
+        parser.add_argument('--products', type=int, default=2000)
+        parser.add_argument('--likes', type=int, default=20000)
+        parser.add_argument('--communities', type=int, default=5000)
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--budget-file', default=str(BUDGET_FILE))
+        parser.add_argument('--output', help='측정 결과를 JSON 으로 저장할 경로')
+        parser.add_argument('--keepdb', action='store_true', help='테스트 DB 를 재사용/보존')
+        parser.add_argument('--update-budgets', action='store_true', help='측정값으로 예산 파일 갱신')
+
+    def handle(self, *args, **options):
+        # 운영과 같은 조건으로 측정 (DEBUG 이면 모든 쿼리가 로깅/저장된다)
+        settings.DEBUG = False
+        # 최근 본 클래스는 백그라운드 스레드 대신 버퍼가 찼을 때만 저장 (측정 중 다른 연결의 쓰기 방지)
+        recently_view_buffer.interval = None
+        # 검색 색인은 첫 검색에서 바로 만든다 (cold 에 색인 구성 쿼리 포함)
+        product_search.background = False
+
+        old_name = connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False, keepdb=options['keepdb']
+        )
+
+        try:
+            dataset = DatasetGenerator(
+                seed        = options['seed'],
+                users       = options['users'],
+                products    = options['products'],
+                likes       = options['likes'],
+                communities = options['communities'],
+                log         = lambda table, rows: self.stdout.write(f'  seed {table}: {rows} rows')
+            ).generate()
+
+            results = [
+                self.measure(endpoint, options['repeat'])
+                for endpoint in build_endpoints(dataset)
+            ]
+
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=options['keepdb'])
+
+        for result in results:
+            self.stdout.write(
+                f'{result["name"]:<16} status={result["status"]:<4}'
+                f' cold={result["coldQueries"]:<6} warm={result["warmQueries"]:<6}'
+                f' p50={result["p50Ms"]:9.2f}ms max={result["maxMs"]:9.2f}ms'
+                f' bytes={result["responseBytes"]} peak={result["peakKb"]}KB'
+            )
+
+        if options['output']:
+            Path(options['output']).write_text(json.dumps(results, indent=4, ensure_ascii=False))
+
+        if options['update_budgets']:
+            failed = [result['name'] for result in results if not is_success(result['status'])]
+
+            if failed:
+                raise CommandError(f'not updating budgets, failed endpoints: {", ".join(failed)}')
+
+            write_budgets(options['budget_file'], results)
+            self.stdout.write(f'budgets updated: {options["budget_file"]}')
+            return
+
+        violations = check_budgets(load_budgets(options['budget_file']), results)
+
+        for violation in violations:
+            self.stderr.write(violation)
+
+        if violations:
+            raise CommandError(f'{len(violations)} budget check(s) failed')
+
+        self.stdout.write('all query budgets satisfied')
+
+    def measure(self, endpoint, repeat):
+        query_counts, elapsed, status, size = [], [], None, 0
+
+        reset_caches()
+
+        for iteration in range(repeat):
+            profile = RequestProfile()
+
+            with connection.execute_wrapper(profile):
+                start = time.perf_counter()
+
+                try:
+                    response = endpoint['call'](iteration)
+                    size     = len(response.content)
+
+                    if is_success(status):
+                        status = response.status_code
+
+                except Exception as e:
+                    status = f'{type(e).__name__}'
+
+                elapsed.append((time.perf_counter() - start) * 1000)
+
+            query_counts.append(profile.query_count)
+
+        return {
+            'name'          : endpoint['name'],
+            'status'        : status,
+            'coldQueries'   : query_counts[0],
+            'warmQueries'   : max(query_counts[1:] or query_counts),
+            'p50Ms'         : round(statistics.median(elapsed), 3),
+            'maxMs'         : round(max(elapsed), 3),
+            'responseBytes' : size,
+            'peakKb'        : self.measure_peak_kb(endpoint, repeat),
+        }
+
+    def measure_peak_kb(self, endpoint, iteration):
+        tracemalloc.start()
+
+        try:
+            endpoint['call'](iteration)
+            _, peak = tracemalloc.get_traced_memory()
+
+        except Exception:
+            peak = 0
+
+        finally:
+            tracemalloc.stop()
+
+        return round(peak / 1024)
+
+
+def reset_caches():
+    principal_cache.clear()
+    product_search.reset()
+
+    for cache in caches.all():
+        cache.clear()
+
+
+def build_endpoints(dataset):
+    """ 가장 인기 있는 상품(좋아요/커뮤니티가 가장 많음)과 일반 유저 한 명 기준 """
+    factory     = RequestFactory()
+    user_id     = dataset.user_ids[0]
+    header      = {'HTTP_AUTHORIZATION': issue_access_token(user_id)}
+    hot_product = dataset.product_ids[0]
+    order_body  = {
+        'user_name'         : '벤치마크',
+        'phone_number'      : '01012345678',
+        'post_number'       : '06234',
+        'address'           : '서울시 강남구',
+        'sub_address'       : '테헤란로 427',
+        'request_option'    : None,
+        'coupon_id'         : None,
+        'price'             : 100000,
+        'payment_method_id' : dataset.ids['PaymentMethod'][0],
+    }
+
+    def get(view, path, data=None, auth=False, **kwargs):
+        return lambda iteration: view.as_view()(
+            factory.get(path, data or {}, **(header if auth else {})), **kwargs
+        )
+
+    def order(iteration):
+        return OrderProductView.as_view()(
+            factory.post(
+                '/order/order',
+                json.dumps(order_body),
+                content_type='application/json',
+                **header
+            ),
+            product_id=dataset.product_ids[-(iteration + 1)]
+        )
+
+    return [
+        {'name': 'main', 'call': get(MainPageView, '/products/main')},
+        {'name': 'main_popular', 'call': get(MainPageView, '/products/main', {'sorting': 'popular'})},
+        {
+            'name' : 'product_detail',
+            'call' : get(ProductDetailView, f'/products/{hot_product}', auth=True, product_id=hot_product)
+        },
+        {'name': 'search', 'call': get(SearchView, '/user/search', {'search': '코딩'})},
+        {'name': 'my_page', 'call': get(MyPageView, '/user/my-page', auth=True)},
+        {'name': 'order', 'call': order},
+    ]
+
+
+def load_budgets(budget_file):
+    with open(budget_file) as f:
+        return json.load(f)
+
+
+def write_budgets(budget_file, results):
+    budgets = {
+        result['name']: {
+            'maxColdQueries' : result['coldQueries'],
+            'maxWarmQueries' : result['warmQueries'],
+        } for result in results
+    }
+
+    Path(budget_file).write_text(json.dumps(budgets, indent=4) + '\n')
+
+
+def is_success(status):
+    """ 2xx 응답 (아직 응답이 없으면 None 도 성공으로 본다) """
+    return status is None or isinstance(status, int) and 200 <= status < 300
+
+
+def check_budgets(budgets, results):
+    """ 예산 위반 목록. 2xx 가 아닌 응답(예외 포함)은 쿼리 수와 무관하게 위반이다.
+        (실패하는 엔드포인트는 보통 쿼리를 덜 실행하므로 예산을 통과해 버린다)
+    """
+    violations = []
+
+    for result in results:
+        if not is_success(result['status']):
+            violations.append(f'{result["name"]}: status {result["status"]} is not 2xx')
+
+        budget = budgets.get(result['name'])
+
+        if budget is None:
+            violations.append(f'{result["name"]}: no budget defined')
+            continue
+
+        for key, budget_key in (('coldQueries', 'maxColdQueries'), ('warmQueries', 'maxWarmQueries')):
+            if result[key] > budget[budget_key]:
+                violations.append(
+                    f'{result["name"]}: {key} {result[key]} exceeds budget {budget[budget_key]}'
+                )
+
+    return violations
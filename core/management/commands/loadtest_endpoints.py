@@ -0,0 +1,363 @@
+""" HTTP 부하 테스트
+
+    실행 중인 로컬 서버(runserver, gunicorn, uvicorn 등)에 여러 스레드로 요청을 보내
+    라우트별 처리량(req/s), 응답 시간 p50/p95/p99, 요청당 DB 쿼리 수를 측정한다.
+    같은 워크로드로 WSGI/ASGI 배포나 성능 개선 전후를 비교하기 위해 --output 으로 결과를 저장하고
+    --baseline 으로 이전 결과와 비교한다.
+
+    - 인증이 필요한 라우트는 issue_access_token 으로 발급한 토큰을 사용한다.
+      (서버와 같은 DB/SECRET_KEY 설정으로 실행해야 한다)
+    - 쿼리 수는 응답의 X-Query-Count 헤더를 사용한다. 모든 요청에 X-Query-Profile 헤더를 보내므로
+      QUERY_PROFILER_ALLOWED_IPS 에서 실행하면 샘플링과 무관하게 모든 응답에 쿼리 수가 포함된다.
+    - 라우트 비율은 --mix 'main=4,product_detail=4,search=2' 처럼 지정한다.
+
+    사용법:
+        python manage.py generate_dataset
+        python manage.py runserver --noreload
+        python manage.py loadtest_endpoints --concurrency 8 --duration 30 --output wsgi.json
+        python manage.py loadtest_endpoints --concurrency 8 --duration 30 --baseline wsgi.json
+"""
+import http.client
+import json
+import random
+import threading
+import time
+
+from collections  import Counter
+from pathlib      import Path
+from urllib.parse import urlencode, urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.common_utils   import issue_access_token
+from core.query_profiler import summarize
+from user.models         import User
+from product.models      import Product
+from order.models        import PaymentMethod
+from creator.models      import TemporaryProduct
+
+# order 는 OrderProductView 가 URL 에서 product_id 를 받지 못해 항상 실패하므로 기본 비율에서 제외한다 (--mix 로만 사용)
+DEFAULT_MIX = 'main=4,main_popular=1,product_detail=4,search=2,my_page=1,creator=1'
+KEYWORDS    = ['코딩', '드로잉', '베이킹', '사진', '주식']
+
+
+class Command(BaseCommand):
+    help = '로컬 서버 대상 HTTP 부하 테스트 (라우트별 처리량, p50/p95/p99, 요청당 쿼리 수)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+        parser.add_argument('--mix', default=DEFAULT_MIX, help='라우트=가중치,... (라우트: %s)' % ', '.join(ROUTES))
+        parser.add_argument('--concurrency', type=int, default=4)
+        parser.add_argument('--duration', type=float, default=10, help='측정 시간(초)')
+        parser.add_argument('--requests', type=int, help='총 요청 수 (지정하면 --duration 대신 사용)')
+        parser.add_argument('--warmup', type=float, default=0, help='측정 전 워밍업 시간(초)')
+        parser.add_argument('--users', type=int, default=100, help='토큰을 발급할 유저 수')
+        parser.add_argument('--products', type=int, default=1000, help='요청 대상 상품 수 (id 순)')
+        parser.add_argument('--timeout', type=float, default=30)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--label', help='결과 이름 (예: wsgi, asgi)')
+        parser.add_argument('--output', help='결과를 JSON 으로 저장할 경로')
+        parser.add_argument('--baseline', help='비교할 이전 결과 JSON 경로')
+
+    def handle(self, *args, **options):
+        mix      = parse_mix(options['mix'])
+        fixtures = load_fixtures(options['users'], options['products'])
+        base_url = urlsplit(options['base_url'])
+
+        if options['warmup']:
+            run_load(base_url, mix, fixtures, options['concurrency'], options['warmup'], None,
+                     options['timeout'], options['seed'])
+
+        recorder = run_load(
+            base_url,
+            mix,
+            fixtures,
+            options['concurrency'],
+            options['duration'],
+            options['requests'],
+            options['timeout'],
+            options['seed']
+        )
+        result = recorder.result(
+            label       = options['label'],
+            base_url    = options['base_url'],
+            concurrency = options['concurrency'],
+            mix         = mix
+        )
+
+        self.report(result)
+
+        if options['baseline']:
+            with open(options['baseline']) as f:
+                self.compare(json.load(f), result)
+
+        if options['output']:
+            Path(options['output']).write_text(json.dumps(result, indent=4, ensure_ascii=False))
+
+    def report(self, result):
+        self.stdout.write(
+            f'{result["label"] or result["baseUrl"]}: {result["requests"]} requests'
+            f' in {result["elapsedSeconds"]:.2f}s ({result["throughput"]:.1f} req/s),'
+            f' errors={result["errors"]}, concurrency={result["concurrency"]}'
+        )
+
+        for name, route in result['routes'].items():
+            latency = route['latencyMs']
+            queries = route['queries']
+
+            self.stdout.write(
+                f'  {name:<16} n={route["requests"]:<7} rps={route["throughput"]:8.1f}'
+                f' p50={latency.get("p50", 0):8.2f} p95={latency.get("p95", 0):8.2f}'
+                f' p99={latency.get("p99", 0):8.2f}ms'
+                f' queries(p50/max)={queries.get("p50", "-")}/{queries.get("max", "-")}'
+                f' status={dict(route["status"])}'
+            )
+
+    def compare(self, baseline, result):
+        self.stdout.write(f'vs {baseline.get("label") or baseline.get("baseUrl")}:')
+
+        for name, route in result['routes'].items():
+            before = baseline['routes'].get(name)
+
+            if not before or not before['latencyMs'] or not route['latencyMs']:
+                continue
+
+            self.stdout.write(
+                f'  {name:<16} rps {before["throughput"]:8.1f} -> {route["throughput"]:8.1f}'
+                f'  p95 {before["latencyMs"]["p95"]:8.2f} -> {route["latencyMs"]["p95"]:8.2f}ms'
+                f'  queries {before["queries"].get("p50", "-")} -> {route["queries"].get("p50", "-")}'
+            )
+
+
+def parse_mix(mix):
+    """ 'main=4,search=1' -> {'main': 4, 'search': 1} """
+    weights = {}
+
+    for item in filter(None, (item.strip() for item in mix.split(','))):
+        name, _, weight = item.partition('=')
+
+        if name not in ROUTES:
+            raise CommandError(f'unknown route: {name} (available: {", ".join(ROUTES)})')
+
+        try:
+            weights[name] = float(weight or 1)
+
+        except ValueError:
+            raise CommandError(f'invalid weight: {item}')
+
+    if not weights or sum(weights.values()) <= 0:
+        raise CommandError('empty route mix')
+
+    return weights
+
+
+def load_fixtures(user_count, product_count):
+    """ 요청에 사용할 id 와 토큰 (서버와 같은 DB 에서 읽는다) """
+    users = list(User.objects.filter(is_creator=False).order_by('id')[:user_count])
+
+    if not users:
+        raise CommandError('no users in database (run generate_dataset first)')
+
+    temporary_products = list(
+        TemporaryProduct.objects.order_by('id').select_related('user')[:user_count]
+    )
+
+    return {
+        'tokens'            : [issue_access_token(user.id, user) for user in users],
+        'product_ids'       : list(Product.objects.order_by('id').values_list('id', flat=True)[:product_count]),
+        'payment_method_id' : PaymentMethod.objects.values_list('id', flat=True).first(),
+        'creator_requests'  : [
+            (temporary.id, issue_access_token(temporary.user.id, temporary.user))
+            for temporary in temporary_products
+        ],
+    }
+
+
+def main_request(rng, fixtures):
+    return 'GET', '/products/main', None, None
+
+
+def main_popular_request(rng, fixtures):
+    return 'GET', '/products/main?' + urlencode({'sorting': 'popular'}), None, None
+
+
+def product_detail_request(rng, fixtures):
+    product_id = rng.choice(fixtures['product_ids'])
+    return 'GET', f'/products/{product_id}', rng.choice(fixtures['tokens']), None
+
+
+def search_request(rng, fixtures):
+    return 'GET', '/user/search?' + urlencode({'search': rng.choice(KEYWORDS)}), None, None
+
+
+def my_page_request(rng, fixtures):
+    return 'GET', '/user/my-page', rng.choice(fixtures['tokens']), None
+
+
+def order_request(rng, fixtures):
+    body = {
+        'user_name'         : '부하테스트',
+        'phone_number'      : '01012345678',
+        'post_number'       : '06234',
+        'address'           : '서울시 강남구',
+        'sub_address'       : '테헤란로 427',
+        'request_option'    : None,
+        'coupon_id'         : None,
+        'price'             : 100000,
+        'payment_method_id' : fixtures['payment_method_id'],
+    }
+    return 'POST', '/order/order', rng.choice(fixtures['tokens']), json.dumps(body)
+
+
+def creator_request(rng, fixtures):
+    if not fixtures['creator_requests']:
+        return 'GET', '/creator/0/first', rng.choice(fixtures['tokens']), None
+
+    temporary_id, token = rng.choice(fixtures['creator_requests'])
+    return 'GET', f'/creator/{temporary_id}/first', token, None
+
+
+ROUTES = {
+    'main'           : main_request,
+    'main_popular'   : main_popular_request,
+    'product_detail' : product_detail_request,
+    'search'         : search_request,
+    'my_page'        : my_page_request,
+    'order'          : order_request,
+    'creator'        : creator_request,
+}
+
+
+class Recorder:
+    """ 라우트별 응답 시간/상태 코드/쿼리 수 수집 (스레드 안전) """
+    def __init__(self):
+        self.latencies  = {}
+        self.queries    = {}
+        self.statuses   = {}
+        self.started_at = time.perf_counter()
+        self.ended_at   = None
+        self._lock      = threading.Lock()
+
+    def add(self, route, status, seconds, query_count):
+        with self._lock:
+            self.latencies.setdefault(route, []).append(seconds * 1000)
+            self.statuses.setdefault(route, Counter())[status] += 1
+
+            if query_count is not None:
+                self.queries.setdefault(route, []).append(query_count)
+
+    def finish(self):
+        self.ended_at = time.perf_counter()
+
+    def result(self, **meta):
+        elapsed = (self.ended_at or time.perf_counter()) - self.started_at
+        routes  = {}
+
+        for route in sorted(self.latencies):
+            latencies = sorted(self.latencies[route])
+            statuses  = self.statuses[route]
+
+            routes[route] = {
+                'requests'   : len(latencies),
+                'throughput' : round(len(latencies) / elapsed, 3),
+                'errors'     : sum(count for status, count in statuses.items() if is_error(status)),
+                'status'     : {str(status): count for status, count in sorted(statuses.items(), key=str)},
+                'latencyMs'  : {key: round(value, 3) for key, value in summarize(latencies).items()},
+                'queries'    : summarize(sorted(self.queries.get(route, []))),
+            }
+
+        requests = sum(route['requests'] for route in routes.values())
+
+        return {
+            'label'          : meta.get('label'),
+            'baseUrl'        : meta.get('base_url'),
+            'concurrency'    : meta.get('concurrency'),
+            'mix'            : meta.get('mix'),
+            'elapsedSeconds' : round(elapsed, 3),
+            'requests'       : requests,
+            'throughput'     : round(requests / elapsed, 3),
+            'errors'         : sum(route['errors'] for route in routes.values()),
+            'routes'         : routes,
+        }
+
+
+def is_error(status):
+    return not isinstance(status, int) or status >= 500
+
+
+def run_load(base_url, mix, fixtures, concurrency, duration, total_requests, timeout, seed):
+    """ concurrency 개의 스레드로 duration 초(또는 total_requests 건) 동안 요청 """
+    recorder  = Recorder()
+    deadline  = time.perf_counter() + duration
+    remaining = [total_requests]
+    lock      = threading.Lock()
+    names     = list(mix)
+    weights   = [mix[name] for name in names]
+
+    def take():
+        if total_requests is None:
+            return time.perf_counter() < deadline
+
+        with lock:
+            if remaining[0] <= 0:
+                return False
+
+            remaining[0] -= 1
+            return True
+
+    def worker(index):
+        rng        = random.Random(seed * 1000 + index)
+        connection = None
+
+        while take():
+            route = rng.choices(names, weights)[0]
+            method, path, token, body = ROUTES[route](rng, fixtures)
+            headers = {'X-Query-Profile': '1', 'Connection': 'keep-alive'}
+
+            if token:
+                headers['Authorization'] = token
+
+            if body is not None:
+                headers['Content-Type'] = 'application/json'
+
+            if connection is None:
+                connection = http.client.HTTPConnection(base_url.hostname, base_url.port or 80, timeout=timeout)
+
+            start = time.perf_counter()
+
+            try:
+                connection.request(method, (base_url.path or '').rstrip('/') + path, body, headers)
+                response = connection.getresponse()
+                response.read()
+                status      = response.status
+                query_count = response.getheader('X-Query-Count')
+
+                if response.getheader('Connection', '').lower() == 'close':
+                    connection.close()
+                    connection = None
+
+            except (OSError, http.client.HTTPException) as e:
+                status, query_count = type(e).__name__, None
+                connection.close()
+                connection = None
+
+            recorder.add(
+                route,
+                status,
+                time.perf_counter() - start,
+                int(query_count) if query_count is not None else None
+            )
+
+        if connection is not None:
+            connection.close()
+
+    threads = [threading.Thread(target=worker, args=(index,), daemon=True) for index in range(concurrency)]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    recorder.finish()
+    return recorder
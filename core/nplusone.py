@@ -0,0 +1,180 @@
+""" N+1 쿼리 탐지
+
+    요청 하나에서 실행된 SQL 을 형태(shape, 리터럴/파라미터/IN 목록 제거)로 정규화하고
+    같은 형태가 NPLUSONE_THRESHOLD 회를 넘으면 뷰 이름과 호출 위치(프로젝트 코드의 마지막 프레임)를
+    로그로 남긴다. NPLUSONE_RAISE 이면 NPlusOneDetected 를 발생시킨다(테스트용).
+    탐지 결과는 /debug/n-plus-one 에서 모아서 확인한다.
+
+    History:
+        2026-10-18 - 초기 생성
+"""
+import logging
+import re
+import threading
+import traceback
+
+from collections import Counter
+from contextlib  import ExitStack, contextmanager
+
+from django.db import connections
+
+from core.query_profiler import get_view_name
+from clnass_101.settings import (
+    BASE_DIR,
+    NPLUSONE_ENABLED,
+    NPLUSONE_THRESHOLD,
+    NPLUSONE_RAISE
+)
+
+logger = logging.getLogger(__name__)
+
+PROJECT_DIR    = str(BASE_DIR)
+IGNORED_FILES  = ('core/nplusone.py', 'core/query_profiler.py')
+SHAPE_PATTERNS = (
+    (re.compile(r"'(?:[^']|'')*'"), '?'),
+    (re.compile(r'\b\d+(?:\.\d+)?\b'), '?'),
+    (re.compile(r'%s'), '?'),
+    (re.compile(r'\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)', re.IGNORECASE), 'IN (...)'),
+    (re.compile(r'\s+'), ' '),
+)
+
+
+class NPlusOneDetected(Exception):
+    def __init__(self, report):
+        super().__init__(
+            f'N_PLUS_ONE_QUERY: {report["view"]} {report["callSite"]} '
+            f'x{report["count"]} {report["shape"]}'
+        )
+        self.report = report
+
+
+def normalize_sql(sql):
+    for pattern, replacement in SHAPE_PATTERNS:
+        sql = pattern.sub(replacement, sql)
+
+    return sql.strip()
+
+
+def find_call_site():
+    """ 스택에서 프로젝트 코드(site-packages, 탐지 모듈 제외)의 가장 안쪽 프레임 """
+    for frame in reversed(traceback.extract_stack()):
+        filename = frame.filename
+
+        if not filename.startswith(PROJECT_DIR) or 'site-packages' in filename:
+            continue
+
+        if filename.endswith(IGNORED_FILES):
+            continue
+
+        return f'{filename[len(PROJECT_DIR) + 1:]}:{frame.lineno} in {frame.name}'
+
+    return None
+
+
+class NPlusOneDetector:
+    """ execute_wrapper: 요청 하나의 SQL 형태별 실행 횟수 집계 """
+    def __init__(self, threshold=NPLUSONE_THRESHOLD, raise_error=NPLUSONE_RAISE):
+        self.threshold   = threshold
+        self.raise_error = raise_error
+        self.view_name   = None
+        self.counts      = Counter()
+        self.call_sites  = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        shape = normalize_sql(sql)
+        self.counts[shape] += 1
+
+        if self.counts[shape] == self.threshold + 1:
+            self.call_sites[shape] = find_call_site()
+
+            if self.raise_error:
+                raise NPlusOneDetected(self.report(shape))
+
+        return execute(sql, params, many, context)
+
+    def report(self, shape):
+        return {
+            'view'     : self.view_name,
+            'shape'    : shape,
+            'count'    : self.counts[shape],
+            'callSite' : self.call_sites.get(shape),
+        }
+
+    def reports(self):
+        return [
+            self.report(shape) for shape, count in self.counts.most_common()
+            if count > self.threshold
+        ]
+
+
+class NPlusOneReportStore:
+    """ (뷰, 호출 위치, SQL 형태)별 탐지 횟수와 최대 반복 수 """
+    def __init__(self):
+        self._reports = {}
+        self._lock    = threading.Lock()
+
+    def add(self, report):
+        key = (report['view'], report['callSite'], report['shape'])
+
+        with self._lock:
+            saved = self._reports.setdefault(key, dict(report, requests=0, maxCount=0))
+            saved['requests'] += 1
+            saved['maxCount']  = max(saved['maxCount'], report['count'])
+            saved['count']     = report['count']
+
+    def reset(self):
+        with self._lock:
+            self._reports.clear()
+
+    def summary(self):
+        with self._lock:
+            return sorted(
+                (dict(report) for report in self._reports.values()),
+                key=lambda report: (-report['maxCount'], report['view'] or '')
+            )
+
+
+n_plus_one_reports = NPlusOneReportStore()
+
+
+@contextmanager
+def detect_n_plus_one(threshold=NPLUSONE_THRESHOLD, raise_error=NPLUSONE_RAISE):
+    """ with detect_n_plus_one() as detector: ... detector.reports() """
+    detector = NPlusOneDetector(threshold, raise_error)
+
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(detector))
+
+        yield detector
+
+
+class NPlusOneMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not NPLUSONE_ENABLED:
+            return self.get_response(request)
+
+        with detect_n_plus_one() as detector:
+            request.n_plus_one_detector = detector
+            response = self.get_response(request)
+
+        for report in detector.reports():
+            n_plus_one_reports.add(report)
+            logger.warning(
+                'n+1 query view=%s call_site=%s count=%d shape=%s',
+                report['view'],
+                report['callSite'],
+                report['count'],
+                report['shape']
+            )
+
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        detector = getattr(request, 'n_plus_one_detector', None)
+
+        if detector is not None:
+            detector.view_name = get_view_name(view_func)
@@ -0,0 +1,102 @@
+""" 키셋(커서) 페이지네이션
+
+    OFFSET 대신 마지막으로 본 행의 정렬 키 (예: (updated_at, id)) 보다 뒤의 행만 조회한다.
+    정렬 키에 맞는 인덱스가 있으면 몇 번째 페이지든 같은 비용으로 조회된다.
+    다음 페이지 커서는 마지막 행의 정렬 키를 JSON + base64 로 인코딩한 문자열이다.
+
+    History:
+        2026-10-18 - 초기 생성
+        2026-10-18 - values() 행(dict) 지원, 정렬 키 타입이 맞지 않는 커서 거부
+"""
+import base64
+import binascii
+import json
+
+from datetime import datetime
+
+from django.core.exceptions import ValidationError
+from django.db.models       import Q
+
+from core.exception import InvalidCursor
+
+
+def encode_cursor(values):
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, size):
+    """ 커서 문자열을 정렬 키 값 목록으로 변환
+
+        Raise:
+            InvalidCursor - 형식이 잘못되었거나 정렬 키 개수가 다른 경우
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursor
+
+    if not isinstance(values, list) or len(values) != size:
+        raise InvalidCursor
+
+    return values
+
+
+def after_cursor(ordering, values):
+    """ ordering(예: ('-updated_at', '-id')) 기준으로 values 행 뒤에 오는 행 조건
+
+        (a < x) OR (a = x AND b < y) ...
+    """
+    condition = Q()
+    equals    = {}
+
+    for field, value in zip(ordering, values):
+        name      = field.lstrip('-')
+        lookup    = 'lt' if field.startswith('-') else 'gt'
+        condition |= Q(**equals, **{f'{name}__{lookup}': value})
+        equals[name] = value
+
+    return condition
+
+
+def parse_limit(value, default, maximum):
+    try:
+        limit = int(value) if value is not None else default
+
+    except (TypeError, ValueError):
+        return default
+
+    return max(1, min(limit, maximum))
+
+
+def paginate(queryset, ordering, cursor=None, limit=20):
+    """ (현재 페이지 객체 목록, 다음 페이지 커서 또는 None)
+
+        ordering 의 마지막 필드는 유일한 값(id 등)이어야 순서가 결정된다.
+        values() 쿼리셋이면 ordering 의 필드가 values 에 포함되어 있어야 한다.
+
+        Raise:
+            InvalidCursor - 커서 형식이 잘못되었거나 값이 정렬 필드 타입과 맞지 않는 경우
+                            (다른 정렬의 커서 등)
+    """
+    queryset = queryset.order_by(*ordering)
+
+    if cursor:
+        try:
+            queryset = queryset.filter(after_cursor(ordering, decode_cursor(cursor, len(ordering))))
+
+        except (ValidationError, TypeError, ValueError):
+            raise InvalidCursor
+
+    rows = list(queryset[:limit + 1])
+    page = rows[:limit]
+
+    if len(rows) <= limit:
+        return page, None
+
+    return page, encode_cursor([row_value(page[-1], field.lstrip('-')) for field in ordering])
+
+
+def row_value(row, name):
+    return row[name] if isinstance(row, dict) else getattr(row, name)
@@ -0,0 +1,107 @@
+""" 인증 주체(Principal) 캐시
+
+    login_decorator 가 인증된 요청마다 users 테이블을 조회하지 않도록
+    user_id 를 키로 프로세스 단위 캐시를 유지한다.
+
+    - 최대 크기(LRU)와 TTL 로 메모리와 데이터 신선도를 제한한다.
+    - User 의 post_save/post_delete 시그널로 해당 키를 무효화한다(user/signals.py).
+      QuerySet.update() 나 다른 프로세스의 변경은 시그널이 전달되지 않으므로 TTL 로 보정한다.
+
+    History:
+        2026-10-18 - 초기 생성
+"""
+import threading
+import time
+
+from collections import OrderedDict
+
+
+class PrincipalCache:
+    """ user_id -> 값 LRU + TTL 캐시
+
+        get_or_load 는 로딩 도중 무효화가 발생하면 결과를 저장하지 않는다.
+        (조회 직후 저장된 변경이 오래된 값으로 덮이는 경우를 방지)
+    """
+    def __init__(self, max_size=10000, ttl=60):
+        self.max_size      = max_size
+        self.ttl           = ttl
+        self.hits          = 0
+        self.misses        = 0
+        self.evictions     = 0
+        self.invalidations = 0
+        self._entries      = OrderedDict()
+        self._generation   = 0
+        self._lock         = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, expire_at = entry
+
+            if expire_at <= time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, generation=None):
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_load(self, key, loader):
+        value = self.get(key)
+
+        if value is not None:
+            return value
+
+        generation = self._generation
+        value      = loader(key)
+        self.set(key, value, generation)
+        return value
+
+    def invalidate(self, key):
+        with self._lock:
+            self._generation += 1
+
+            if self._entries.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+
+            return {
+                'size'          : len(self._entries),
+                'maxSize'       : self.max_size,
+                'ttl'           : self.ttl,
+                'hits'          : self.hits,
+                'misses'        : self.misses,
+                'hitRatio'      : round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions'     : self.evictions,
+                'invalidations' : self.invalidations,
+            }
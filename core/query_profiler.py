@@ -0,0 +1,239 @@
+""" 요청 단위 쿼리 프로파일러
+
+    query_debugger(print, DEBUG 전용)를 대체하는 미들웨어.
+    샘플링된 요청마다 execute_wrapper 로 실행된 쿼리를 기록하여
+    쿼리 수, DB 시간, 가장 느린 쿼리, 뷰 이름을 남기고
+    엔드포인트별 최근 QUERY_PROFILER_WINDOW_SIZE 건의 통계를 메모리에 유지한다.
+    DEBUG 와 무관하게 동작하며, 통계는 /debug/query-stats 에서 확인한다.
+    QUERY_PROFILER_ALLOWED_IPS 에서 X-Query-Profile 헤더를 보낸 요청은 샘플링과 무관하게 프로파일링한다.
+    (부하 테스트가 모든 응답의 X-Query-Count 를 받기 위함)
+    X-Query-Count, X-DB-Time-Ms 응답 헤더는 이렇게 요청한 경우에만 보내고, 샘플링된 요청은 통계에만 남긴다.
+    엔드포인트 키는 (메서드, 뷰 이름)이며, 뷰를 찾지 못한 요청(404 등)과 알 수 없는 메서드는 하나로 묶는다.
+    (임의의 URL 로 통계 항목이 끝없이 늘어나지 않도록)
+
+    History:
+        2026-10-18 - 초기 생성
+        2026-10-18 - X-Query-Profile 헤더로 프로파일링 강제
+"""
+import bisect
+import logging
+import math
+import random
+import threading
+import time
+
+from collections import deque
+from contextlib  import ExitStack
+
+from django.db import connections
+
+from clnass_101.settings import (
+    QUERY_PROFILER_SAMPLE_RATE,
+    QUERY_PROFILER_WINDOW_SIZE,
+    QUERY_PROFILER_ALLOWED_IPS
+)
+
+logger = logging.getLogger(__name__)
+
+HISTOGRAM_QUERY_BOUNDS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+HISTOGRAM_MS_BOUNDS    = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+MAX_SQL_LENGTH         = 500
+UNRESOLVED_ENDPOINT    = '<unresolved>'
+KNOWN_METHODS          = ('GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS')
+
+
+class RequestProfile:
+    """ 한 요청에서 실행된 쿼리 수, 시간 합계, 가장 느린 쿼리 (execute_wrapper, 쿼리 목록은 보관하지 않음) """
+    def __init__(self):
+        self.view_name   = None
+        self.exempt      = False
+        self.query_count = 0
+        self.db_seconds  = 0.0
+        self.slowest_sql = None
+        self.slowest     = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+
+        try:
+            return execute(sql, params, many, context)
+
+        finally:
+            self.record(sql, time.perf_counter() - start)
+
+    def record(self, sql, duration):
+        self.query_count += 1
+        self.db_seconds  += duration
+
+        if duration >= self.slowest:
+            self.slowest     = duration
+            self.slowest_sql = sql[:MAX_SQL_LENGTH]
+
+
+class EndpointStats:
+    """ 엔드포인트별 누적 카운터 + 최근 window_size 건의 롤링 샘플 """
+    def __init__(self, window_size):
+        self.requests = 0
+        self.queries  = 0
+        self.samples  = deque(maxlen=window_size)
+
+    def add(self, query_count, db_ms, total_ms, slowest_sql, slowest_ms):
+        self.requests += 1
+        self.queries  += query_count
+        self.samples.append((query_count, db_ms, total_ms, slowest_sql, slowest_ms))
+
+    def summary(self):
+        query_counts = sorted(sample[0] for sample in self.samples)
+        db_ms        = sorted(sample[1] for sample in self.samples)
+        total_ms     = sorted(sample[2] for sample in self.samples)
+        slowest      = max(self.samples, key=lambda sample: sample[4], default=None)
+
+        return {
+            'requests'        : self.requests,
+            'queries'         : self.queries,
+            'window'          : len(self.samples),
+            'queryCount'      : summarize(query_counts),
+            'dbTimeMs'        : summarize(db_ms),
+            'totalTimeMs'     : summarize(total_ms),
+            'queryHistogram'  : histogram(query_counts, HISTOGRAM_QUERY_BOUNDS),
+            'dbTimeHistogram' : histogram(db_ms, HISTOGRAM_MS_BOUNDS),
+            'slowestQuery'    : {
+                'sql' : slowest[3],
+                'ms'  : slowest[4],
+            } if slowest and slowest[3] else None,
+        }
+
+
+class QueryStatsStore:
+    def __init__(self, window_size):
+        self.window_size = window_size
+        self._endpoints  = {}
+        self._lock       = threading.Lock()
+
+    def add(self, endpoint, profile, total_seconds):
+        with self._lock:
+            stats = self._endpoints.get(endpoint)
+
+            if stats is None:
+                stats = self._endpoints[endpoint] = EndpointStats(self.window_size)
+
+            stats.add(
+                profile.query_count,
+                round(profile.db_seconds * 1000, 3),
+                round(total_seconds * 1000, 3),
+                profile.slowest_sql,
+                round(profile.slowest * 1000, 3)
+            )
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+    def summary(self):
+        with self._lock:
+            return {
+                endpoint: stats.summary()
+                for endpoint, stats in sorted(self._endpoints.items())
+            }
+
+
+query_stats = QueryStatsStore(QUERY_PROFILER_WINDOW_SIZE)
+
+
+class QueryProfilerMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        requested = is_profile_requested(request)
+
+        if not requested and random.random() >= QUERY_PROFILER_SAMPLE_RATE:
+            return self.get_response(request)
+
+        profile = request.query_profile = RequestProfile()
+        start   = time.perf_counter()
+
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(profile))
+
+            response = self.get_response(request)
+
+        if profile.exempt:
+            return response
+
+        total_seconds = time.perf_counter() - start
+        method        = request.method if request.method in KNOWN_METHODS else 'OTHER'
+        endpoint      = f'{method} {profile.view_name or UNRESOLVED_ENDPOINT}'
+
+        query_stats.add(endpoint, profile, total_seconds)
+
+        if requested:
+            response['X-Query-Count'] = profile.query_count
+            response['X-DB-Time-Ms']  = f'{profile.db_seconds * 1000:.3f}'
+
+        logger.debug(
+            'endpoint=%s status=%s queries=%d db_ms=%.3f total_ms=%.3f slowest_ms=%.3f',
+            endpoint,
+            response.status_code,
+            profile.query_count,
+            profile.db_seconds * 1000,
+            total_seconds * 1000,
+            profile.slowest * 1000
+        )
+
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        profile = getattr(request, 'query_profile', None)
+
+        if profile is not None:
+            profile.view_name = get_view_name(view_func)
+            profile.exempt    = getattr(view_func, 'query_profiler_exempt', False)
+
+
+def is_profile_requested(request):
+    """ 허용된 IP 에서 X-Query-Profile 헤더로 프로파일링(과 응답 헤더)을 요청했는지 """
+    return bool(request.META.get('HTTP_X_QUERY_PROFILE')) and \
+        request.META.get('REMOTE_ADDR') in QUERY_PROFILER_ALLOWED_IPS
+
+
+def query_profiler_exempt(view_func):
+    """ 프로파일링 통계에서 제외할 뷰 (통계 조회 뷰 등) """
+    view_func.query_profiler_exempt = True
+    return view_func
+
+
+def get_view_name(view_func):
+    view = getattr(view_func, 'view_class', view_func)
+    return f'{view.__module__}.{view.__qualname__}'
+
+
+def summarize(sorted_values):
+    if not sorted_values:
+        return {}
+
+    return {
+        'min'  : sorted_values[0],
+        'p50'  : percentile(sorted_values, 50),
+        'p95'  : percentile(sorted_values, 95),
+        'p99'  : percentile(sorted_values, 99),
+        'max'  : sorted_values[-1],
+        'mean' : round(sum(sorted_values) / len(sorted_values), 3),
+    }
+
+
+def percentile(sorted_values, percent):
+    index = max(0, math.ceil(percent / 100 * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+def histogram(sorted_values, bounds):
+    """ {'<=bound': count, ..., '>last': count} """
+    counts = [0] * (len(bounds) + 1)
+
+    for value in sorted_values:
+        counts[bisect.bisect_left(bounds, value)] += 1
+
+    labels = [f'<={bound}' for bound in bounds] + [f'>{bounds[-1]}']
+    return dict(zip(labels, counts))
@@ -0,0 +1,139 @@
+""" 같은 키의 동시 계산 합치기 (single-flight)
+
+    캐시가 비어 있을 때 같은 키로 동시에 들어온 요청이 모두 같은 값을 계산하지 않도록
+    키마다 한 호출자(leader)만 func 를 실행하고 나머지(follower)는 그 결과를 기다려 함께 사용한다.
+
+    - 프로세스 내: 스레드 간 threading.Event 로 결과를 공유한다.
+      leader 에서 발생한 예외는 기다리던 follower 에게도 그대로 발생한다.
+    - timeout 초 안에 leader 가 끝나지 않으면 follower 는 직접 계산한다. (leader 가 멈춰도 요청이 묶이지 않음)
+    - cache_alias 를 주면 공유 캐시에 lock 키(cache.add)를 두어 여러 프로세스 간에도 한 곳만 계산한다.
+      lock 을 얻지 못한 프로세스는 lookup() 으로 다른 프로세스가 저장한 결과를 poll_interval 마다 확인한다.
+      lookup 이 없거나 결과를 찾지 못하면 timeout 후 직접 계산한다.
+
+    History:
+        2026-10-18 - 초기 생성
+"""
+import threading
+import time
+import uuid
+
+from django.core.cache import caches
+
+
+class Call:
+    def __init__(self):
+        self.done   = threading.Event()
+        self.result = None
+        self.error  = None
+
+
+class SingleFlight:
+    def __init__(self, name, timeout, cache_alias=None, lock_ttl=30, poll_interval=0.05):
+        self.name          = name
+        self.timeout       = timeout
+        self.cache_alias   = cache_alias
+        self.lock_ttl      = lock_ttl
+        self.poll_interval = poll_interval
+        self.leaders       = 0
+        self.followers     = 0
+        self.fallbacks     = 0
+        self.shared_hits   = 0
+        self._calls        = {}
+        self._lock         = threading.Lock()
+
+    def do(self, key, func, lookup=None):
+        """ key 당 한 번만 func() 를 실행하고 결과를 반환
+
+            lookup: 다른 프로세스가 계산해 저장한 결과를 찾는 함수 (없으면 None 반환). cache_alias 사용 시
+        """
+        with self._lock:
+            call = self._calls.get(key)
+
+            if call is None:
+                call = self._calls[key] = Call()
+                self.leaders += 1
+                is_leader = True
+            else:
+                self.followers += 1
+                is_leader = False
+
+        if not is_leader:
+            return self._wait(call, func)
+
+        try:
+            call.result = self._run(key, func, lookup)
+            return call.result
+
+        except Exception as e:
+            call.error = e
+            raise
+
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+            call.done.set()
+
+    def _wait(self, call, func):
+        if not call.done.wait(self.timeout):
+            self._count_fallback()
+            return func()
+
+        if call.error is not None:
+            raise call.error
+
+        return call.result
+
+    def _run(self, key, func, lookup):
+        if not self.cache_alias:
+            return func()
+
+        cache    = caches[self.cache_alias]
+        lock_key = f'singleflight:{self.name}:{key}'
+        token    = uuid.uuid4().hex
+
+        if cache.add(lock_key, token, self.lock_ttl):
+            try:
+                return func()
+
+            finally:
+                if cache.get(lock_key) == token:
+                    cache.delete(lock_key)
+
+        deadline = time.monotonic() + self.timeout
+
+        while time.monotonic() < deadline:
+            time.sleep(self.poll_interval)
+
+            result = lookup() if lookup else None
+
+            if result is not None:
+                with self._lock:
+                    self.shared_hits += 1
+                return result
+
+            if cache.get(lock_key) is None:
+                break
+
+        self._count_fallback()
+        return func()
+
+    def _count_fallback(self):
+        with self._lock:
+            self.fallbacks += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                'name'       : self.name,
+                'shared'     : self.cache_alias is not None,
+                'inFlight'   : len(self._calls),
+                'leaders'    : self.leaders,
+                'followers'  : self.followers,
+                'fallbacks'  : self.fallbacks,
+                'sharedHits' : self.shared_hits,
+            }
+
+    def reset(self):
+        with self._lock:
+            self.leaders = self.followers = self.fallbacks = self.shared_hits = 0
@@ -0,0 +1,127 @@
+""" stale-while-revalidate 캐시
+
+    자주 읽히고 조금 늦게 반영되어도 되는 결과(메인 피드 등)를 캐시한다.
+
+    - fresh (저장 후 ttl 초 이내): 캐시 값을 그대로 반환한다.
+    - stale (ttl ~ ttl + stale_ttl 초): 캐시 값을 바로 반환하고 백그라운드 스레드에서 func() 로 다시 채운다.
+      갱신은 캐시의 lock 키(cache.add)로 키마다 한 곳에서만 실행된다.
+    - 없음 (처음 또는 stale_ttl 이 지난 경우): 요청 스레드에서 func() 를 실행하여 저장한다.
+      같은 키의 동시 miss 는 호출하는 쪽에서 single-flight 로 합친다.
+    - invalidate() 는 세대(version)를 올려 이전 항목을 모두 무시한다. (core/cache_version.py)
+    - background 가 False 이면 stale 갱신을 요청 스레드에서 바로 실행한다. (테스트, 관리 명령)
+
+    History:
+        2026-10-18 - 초기 생성
+"""
+import logging
+import threading
+import time
+
+from django.core.cache import caches
+from django.db         import connections
+
+from core.cache_version import get_version, bump_version
+
+logger = logging.getLogger(__name__)
+
+
+class StaleWhileRevalidateCache:
+    def __init__(self, name, ttl, stale_ttl, cache_alias='default', background=True, lock_ttl=30):
+        self.name        = name
+        self.ttl         = ttl
+        self.stale_ttl   = stale_ttl
+        self.cache_alias = cache_alias
+        self.background  = background
+        self.lock_ttl    = lock_ttl
+        self.hits        = 0
+        self.stale_hits  = 0
+        self.misses      = 0
+        self.refreshes   = 0
+        self.failures    = 0
+        self._lock       = threading.Lock()
+
+    def get_cache(self):
+        return caches[self.cache_alias]
+
+    def version_key(self):
+        return f'{self.name}-version'
+
+    def get(self, key, func):
+        """ key 의 캐시 값 (없으면 func() 결과를 저장하여 반환) """
+        cache     = self.get_cache()
+        version   = get_version(cache, self.version_key())
+        cache_key = f'{self.name}:{version}:{key}'
+        entry     = cache.get(cache_key)
+
+        if entry is None:
+            self._count('misses')
+            value = func()
+            self._store(cache, cache_key, value)
+            return value
+
+        value, fresh_until = entry
+
+        if fresh_until > time.time():
+            self._count('hits')
+            return value
+
+        self._count('stale_hits')
+        self._revalidate(cache, cache_key, func)
+        return value
+
+    def invalidate(self):
+        bump_version(self.get_cache(), self.version_key())
+
+    def _store(self, cache, cache_key, value):
+        cache.set(cache_key, (value, time.time() + self.ttl), self.ttl + self.stale_ttl)
+
+    def _revalidate(self, cache, cache_key, func):
+        lock_key = f'{cache_key}:refresh'
+
+        if not cache.add(lock_key, 1, self.lock_ttl):
+            return
+
+        if not self.background:
+            self._refresh(cache, cache_key, lock_key, func)
+            return
+
+        threading.Thread(
+            target = self._refresh,
+            args   = (cache, cache_key, lock_key, func),
+            name   = f'stale-cache-{self.name}',
+            daemon = True
+        ).start()
+
+    def _refresh(self, cache, cache_key, lock_key, func):
+        try:
+            self._store(cache, cache_key, func())
+            self._count('refreshes')
+
+        except Exception:
+            logger.exception('stale cache refresh failed cache=%s key=%s', self.name, cache_key)
+            self._count('failures')
+
+        finally:
+            cache.delete(lock_key)
+
+            if self.background:
+                connections.close_all()
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'name'      : self.name,
+                'hits'      : self.hits,
+                'staleHits' : self.stale_hits,
+                'misses'    : self.misses,
+                'refreshes' : self.refreshes,
+                'failures'  : self.failures,
+            }
+
+    def reset(self):
+        with self._lock:
+            self.hits = self.stale_hits = self.misses = self.refreshes = self.failures = 0
@@ -0,0 +1,524 @@
+import json
+import tempfile
+import threading
+import time
+
+from datetime      import date, timedelta
+from io            import StringIO
+from pathlib       import Path
+from unittest.mock import patch
+
+from django.apps            import apps
+from django.core.cache      import caches
+from django.db              import transaction
+from django.core.management import call_command, CommandError
+from django.http            import JsonResponse
+from django.test            import TestCase, LiveServerTestCase, Client, override_settings
+from django.urls            import include, path
+from django.views           import View
+
+from core.query_profiler import query_stats, percentile, histogram
+from core.nplusone       import (
+    NPlusOneDetected,
+    normalize_sql,
+    detect_n_plus_one,
+    n_plus_one_reports
+)
+from core.management.commands.benchmark_endpoints import check_budgets
+from core.datagen        import DatasetGenerator, BASE_DATETIME
+from core.singleflight   import SingleFlight
+from core.write_behind   import WriteBehindBuffer
+from core.change_log     import ChangeLog
+from core.management.commands.loadtest_endpoints import parse_mix, DEFAULT_MIX
+from user.models         import User, ProductLike, RecentlyView
+from order.models        import Order
+from product.models      import Product, SubCategory
+from product.main_feed   import invalidate_main_feed
+
+
+class QueryProfilerTest(TestCase):
+    def setUp(self):
+        patcher = patch('core.query_profiler.QUERY_PROFILER_SAMPLE_RATE', 1)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.client = Client()
+        self.URL = '/debug/query-stats'
+        self.ENDPOINT = 'GET product.views.MainPageView'
+        query_stats.reset()
+        invalidate_main_feed()
+
+    def tearDown(self):
+        query_stats.reset()
+
+    def test_profiler_sets_query_count_header(self):
+        response = self.client.get('/products/main', HTTP_X_QUERY_PROFILE='1')
+
+        self.assertEqual(response['X-Query-Count'], '1')
+        self.assertIn('X-DB-Time-Ms', response)
+
+    def test_sampled_request_gets_no_headers(self):
+        response = self.client.get('/products/main')
+
+        self.assertNotIn('X-Query-Count', response)
+        self.assertNotIn('X-DB-Time-Ms', response)
+        self.assertEqual(query_stats.summary()[self.ENDPOINT]['requests'], 1)
+
+    def test_unresolved_requests_share_one_endpoint(self):
+        for path in ('/no-such-page', '/another/missing/page'):
+            self.client.get(path)
+
+        self.assertEqual(list(query_stats.summary()), ['GET <unresolved>'])
+        self.assertEqual(query_stats.summary()['GET <unresolved>']['requests'], 2)
+
+    def test_profiler_records_endpoint_stats(self):
+        self.client.get('/products/main')
+        invalidate_main_feed()
+        self.client.get('/products/main')
+
+        response = self.client.get(self.URL)
+        stats = response.json()['endpoints'][self.ENDPOINT]
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(stats['requests'], 2)
+        self.assertEqual(stats['queries'], 2)
+        self.assertEqual(stats['queryCount']['max'], 1)
+        self.assertEqual(stats['queryHistogram']['<=1'], 2)
+        self.assertIn('"products"', stats['slowestQuery']['sql'])
+
+    def test_profiler_skips_unsampled_request(self):
+        with patch('core.query_profiler.QUERY_PROFILER_SAMPLE_RATE', 0):
+            response = self.client.get('/products/main')
+
+        self.assertNotIn('X-Query-Count', response)
+        self.assertEqual(query_stats.summary(), {})
+
+    def test_profiler_forced_by_header_from_allowed_ip(self):
+        with patch('core.query_profiler.QUERY_PROFILER_SAMPLE_RATE', 0):
+            forced = self.client.get('/products/main', HTTP_X_QUERY_PROFILE='1')
+            remote = self.client.get('/products/main', HTTP_X_QUERY_PROFILE='1', REMOTE_ADDR='10.0.0.1')
+
+        self.assertEqual(forced['X-Query-Count'], '1')
+        self.assertNotIn('X-Query-Count', remote)
+
+    def test_query_stats_reset(self):
+        self.client.get('/products/main')
+
+        response = self.client.delete(self.URL)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(query_stats.summary(), {})
+
+    def test_query_stats_forbidden_for_remote_address(self):
+        response = self.client.get(self.URL, REMOTE_ADDR='10.0.0.1')
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_percentile_and_histogram(self):
+        values = list(range(1, 101))
+
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(histogram([0, 1, 3, 600], (1, 5, 500)), {
+            '<=1': 2, '<=5': 1, '<=500': 0, '>500': 1
+        })
+
+
+class CreatorNamesView(View):
+    """ 상품마다 크리에이터를 따로 조회하는 N+1 뷰 (미들웨어 테스트용) """
+    def get(self, request):
+        return JsonResponse({
+            'names': [User.objects.get(id=product.creator_id).name for product in Product.objects.all()]
+        })
+
+
+urlpatterns = [
+    path('creators', CreatorNamesView.as_view()),
+    path('debug', include('core.urls')),
+]
+
+
+class NPlusOneDetectorTest(TestCase):
+    def setUp(self):
+        patcher = patch('core.nplusone.NPLUSONE_ENABLED', True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.client = Client()
+        self.creator = User.objects.create(name='이소헌', email='creator@gmail.com')
+        self.sub_category = SubCategory.objects.create(name='개발')
+
+        for i in range(6):
+            Product.objects.create(
+                name            = f'코딩 클래스{i}',
+                price           = 10000,
+                sale            = 0.05,
+                start_date      = date.today(),
+                thumbnail_image = 'test_thumbnail_image_url',
+                sub_category    = self.sub_category,
+                creator         = self.creator
+            )
+
+        n_plus_one_reports.reset()
+
+    def tearDown(self):
+        n_plus_one_reports.reset()
+
+    def test_normalize_sql_removes_literals_and_in_lists(self):
+        self.assertEqual(
+            normalize_sql('SELECT *  FROM "users" WHERE "id" IN (1, 2, 3) AND name = \'a\' LIMIT 21'),
+            'SELECT * FROM "users" WHERE "id" IN (...) AND name = ? LIMIT ?'
+        )
+        self.assertEqual(
+            normalize_sql('SELECT * FROM "users" WHERE "id" = %s'),
+            normalize_sql('SELECT * FROM "users" WHERE "id" = 7')
+        )
+
+    def test_detector_reports_repeated_shape_with_call_site(self):
+        with detect_n_plus_one(threshold=3, raise_error=False) as detector:
+            for product in Product.objects.all():
+                User.objects.get(id=product.creator_id)
+
+        reports = detector.reports()
+
+        self.assertEqual(len(reports), 1)
+        self.assertEqual(reports[0]['count'], 6)
+        self.assertTrue(reports[0]['callSite'].startswith('core/tests.py:'))
+
+    def test_detector_raise_mode(self):
+        with self.assertRaises(NPlusOneDetected):
+            with detect_n_plus_one(threshold=2, raise_error=True):
+                for _ in range(3):
+                    User.objects.get(id=self.creator.id)
+
+    @override_settings(ROOT_URLCONF='core.tests')
+    def test_middleware_reports_view_and_call_site(self):
+        self.client.get('/creators')
+
+        response = self.client.get('/debug/n-plus-one')
+        reports = response.json()['reports']
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(reports)
+        self.assertEqual(reports[0]['view'], 'core.tests.CreatorNamesView')
+        self.assertTrue(reports[0]['callSite'].startswith('core/tests.py:'))
+
+
+class QueryBudgetTest(TestCase):
+    def setUp(self):
+        self.budgets = {'main': {'maxColdQueries': 3, 'maxWarmQueries': 2}}
+
+    def test_check_budgets_satisfied(self):
+        results = [{'name': 'main', 'status': 200, 'coldQueries': 3, 'warmQueries': 2}]
+
+        self.assertEqual(check_budgets(self.budgets, results), [])
+
+    def test_check_budgets_exceeded(self):
+        results = [{'name': 'main', 'status': 200, 'coldQueries': 4, 'warmQueries': 2}]
+
+        self.assertEqual(
+            check_budgets(self.budgets, results),
+            ['main: coldQueries 4 exceeds budget 3']
+        )
+
+    def test_check_budgets_missing_endpoint(self):
+        results = [{'name': 'search', 'status': 200, 'coldQueries': 1, 'warmQueries': 1}]
+
+        self.assertEqual(check_budgets(self.budgets, results), ['search: no budget defined'])
+
+    def test_check_budgets_failed_status(self):
+        results = [
+            {'name': 'main', 'status': 500, 'coldQueries': 0, 'warmQueries': 0},
+            {'name': 'main', 'status': 'DoesNotExist', 'coldQueries': 0, 'warmQueries': 0},
+        ]
+
+        self.assertEqual(check_budgets(self.budgets, results), [
+            'main: status 500 is not 2xx',
+            'main: status DoesNotExist is not 2xx',
+        ])
+
+
+class DatasetGeneratorTest(TestCase):
+    def generate(self, seed):
+        return DatasetGenerator(
+            seed                    = seed,
+            users                   = 20,
+            creators                = 3,
+            products                = 10,
+            likes                   = 50,
+            communities             = 20,
+            community_likes         = 20,
+            lecture_comments        = 10,
+            recently_views_per_user = 3,
+            user_products           = 20,
+            kit_likes               = 10,
+            temporary_products      = 2,
+            product_contents        = 5,
+            batch_size              = 7
+        ).generate()
+
+    def test_generate_every_model(self):
+        self.generate(seed=1)
+
+        for app_label in ('user', 'product', 'order', 'kit', 'creator'):
+            for model in apps.get_app_config(app_label).get_models():
+                if model._meta.proxy:
+                    continue
+
+                self.assertTrue(model.objects.exists(), model.__name__)
+
+    def snapshot(self, seed):
+        with transaction.atomic():
+            self.generate(seed)
+            rows = (
+                list(Product.objects.order_by('id').values_list('name', 'price', 'creator_id')),
+                list(ProductLike.objects.order_by('id').values_list('user_id', 'product_id')),
+                list(Product.objects.order_by('id').values_list('start_date', flat=True)),
+                list(RecentlyView.objects.order_by('id').values_list('viewed_at', flat=True)),
+                list(Order.objects.order_by('id').values_list('order_number', flat=True)),
+            )
+            transaction.set_rollback(True)
+
+        return rows
+
+    def test_generate_is_deterministic(self):
+        self.assertEqual(self.snapshot(seed=1), self.snapshot(seed=1))
+        self.assertNotEqual(self.snapshot(seed=1), self.snapshot(seed=2))
+
+    def test_dates_are_relative_to_base_datetime(self):
+        with patch('core.datagen.datetime') as mocked:
+            self.generate(seed=1)
+
+        mocked.now.assert_not_called()
+        self.assertLessEqual(max(RecentlyView.objects.values_list('viewed_at', flat=True)), BASE_DATETIME)
+        self.assertLessEqual(
+            max(Product.objects.values_list('start_date', flat=True)), BASE_DATETIME.date() + timedelta(days=30)
+        )
+
+    def test_likes_are_skewed_to_first_products(self):
+        dataset = self.generate(seed=1)
+        like_counts = [
+            Product.objects.get(id=product_id).productlike_set.count()
+            for product_id in dataset.product_ids
+        ]
+
+        self.assertEqual(like_counts[0], max(like_counts))
+        self.assertGreater(like_counts[0], like_counts[-1])
+
+
+class LoadTestTest(LiveServerTestCase):
+    def setUp(self):
+        DatasetGenerator(
+            users                   = 5,
+            creators                = 2,
+            products                = 5,
+            likes                   = 10,
+            communities             = 5,
+            recently_views_per_user = 2,
+            temporary_products      = 2
+        ).generate()
+
+    def test_parse_mix(self):
+        self.assertEqual(parse_mix('main=3, search'), {'main': 3, 'search': 1})
+
+        with self.assertRaises(CommandError):
+            parse_mix('unknown=1')
+
+    def test_default_mix_excludes_failing_order_route(self):
+        self.assertNotIn('order', parse_mix(DEFAULT_MIX))
+
+    def test_loadtest_reports_every_route(self):
+        output = Path(tempfile.mkdtemp()) / 'result.json'
+
+        call_command(
+            'loadtest_endpoints',
+            base_url    = self.live_server_url,
+            mix         = 'main=1,main_popular=1,creator=1',
+            requests    = 30,
+            concurrency = 1,
+            output      = str(output),
+            stdout      = StringIO()
+        )
+        result = json.loads(output.read_text())
+
+        self.assertEqual(result['requests'], 30)
+        self.assertEqual(set(result['routes']), {'main', 'main_popular', 'creator'})
+        self.assertEqual(result['routes']['main']['status'], {'200': result['routes']['main']['requests']})
+        self.assertGreaterEqual(result['routes']['main']['queries']['max'], 1)
+        self.assertEqual(result['routes']['main']['queries']['min'], 0) # 피드 캐시 hit
+        self.assertIn('p99', result['routes']['main']['latencyMs'])
+
+
+class SingleFlightTest(TestCase):
+    def run_concurrently(self, flight, func, count=10, key='key', lookup=None):
+        barrier = threading.Barrier(count)
+        results = [None] * count
+
+        def worker(index):
+            barrier.wait()
+            results[index] = flight.do(key, func, lookup)
+
+        threads = [threading.Thread(target=worker, args=(index,)) for index in range(count)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        return results
+
+    def slow_counter(self, delay=0.2):
+        calls = []
+
+        def func():
+            calls.append(1)
+            time.sleep(delay)
+            return len(calls)
+
+        return func, calls
+
+    def test_concurrent_callers_share_one_call(self):
+        flight = SingleFlight('test', timeout=5)
+        func, calls = self.slow_counter()
+
+        results = self.run_concurrently(flight, func)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [1] * 10)
+        self.assertEqual(flight.stats()['followers'], 9)
+
+    def test_follower_falls_back_after_timeout(self):
+        flight = SingleFlight('test', timeout=0.05)
+        func, calls = self.slow_counter(delay=0.3)
+
+        self.run_concurrently(flight, func, count=3)
+
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(flight.stats()['fallbacks'], 2)
+
+    def test_leader_error_is_raised_to_followers(self):
+        flight = SingleFlight('test', timeout=5)
+
+        def fail():
+            time.sleep(0.1)
+            raise ValueError('boom')
+
+        errors = []
+
+        def worker():
+            try:
+                flight.do('key', fail)
+            except ValueError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker) for _ in range(3)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(errors), 3)
+        self.assertEqual(flight.stats()['inFlight'], 0)
+
+    def test_shared_lock_waits_for_other_process_result(self):
+        cache = caches['default']
+        cache.clear()
+        flight = SingleFlight('test', timeout=1, cache_alias='default', poll_interval=0.01)
+
+        # 다른 프로세스가 계산 중인 상태
+        cache.add('singleflight:test:key', 'other-process', 30)
+        threading.Timer(0.05, lambda: cache.set('result', 'computed elsewhere')).start()
+
+        result = flight.do('key', lambda: 'computed here', lookup=lambda: cache.get('result'))
+
+        self.assertEqual(result, 'computed elsewhere')
+        self.assertEqual(flight.stats()['sharedHits'], 1)
+        cache.clear()
+
+
+class WriteBehindBufferTest(TestCase):
+    def test_flush_keeps_latest_value_in_recent_order(self):
+        saved  = []
+        buffer = WriteBehindBuffer('test', saved.extend, max_size=100, interval=None)
+
+        buffer.add('a', 1)
+        buffer.add('b', 2)
+        buffer.add('a', 3)
+
+        self.assertEqual(buffer.flush(), 2)
+        self.assertEqual(saved, [2, 3])
+        self.assertEqual(buffer.flush(), 0)
+
+    def test_failed_flush_is_counted(self):
+        def fail(values):
+            raise ValueError
+
+        buffer = WriteBehindBuffer('test', fail, max_size=100, interval=None)
+        buffer.add('a', 1)
+
+        with self.assertLogs('core.write_behind', 'ERROR'):
+            buffer.flush()
+
+        self.assertEqual(buffer.stats()['failed'], 1)
+        self.assertEqual(buffer.stats()['pending'], 0)
+
+    def test_oldest_items_dropped_over_max_pending(self):
+        buffer = WriteBehindBuffer('test', lambda values: None, max_size=100, interval=None, max_pending=2)
+
+        for key in 'abc':
+            buffer.add(key, key)
+
+        self.assertEqual(buffer.stats()['dropped'], 1)
+        self.assertEqual(buffer.stats()['pending'], 2)
+
+    def test_background_thread_flushes_on_interval(self):
+        flushed = threading.Event()
+        buffer  = WriteBehindBuffer('test', lambda values: flushed.set(), max_size=100, interval=0.01)
+
+        buffer.add('a', 1)
+
+        self.assertTrue(flushed.wait(2))
+
+
+class ChangeLogTest(TestCase):
+    def setUp(self):
+        self.log = ChangeLog('test-changes', max_changes=3)
+        caches['default'].delete(self.log.seq_key())
+
+    def test_changes_since(self):
+        self.assertEqual(self.log.changes_since(0), (0, set()))
+
+        for object_id in (5, 7, 5):
+            self.log.record(object_id)
+
+        self.assertEqual(self.log.changes_since(0), (3, {5, 7}))
+        self.assertEqual(self.log.changes_since(2), (3, {5}))
+        self.assertEqual(self.log.changes_since(3), (3, set()))
+
+    def test_stops_at_missing_entry(self):
+        for object_id in (1, 2, 3):
+            self.log.record(object_id)
+
+        caches['default'].delete(self.log.entry_key(2))
+
+        self.assertEqual(self.log.changes_since(0, now=0), (1, {1}))
+        self.assertEqual(self.log.changes_since(1, now=1), (1, set())) # 기록 중일 수 있으므로 기다림
+
+    def test_lost_entry_requires_rebuild(self):
+        for object_id in (1, 2, 3):
+            self.log.record(object_id)
+
+        caches['default'].delete(self.log.entry_key(2))
+
+        self.assertEqual(self.log.changes_since(1, now=0), (1, set()))
+        self.assertEqual(self.log.changes_since(1, now=self.log.gap_grace), (3, None))
+
+    def test_rebuild_required(self):
+        for object_id in range(4):
+            self.log.record(object_id)
+
+        self.assertEqual(self.log.changes_since(0), (4, None)) # max_changes 초과
+        self.assertEqual(self.log.changes_since(10), (4, None)) # 순번 초기화
@@ -0,0 +1,222 @@
+""" 토큰 버킷 요청 제한
+
+    키(이메일, IP 등)마다 capacity 개의 토큰을 두고 초당 refill_rate 개씩 채운다.
+    요청마다 토큰 1개를 사용하며, 토큰이 없으면 거절한다.
+
+    - cache_alias 가 없으면 프로세스 메모리(LRU, max_keys)에 상태를 저장한다.
+    - cache_alias 를 주면 Django 캐시 백엔드에 상태를 저장하여 여러 프로세스가 공유한다.
+      읽기-수정-쓰기 대신 cache.add/incr 만 사용하므로 프로세스 락 없이 원자적으로 갱신된다.
+      버킷이 가득 차는 시간(capacity / refill_rate)을 구간으로 하여 구간별 사용 수를 세고,
+      이전 구간 사용 수를 지난 비율만큼 줄여 더한 값(sliding window)이 capacity 를 넘으면 거절한다.
+
+    History:
+        2026-10-18 - 초기 생성
+        2026-10-18 - 공유 캐시 모드를 cache.add/incr 기반 sliding window 로 변경 (락 안에서 캐시 I/O 제거)
+        2026-10-18 - 로그인 이메일 버킷은 요청 시작 시 토큰 예약, 성공 시 초기화
+"""
+import threading
+import time
+
+from collections import OrderedDict
+
+from django.core.cache import caches
+
+
+class TokenBucketLimiter:
+    def __init__(self, name, capacity, refill_rate, max_keys=100000, cache_alias=None):
+        self.name        = name
+        self.capacity    = capacity
+        self.refill_rate = refill_rate
+        self.max_keys    = max_keys
+        self.cache_alias = cache_alias
+        self.allowed     = 0
+        self.rejected    = 0
+        self._buckets    = OrderedDict()
+        self._lock       = threading.Lock()
+
+    def consume(self, key, now=None):
+        """ 토큰 1개 사용. 사용 가능하면 True, 아니면 False """
+        now = time.time() if now is None else now
+
+        if self.cache_alias:
+            return self._count(self._consume_shared(key, now))
+
+        with self._lock:
+            tokens     = self._tokens(key, now)
+            is_allowed = tokens >= 1
+
+            if is_allowed:
+                tokens -= 1
+
+            self._store(key, tokens, now)
+
+        return self._count(is_allowed)
+
+    def refund(self, key, now=None):
+        """ consume 으로 사용한 토큰 1개를 되돌린다 (요청이 제한 대상 작업 전에 중단된 경우) """
+        now = time.time() if now is None else now
+
+        if self.cache_alias:
+            try:
+                caches[self.cache_alias].decr(self._window_keys(key, now)[0])
+
+            except ValueError:
+                # 구간이 바뀌었거나 축출됨: 이미 사용 수에서 빠졌다
+                pass
+
+            return
+
+        with self._lock:
+            bucket = self._buckets.get(key)
+
+            if bucket is not None:
+                tokens, updated_at = bucket
+                self._buckets[key] = (min(self.capacity, tokens + 1), updated_at)
+
+    def clear(self, key, now=None):
+        """ key 의 버킷을 가득 찬 상태로 되돌린다 """
+        now = time.time() if now is None else now
+
+        if self.cache_alias:
+            caches[self.cache_alias].delete_many(self._window_keys(key, now))
+            return
+
+        with self._lock:
+            self._buckets.pop(key, None)
+
+    def reset(self):
+        with self._lock:
+            self._buckets.clear()
+            self.allowed = self.rejected = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'name'       : self.name,
+                'capacity'   : self.capacity,
+                'refillRate' : self.refill_rate,
+                'shared'     : self.cache_alias is not None,
+                'keys'       : len(self._buckets),
+                'allowed'    : self.allowed,
+                'rejected'   : self.rejected,
+            }
+
+    def _count(self, is_allowed):
+        with self._lock:
+            if is_allowed:
+                self.allowed += 1
+            else:
+                self.rejected += 1
+
+        return is_allowed
+
+    def _tokens(self, key, now):
+        bucket = self._buckets.get(key)
+
+        if bucket is None:
+            return self.capacity
+
+        self._buckets.move_to_end(key)
+        tokens, updated_at = bucket
+
+        return min(self.capacity, tokens + (now - updated_at) * self.refill_rate)
+
+    def _store(self, key, tokens, now):
+        self._buckets[key] = (tokens, now)
+
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+
+    def _period(self):
+        """ 빈 버킷이 가득 차는 시간 (충전하지 않으면 None) """
+        return self.capacity / self.refill_rate if self.refill_rate > 0 else None
+
+    def _window_keys(self, key, now):
+        """ (현재 구간, 이전 구간) 사용 수 캐시 키 """
+        period = self._period()
+        window = int(now // period) if period else 0
+
+        return f'throttle:{self.name}:{key}:{window}', f'throttle:{self.name}:{key}:{window - 1}'
+
+    def _used(self, current, previous, now):
+        """ 이전 구간 사용 수 중 아직 충전되지 않은 비율만큼 더한 사용 수 """
+        period = self._period()
+
+        if not period:
+            return current
+
+        return current + previous * (1 - now % period / period)
+
+    def _consume_shared(self, key, now):
+        cache             = caches[self.cache_alias]
+        current, previous = self._window_keys(key, now)
+        period            = self._period()
+        timeout           = 2 * period + 1 if period else None
+
+        cache.add(current, 0, timeout)
+
+        try:
+            count = cache.incr(current)
+
+        except ValueError:
+            # add 와 incr 사이에 축출된 경우
+            cache.add(current, 1, timeout)
+            count = 1
+
+        if self._used(count, cache.get(previous, 0), now) <= self.capacity:
+            return True
+
+        # 거절한 요청은 사용 수에서 되돌린다
+        try:
+            cache.decr(current)
+
+        except ValueError:
+            pass
+
+        return False
+
+
+class LoginThrottle:
+    """ 로그인 시도 제한 (클라이언트 IP, 이메일 각각 버킷 적용)
+
+        - IP 버킷은 DB/bcrypt 작업 전에 요청마다 차감한다.
+        - 이메일 버킷도 요청을 시작할 때 토큰을 미리 차감(예약)한다.
+          동시에 들어온 틀린 비밀번호 요청들이 모두 확인을 통과한 뒤 차감되어 한도를 넘는 일이 없다.
+        - 로그인에 실패하면 예약한 토큰을 그대로 사용하고, 성공하면 이메일 버킷을 초기화한다.
+          (정상 로그인은 시도 횟수에 포함하지 않는다)
+        - 비밀번호를 확인하기 전에 중단된 요청(해싱 풀 포화 등)은 release 로 예약을 되돌린다.
+        - IP 버킷에서 거절되면 이메일 버킷은 차감하지 않는다.
+    """
+    def __init__(self, ip_limiter, email_limiter):
+        self.ip_limiter    = ip_limiter
+        self.email_limiter = email_limiter
+
+    def allow(self, email, client_ip):
+        return self.ip_limiter.consume(client_ip) and \
+               self.email_limiter.consume(email.lower())
+
+    def release(self, email):
+        self.email_limiter.refund(email.lower())
+
+    def record_success(self, email):
+        self.email_limiter.clear(email.lower())
+
+    def reset(self):
+        self.ip_limiter.reset()
+        self.email_limiter.reset()
+
+    def stats(self):
+        return {
+            'ip'    : self.ip_limiter.stats(),
+            'email' : self.email_limiter.stats(),
+        }
+
+
+def get_client_ip(request, trust_forwarded_for=False):
+    if trust_forwarded_for:
+        forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
+
+        if forwarded_for:
+            return forwarded_for.split(',')[0].strip()
+
+    return request.META.get('REMOTE_ADDR', '')
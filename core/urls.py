@@ -0,0 +1,9 @@
+from django.urls          import path
+
+from core.views          import QueryStatsView, NPlusOneReportView
+from core.query_profiler import query_profiler_exempt
+
+urlpatterns = [
+    path('/query-stats', query_profiler_exempt(QueryStatsView.as_view())),
+    path('/n-plus-one', query_profiler_exempt(NPlusOneReportView.as_view())),
+]
@@ -0,0 +1,53 @@
+from django.views import View
+from django.http  import JsonResponse
+
+from core.query_profiler import query_stats
+from core.nplusone       import n_plus_one_reports
+from clnass_101.settings import (
+    QUERY_PROFILER_SAMPLE_RATE,
+    QUERY_PROFILER_ALLOWED_IPS,
+    NPLUSONE_ENABLED,
+    NPLUSONE_THRESHOLD
+)
+
+
+class LocalOnlyView(View):
+    """ QUERY_PROFILER_ALLOWED_IPS 에서만 접근 가능한 진단용 View """
+    def dispatch(self, request, *args, **kwargs):
+        if request.META.get('REMOTE_ADDR') not in QUERY_PROFILER_ALLOWED_IPS:
+            return JsonResponse({'message': 'FORBIDDEN'}, status=403)
+        
+        return super().dispatch(request, *args, **kwargs)
+
+
+class QueryStatsView(LocalOnlyView):
+    """ 엔드포인트별 쿼리 통계 조회/초기화 """
+    def get(self, request):
+        return JsonResponse(
+            {
+                'sampleRate' : QUERY_PROFILER_SAMPLE_RATE,
+                'endpoints'  : query_stats.summary()
+            },
+            status=200
+        )
+    
+    def delete(self, request):
+        query_stats.reset()
+        return JsonResponse({'message': 'SUCCESS'}, status=200)
+
+
+class NPlusOneReportView(LocalOnlyView):
+    """ N+1 쿼리 탐지 결과 조회/초기화 """
+    def get(self, request):
+        return JsonResponse(
+            {
+                'enabled'   : NPLUSONE_ENABLED,
+                'threshold' : NPLUSONE_THRESHOLD,
+                'reports'   : n_plus_one_reports.summary()
+            },
+            status=200
+        )
+    
+    def delete(self, request):
+        n_plus_one_reports.reset()
+        return JsonResponse({'message': 'SUCCESS'}, status=200)
@@ -0,0 +1,125 @@
+""" 쓰기 지연(write-behind) 버퍼
+
+    요청 처리 중 바로 DB 에 쓰지 않고 메모리에 모아 두었다가 한 번에 저장한다.
+
+    - 같은 key 는 한 번만 저장된다(마지막 값, 마지막 순서). 버퍼 안에서 중복이 제거된다.
+    - interval 초마다, 또는 max_size 개가 쌓이면 백그라운드 스레드에서 flush_func(values) 를 호출한다.
+      values 는 오래된 것부터 최근 순서다.
+    - interval 이 None 이면 스레드를 만들지 않고 max_size 에 도달한 add() 에서 바로 저장한다. (테스트, 관리 명령)
+    - 저장하지 못하고 max_pending 을 넘으면 가장 오래된 항목부터 버린다.
+      프로세스가 비정상 종료되면 버퍼의 내용은 유실되므로 유실되어도 되는 데이터에만 사용한다.
+
+    History:
+        2026-10-18 - 초기 생성
+"""
+import atexit
+import logging
+import threading
+
+from collections import OrderedDict
+
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindBuffer:
+    def __init__(self, name, flush_func, max_size, interval, max_pending=None):
+        self.name        = name
+        self.flush_func  = flush_func
+        self.max_size    = max_size
+        self.interval    = interval
+        self.max_pending = max_pending or max_size * 10
+        self.added       = 0
+        self.flushed     = 0
+        self.dropped     = 0
+        self.failed      = 0
+        self._items      = OrderedDict()
+        self._lock       = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup     = threading.Event()
+        self._thread     = None
+
+    def add(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            self.added += 1
+
+            while len(self._items) > self.max_pending:
+                self._items.popitem(last=False)
+                self.dropped += 1
+
+            is_full = len(self._items) >= self.max_size
+
+        if self.interval is None:
+            if is_full:
+                self.flush()
+            return
+
+        self._ensure_thread()
+
+        if is_full:
+            self._wakeup.set()
+
+    def flush(self):
+        """ 버퍼의 내용을 저장하고 저장한 개수를 반환 """
+        with self._flush_lock:
+            with self._lock:
+                values = list(self._items.values())
+                self._items.clear()
+
+            if not values:
+                return 0
+
+            try:
+                self.flush_func(values)
+
+            except Exception:
+                logger.exception('write-behind flush failed buffer=%s items=%d', self.name, len(values))
+
+                with self._lock:
+                    self.failed += len(values)
+                return 0
+
+            with self._lock:
+                self.flushed += len(values)
+
+            return len(values)
+
+    def clear(self):
+        """ 저장하지 않고 버퍼 비우기 """
+        with self._lock:
+            self._items.clear()
+
+    def _ensure_thread(self):
+        if self._thread is not None:
+            return
+
+        with self._lock:
+            if self._thread is not None:
+                return
+
+            self._thread = threading.Thread(target=self._run, name=f'write-behind-{self.name}', daemon=True)
+            self._thread.start()
+            atexit.register(self.flush)
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+
+            close_old_connections()
+            self.flush()
+            close_old_connections()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'name'     : self.name,
+                'pending'  : len(self._items),
+                'added'    : self.added,
+                'flushed'  : self.flushed,
+                'dropped'  : self.dropped,
+                'failed'   : self.failed,
+            }
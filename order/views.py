@@ -4,11 +4,12 @@ from datetime import datetime, date
 from django.views import View
 from django.http import JsonResponse
 from django.db import IntegrityError, transaction
+from django.db.models import F
 
 from product.models import Product
 from user.models import User, UserCoupon, UserProduct
 from order.models import Order, OrderStatus, PaymentMethod
-from core.common_utils import login_decorator
+from core.common_utils import login_decorator, principal_cache
 
 class SelectProductAndPaymentView(View):
     
@@ -129,8 +130,9 @@ class OrderProductView(View):
                             coupon_id=coupon_id
                         ).delete()
                     
-                    user.point += int(price * 0.03)
-                    user.save()
+                    # request.user 는 principal_cache 에서 만든 읽기 전용 값이므로 저장하지 않고 DB 에서 원자적으로 갱신
+                    User.objects.filter(id=user.id).update(point=F('point') + int(price * 0.03))
+                    transaction.on_commit(lambda: principal_cache.invalidate(user.id))
             
             except IntegrityError:
                 return JsonResponse({"MESSAGE": "TRANSACTION_ERROR"}, status=400)
@@ -0,0 +1,152 @@
+""" 상품 상세 문서 캐시
+
+    ProductDetailView 응답 중 유저와 무관하고 거의 바뀌지 않는 부분
+    (이미지, 카테고리/난이도, 가격, 커리큘럼, 키트 정보)을 한 번 만들어 캐시에 저장한다.
+
+    - 키: product-document:<DOCUMENT_SCHEMA>:<product_id>:<version>
+    - 상품별 version 은 캐시에 따로 저장하며, 관련 모델이 저장/삭제되면 signals 에서 version 을 올린다.
+      이전 version 의 문서는 더 이상 조회되지 않고 TTL 후 사라진다. (version 관리는 core/cache_version.py)
+      (무효화 직전에 만들기 시작한 문서가 무효화 이후에 저장되어도 이전 version 키에 저장되므로 안전하다)
+    - 문서는 다음 조회 시 다시 만든다(lazy). 동시에 여러 요청이 같은 문서를 만들지 않도록 single-flight 를 거친다.
+    - bulk_create/update 는 signal 을 보내지 않으므로 직접 invalidate_product_document 를 호출해야 한다.
+    - 여러 프로세스에서 실행할 때는 PRODUCT_DOCUMENT_CACHE_ALIAS 를 공유 캐시(memcached/redis)로 지정해야
+      무효화가 모든 프로세스에 적용된다.
+
+    History:
+        2026-10-18 - 초기 생성
+        2026-10-18 - 캐시 miss 시 single-flight 로 문서 생성
+"""
+from django.core.cache import caches
+from django.db.models  import Prefetch
+
+from core.singleflight   import SingleFlight
+from core.cache_version  import get_version, bump_version
+from product.models      import Product, Chapter, Lecture, ProductKit
+from clnass_101.settings import (
+    PRODUCT_DOCUMENT_CACHE_ALIAS,
+    PRODUCT_DOCUMENT_TTL,
+    SINGLE_FLIGHT_TIMEOUT,
+    SINGLE_FLIGHT_CACHE_ALIAS
+)
+
+DOCUMENT_SCHEMA = 1 # 문서 구조가 바뀌면 올린다
+
+document_flight = SingleFlight(
+    'product-document',
+    timeout     = SINGLE_FLIGHT_TIMEOUT,
+    cache_alias = SINGLE_FLIGHT_CACHE_ALIAS
+)
+
+
+def get_cache():
+    return caches[PRODUCT_DOCUMENT_CACHE_ALIAS]
+
+
+def version_key(product_id):
+    return f'product-document-version:{product_id}'
+
+
+def document_key(product_id, version):
+    return f'product-document:{DOCUMENT_SCHEMA}:{product_id}:{version}'
+
+
+def get_product_document(product_id):
+    """ 상품 상세 문서 (캐시에 없으면 만들어서 저장)
+
+        Raise:
+            Product.DoesNotExist - 없거나 삭제된 상품
+    """
+    cache    = get_cache()
+    version  = get_version(cache, version_key(product_id))
+    key      = document_key(product_id, version)
+    document = cache.get(key)
+
+    if document is None:
+        document = document_flight.do(
+            key,
+            lambda: store_product_document(key, product_id),
+            lookup=lambda: cache.get(key)
+        )
+
+    return document
+
+
+def store_product_document(key, product_id):
+    document = build_product_document(product_id)
+    get_cache().set(key, document, PRODUCT_DOCUMENT_TTL)
+    return document
+
+
+def invalidate_product_document(product_id):
+    bump_version(get_cache(), version_key(product_id))
+
+
+def build_product_document(product_id):
+    """ {'info': 응답에 그대로 포함되는 필드, 'startDate': 수강 시작일, 'creatorIds': 크리에이터/시그니처 id} """
+    product = Product.objects. \
+        select_related(
+            'sub_category',
+            'difficulty',
+            'creator',
+            'signature',
+        ).prefetch_related(
+            'productsubimage_set',
+            Prefetch(
+                'chapter_set',
+                queryset=Chapter.objects.order_by('order').prefetch_related(
+                    Prefetch('lecture_set', queryset=Lecture.objects.select_related('video'))
+                )
+            ),
+            Prefetch(
+                'productkit_set',
+                queryset=ProductKit.objects.select_related('kit').prefetch_related('kit__kitsubimageurl_set')
+            ),
+        ).get(id=product_id, is_deleted=0)
+
+    info = {
+        'mainImage'       : product.thumbnail_image,
+        'subImages'       : [
+            {
+                'imageUrl': sub_image.image_url
+            } for sub_image in product.productsubimage_set.all()
+        ],
+        'title'           : product.name,
+        'subCategoryName' : product.sub_category.name,
+        'classOwner'      : product.creator.nick_name if not product.signature else
+                            product.signature.name,
+        'sale'            : int(product.sale * 100),
+        'price'           : '{:,}원'.format(int(product.price * (1 - product.sale))),
+        'difficulty'      : f'{product.difficulty.name} 대상',
+        'curriculum' : [
+            {
+                'thumbnailImage' : chapter.thumbnail_image,
+                'chapterName'    : chapter.name,
+                'order'          : chapter.order,
+                'chapterDetail'  : [
+                    {
+                        'lectureNum'      : index + 1,
+                        'lectureTitle'    : lecture.name,
+                        'lectureVideoUrl' : lecture.video.video_url,
+                    } for index, lecture in enumerate(chapter.lecture_set.all())
+                ]
+            } for chapter in product.chapter_set.all()
+        ],
+        'kitInfo' : [
+            {
+                'mainImageUrl' : product_kit.kit.main_image_url,
+                'kitName'      : product_kit.kit.name,
+                'subImageUrls' : [
+                    {
+                        'subImageUrl' : sub_image.image_url
+                    } for sub_image in product_kit.kit.kitsubimageurl_set.all()
+                ]
+            } for product_kit in product.productkit_set.all()
+        ],
+        'classId' : product.id
+    }
+
+    return {
+        'info'       : info,
+        'startDate'  : product.start_date,
+        'creatorIds' : [product.creator_id, product.signature_id],
+    }
@@ -0,0 +1,167 @@
+""" 오타 교정("이것을 찾으셨나요?") 메모리 색인
+
+    상품명과 크리에이터명의 단어를 사전으로 두고, 검색 결과가 없을 때 검색어의 각 단어를 가장 비슷한 사전 단어로 바꾼다.
+
+    - 한글 음절 단위 trigram 은 두세 글자 단어의 한 글자만 틀려도 겹치는 것이 없으므로,
+      단어를 자모로 분해(NFD: '코딩' -> ㅋㅗㄷㅣㅇ)한 뒤 양 끝에 경계 문자를 붙여 trigram 을 만든다.
+    - trigram 마다 단어 id 배열(array)을 두고, 검색어 단어의 trigram 배열들만 세어(Counter) 후보를 고른다.
+      사전 전체를 훑지 않으며 비용은 검색어 trigram 의 배열 길이 합에 비례한다.
+    - 겹치는 trigram 비율(Dice 계수)이 MIN_SIMILARITY 이상인 후보 중 상위 MAX_CANDIDATES 개만
+      자모 편집 거리로 확인하고, 거리가 가장 작은(같으면 인기 있는) 단어를 고른다.
+    - 단어 인기도는 그 단어를 가진 상품의 좋아요 수 합과 상품 수다. 상품이 모두 빠진 단어는 후보에서 제외한다.
+
+    History:
+        2026-10-18 - 초기 생성
+"""
+import unicodedata
+
+from array       import array
+from collections import Counter
+
+from product.search_index import normalize
+
+FUZZY_FIELDS   = ('name', 'creator')
+BOUNDARY       = '$'
+MIN_SIMILARITY = 0.25
+MAX_CANDIDATES = 20
+
+
+def jamo(word):
+    """ 한글 음절을 자모로 분해 (그 외 글자는 그대로) """
+    return unicodedata.normalize('NFD', word)
+
+
+def trigrams(word):
+    text = f'{BOUNDARY}{jamo(word)}{BOUNDARY}'
+
+    return {text[index:index + 3] for index in range(len(text) - 2)}
+
+
+def max_distance(word):
+    """ 허용하는 편집 거리 (자모 4개당 1, 최소 1) """
+    return max(1, len(jamo(word)) // 4)
+
+
+def edit_distance(source, target, limit):
+    """ 편집 거리 (limit 을 넘으면 limit + 1) """
+    if abs(len(source) - len(target)) > limit:
+        return limit + 1
+
+    previous = list(range(len(target) + 1))
+
+    for row, source_char in enumerate(source, 1):
+        current = [row]
+
+        for column, target_char in enumerate(target, 1):
+            current.append(min(
+                previous[column] + 1,
+                current[column - 1] + 1,
+                previous[column - 1] + (source_char != target_char)
+            ))
+
+        if min(current) > limit:
+            return limit + 1
+
+        previous = current
+
+    return previous[-1]
+
+
+class FuzzyIndex:
+    def __init__(self):
+        self.words    = {} # 정규화한 단어 -> 단어 id
+        self.texts    = []
+        self.sizes    = [] # trigram 수
+        self.scores   = [] # (상품 수, 좋아요 수 합)
+        self.trigrams = {} # trigram -> 단어 id 배열
+        self.products = {} # 상품 id -> (단어 id, ...), 좋아요 수
+
+    def __len__(self):
+        return len(self.products)
+
+    def add(self, document):
+        """ 상품 추가 또는 갱신 (SearchDocument) """
+        word_ids = tuple(sorted({
+            self._word_id(word)
+            for field, text in document.texts if field in FUZZY_FIELDS
+            for word in map(normalize, text.split()) if word
+        }))
+
+        if self.products.get(document.id) == (word_ids, document.like_count):
+            return
+
+        self.remove(document.id)
+        self.products[document.id] = (word_ids, document.like_count)
+
+        for word_id in word_ids:
+            count, like_count = self.scores[word_id]
+            self.scores[word_id] = (count + 1, like_count + document.like_count)
+
+    def remove(self, product_id):
+        word_ids, product_like_count = self.products.pop(product_id, ((), 0))
+
+        for word_id in word_ids:
+            count, like_count = self.scores[word_id]
+            self.scores[word_id] = (count - 1, like_count - product_like_count)
+
+    def _word_id(self, word):
+        word_id = self.words.get(word)
+
+        if word_id is not None:
+            return word_id
+
+        word_id = self.words[word] = len(self.texts)
+        grams   = trigrams(word)
+
+        self.texts.append(word)
+        self.sizes.append(len(grams))
+        self.scores.append((0, 0))
+
+        for gram in grams:
+            self.trigrams.setdefault(gram, array('i')).append(word_id)
+
+        return word_id
+
+    def correct_word(self, word):
+        """ 사전에 없는 단어의 가장 비슷한 사전 단어 (없으면 None) """
+        word_id = self.words.get(word)
+
+        if word_id is not None and self.scores[word_id][0] > 0:
+            return None
+
+        grams  = trigrams(word)
+        shared = Counter()
+
+        for gram in grams:
+            shared.update(self.trigrams.get(gram, ()))
+
+        sizes, scores = self.sizes, self.scores
+        candidates    = sorted(
+            (
+                (2 * count / (len(grams) + sizes[candidate]), candidate)
+                for candidate, count in shared.items() if scores[candidate][0] > 0
+            ),
+            reverse=True
+        )[:MAX_CANDIDATES]
+
+        limit, source = max_distance(word), jamo(word)
+        best          = None
+
+        for similarity, candidate in candidates:
+            if similarity < MIN_SIMILARITY:
+                break
+
+            distance = edit_distance(source, jamo(self.texts[candidate]), limit)
+
+            if distance <= limit:
+                rank = (distance, -scores[candidate][1], -scores[candidate][0], self.texts[candidate])
+                best = min(best, rank) if best else rank
+
+        return best[-1] if best else None
+
+    def correct(self, query):
+        """ 단어마다 교정한 검색어. 바뀐 단어가 없으면 None """
+        words     = [word for word in map(normalize, query.split()) if word]
+        corrected = [self.correct_word(word) or word for word in words]
+
+        return ' '.join(corrected) if corrected != words else None
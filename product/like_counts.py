@@ -0,0 +1,107 @@
+""" 좋아요 수 비정규화 카운터 (Product.like_count, Community.like_count)
+
+    좋아요 추가/취소 시 F() 로 원자적으로 증감한다.
+    토글은 DELETE 를 먼저 시도하고, 지운 행이 없을 때만 INSERT 한다. (user, 대상) 유일 제약이 있으므로
+    동시에 들어온 INSERT 중 하나만 성공하고 나머지는 IntegrityError 로 이미 좋아요 상태임을 알게 된다.
+    signal 을 거치지 않는 삭제(유저 삭제에 의한 CASCADE, bulk 작업 등)로 어긋난 값은
+    reconcile_like_counts 관리 명령으로 주기적으로 맞춘다.
+
+    History:
+        2026-10-18 - 초기 생성
+        2026-10-18 - 단일 DELETE/INSERT 토글(toggle_like)
+"""
+from django.db                  import IntegrityError, transaction
+from django.db.models           import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from product.models import Product, Community, CommunityLike
+from user.models    import ProductLike
+
+# (카운터 모델, 좋아요 모델, 좋아요 모델에서 카운터 모델을 가리키는 필드)
+COUNTERS = {
+    'product'   : (Product, ProductLike, 'product'),
+    'community' : (Community, CommunityLike, 'community'),
+}
+
+
+def increase_like_count(model, object_id, amount):
+    model.objects.filter(id=object_id).update(like_count=F('like_count') + amount)
+
+
+def toggle_like(name, user_id, object_id):
+    """ 좋아요 추가/취소 후 (좋아요 상태, 좋아요 수) 반환
+
+        Raise:
+            IntegrityError - 없는 대상 (유일 제약 위반이 아닌 경우)
+    """
+    model, like_model, field = COUNTERS[name]
+    like_filter              = {'user_id': user_id, f'{field}_id': object_id}
+
+    with transaction.atomic():
+        deleted, _ = like_model.objects.filter(**like_filter).delete()
+
+        if deleted:
+            increase_like_count(model, object_id, -deleted)
+            is_liked = False
+
+        else:
+            try:
+                with transaction.atomic():
+                    like_model.objects.create(**like_filter)
+
+            except IntegrityError:
+                # 같은 (user, 대상) 좋아요가 동시에 추가됨: 먼저 추가한 요청이 카운터를 올린다
+                if not like_model.objects.filter(**like_filter).exists():
+                    raise
+
+            else:
+                increase_like_count(model, object_id, 1)
+
+            is_liked = True
+
+        like_count = model.objects.filter(id=object_id).values_list('like_count', flat=True).first()
+
+    return is_liked, like_count
+
+
+def count_likes(like_model, field):
+    """ 카운터 모델 행(OuterRef('pk'))의 실제 좋아요 수 서브쿼리 """
+    return Coalesce(
+        Subquery(
+            like_model.objects.filter(**{field: OuterRef('pk')}).order_by().
+                values(field).annotate(count=Count('id')).values('count')
+        ),
+        0
+    )
+
+
+def reconcile_like_counts(name, batch_size=1000, dry_run=False):
+    """ id 순으로 batch_size 개씩 저장된 like_count 와 실제 좋아요 수를 비교하여 다른 행만 갱신
+
+        갱신은 UPDATE ... SET like_count = (SELECT COUNT(*) ...) 한 문장으로 실행되어
+        비교와 갱신 사이에 추가된 좋아요도 반영된다.
+        반환: (검사한 행 수, 어긋난 행 수)
+    """
+    model, like_model, field = COUNTERS[name]
+
+    checked, drifted, last_id = 0, 0, 0
+
+    while True:
+        ids = list(
+            model.objects.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:batch_size]
+        )
+
+        if not ids:
+            return checked, drifted
+
+        drifted_ids = list(
+            model.objects.filter(id__in=ids).annotate(actual=count_likes(like_model, field)).
+                exclude(like_count=F('actual')).values_list('id', flat=True)
+        )
+
+        if drifted_ids and not dry_run:
+            model.objects.filter(id__in=drifted_ids).update(like_count=count_likes(like_model, field))
+
+        checked += len(ids)
+        drifted += len(drifted_ids)
+        last_id  = ids[-1]
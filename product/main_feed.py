@@ -0,0 +1,118 @@
+""" 메인 페이지 피드
+
+    유저와 무관한 카드 목록을 (sorting, main, sub, limit, cursor) 조건별로 캐시한다. (isLiked 는 뷰에서 채운다)
+
+    - stale-while-revalidate: MAIN_FEED_TTL 초 동안은 캐시를 그대로 쓰고,
+      이후 MAIN_FEED_STALE_TTL 초 동안은 이전 결과를 응답하면서 백그라운드에서 다시 조회한다.
+    - Product 가 저장/삭제되면 signals 에서 invalidate_main_feed 로 모든 조건의 캐시를 무효화한다.
+    - 좋아요 수(like_count) 변경은 F() update 로 signal 이 없으므로 무효화하지 않고 TTL 안에 반영된다.
+      (좋아요마다 피드 전체를 무효화하면 피크 시간에 캐시가 의미 없어진다)
+
+    History:
+        2026-10-18 - 초기 생성 (product/views.py 에서 이동, 결과 캐시 추가)
+"""
+from core.pagination     import paginate
+from core.singleflight   import SingleFlight
+from core.stale_cache    import StaleWhileRevalidateCache
+from product.models      import Product
+from clnass_101.settings import (
+    MAIN_PAGE_SIZE,
+    MAIN_FEED_CACHE_ALIAS,
+    MAIN_FEED_TTL,
+    MAIN_FEED_STALE_TTL,
+    SINGLE_FLIGHT_TIMEOUT
+)
+
+MAIN_PAGE_FIELDS = (
+    'id',
+    'created_at',
+    'name',
+    'thumbnail_image',
+    'sub_category__name',
+    'creator__name',
+    'like_count',
+    'price',
+    'sale'
+)
+
+# 메인 페이지 정렬별 키셋 (products_updated_idx, products_popular_idx). 정렬을 지정하지 않으면 id 순
+MAIN_PAGE_ORDERINGS        = {
+    'updated' : ('-created_at', '-id'),
+    'popular' : ('-like_count', '-id'),
+}
+MAIN_PAGE_DEFAULT_ORDERING = ('id',)
+
+# 캐시 miss 시 같은 조건의 동시 요청은 한 번만 조회한다 (프로세스 내)
+main_page_flight = SingleFlight('main-page', timeout=SINGLE_FLIGHT_TIMEOUT)
+
+main_feed_cache = StaleWhileRevalidateCache(
+    'main-feed',
+    ttl         = MAIN_FEED_TTL,
+    stale_ttl   = MAIN_FEED_STALE_TTL,
+    cache_alias = MAIN_FEED_CACHE_ALIAS
+)
+
+
+def get_main_feed(sorting, main_category_id, sub_category_id, cursor=None, limit=MAIN_PAGE_SIZE):
+    """ (카드 목록, 다음 페이지 커서). 캐시 경유, 반환된 목록은 요청 간에 공유되므로 수정하지 않는다
+
+        Raise:
+            ValueError    - 숫자가 아닌 카테고리 id
+            InvalidCursor - 잘못된 커서 또는 다른 정렬의 커서
+    """
+    conditions = (
+        sorting if sorting in MAIN_PAGE_ORDERINGS else None,
+        int(main_category_id) if main_category_id else None,
+        int(sub_category_id) if sub_category_id else None,
+        cursor or None,
+        limit
+    )
+
+    return main_feed_cache.get(
+        ':'.join(map(str, conditions)),
+        lambda: main_page_flight.do(conditions, lambda: get_main_page_products(*conditions))
+    )
+
+
+def invalidate_main_feed():
+    main_feed_cache.invalidate()
+
+
+def get_main_page_products(sorting, main_category_id, sub_category_id, cursor=None, limit=MAIN_PAGE_SIZE):
+    """ (메인 페이지 카드 목록, 다음 페이지 커서)
+
+        카드에 필요한 컬럼만 values() 로 조회한다.
+        모델 인스턴스나 좋아요/조회 유저를 메모리에 올리지 않으므로 요청당 메모리는
+        페이지 크기에만 비례하고 좋아요/조회 수와는 무관하다. 좋아요 수는 like_count 카운터를 읽는다.
+        정렬마다 (정렬 키, id) 복합 인덱스를 타는 키셋 페이지네이션으로 몇 번째 페이지든 같은 비용이다.
+
+        Raise:
+            InvalidCursor - 잘못된 커서 또는 다른 정렬의 커서
+    """
+    filters = {}
+
+    if main_category_id:
+        filters['main_category__id'] = main_category_id
+    if sub_category_id:
+        filters['sub_category__id'] = sub_category_id
+
+    products, next_cursor = paginate(
+        Product.objects.filter(**filters).values(*MAIN_PAGE_FIELDS),
+        MAIN_PAGE_ORDERINGS.get(sorting, MAIN_PAGE_DEFAULT_ORDERING),
+        cursor,
+        limit
+    )
+
+    return [{
+        'created_at' : product['created_at'],
+        'id'         : product['id'],
+        'title'      : product['name'],
+        'thumbnail'  : product['thumbnail_image'],
+        'subCategory': product['sub_category__name'],
+        'creator'    : product['creator__name'],
+        'isLiked'    : False, # 유저별 값은 MainPageView 에서 채운다
+        'likeCount'  : product['like_count'],
+        'price'      : int(product['price']),
+        'sale'       : product['sale'],
+        'finalPrice' : round(int(product['price'] * (1 - product['sale'])), 2)
+    } for product in products], next_cursor
@@ -0,0 +1,186 @@
+""" 상품 검색 역색인/자동완성 마이크로 벤치마크
+
+    DB 없이 합성 SearchDocument 로 SearchIndex 를 만들고 구성 시간과 검색어별 검색 시간(p50/p99)을 측정한다.
+    --suggest 를 주면 SuggestIndex 도 만들고 접두어별 자동완성 시간(memo 없음/있음)을 측정한다.
+    --fuzzy 를 주면 FuzzyIndex 도 만들고 오타 검색어별 교정 시간을 측정한다.
+    검색 시간은 질의 토큰 중 가장 짧은 posting list 의 길이(와 결과 수)에 비례하므로 검색어별로 함께 출력한다.
+    p50/p99 는 결과 캐시를 비운 상태의 시간이고, cached 는 같은 검색을 반복했을 때의 시간이다.
+    facets 는 검색 결과 전체의 facet 수를 세는 시간(결과 캐시를 비운 상태)이다.
+
+    사용법:
+        python manage.py benchmark_search
+        python manage.py benchmark_search --products 1000000 --queries 코딩 드로잉 '파이썬 기초'
+        python manage.py benchmark_search --suggest --prefixes 코 코ㄷ ㅋㄷ 파이썬
+        python manage.py benchmark_search --fuzzy --typos 코팅 '파이선 기초'
+"""
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+
+from product.search_index  import SearchIndex, SearchDocument, tokenize
+from product.suggest_index import SuggestIndex
+from product.fuzzy_index   import FuzzyIndex
+from clnass_101.settings   import SEARCH_PRICE_BUCKETS
+
+WORDS = (
+    '코딩', '파이썬', '자바스크립트', '드로잉', '수채화', '일러스트', '캘리그라피', '요리', '베이킹', '사진',
+    '영상', '편집', '기초', '입문', '실전', '완성', '마스터', '클래스', '프로젝트', '디자인',
+    '마케팅', '글쓰기', '재테크', '주식', '뜨개질', '가죽', '공예', '운동', '요가', '피아노',
+)
+CATEGORIES = ('크리에이티브', '커리어', '머니', '라이프')
+SUB_CATEGORIES = ('개발', '미술', '요리', '음악', '공예', '투자', '운동', '마케팅')
+DEFAULT_QUERIES = ('코딩', '파이썬 기초', '수채화 일러스트', '재테크 실전 클래스', '운동', '없는검색어')
+DEFAULT_PREFIXES = ('코', '코ㄷ', 'ㅋㄷ', '파이썬', '크리에이터12', '없는')
+DEFAULT_TYPOS    = ('코팅', '파이선 기초', '수채하 일러스트', '크리에이터l2', '전혀다른말')
+
+
+def generate_documents(products, creators, seed):
+    generator = random.Random(seed)
+
+    for product_id in range(1, products + 1):
+        sub_category = generator.randrange(len(SUB_CATEGORIES))
+
+        yield SearchDocument(
+            id               = product_id,
+            texts            = (
+                ('name', ' '.join(generator.sample(WORDS, generator.randint(2, 5)))),
+                ('main_category', CATEGORIES[sub_category % len(CATEGORIES)]),
+                ('sub_category', SUB_CATEGORIES[sub_category]),
+                ('creator', f'크리에이터{generator.randrange(creators)}'),
+            ),
+            like_count       = generator.randrange(10000),
+            created_at       = generator.randrange(1600000000, 1800000000),
+            sub_category_id  = sub_category + 1,
+            main_category_id = sub_category % len(CATEGORIES) + 1,
+            difficulty_id    = generator.randint(1, 3),
+            price            = generator.randrange(10000, 400000, 1000),
+            has_kit          = generator.random() < 0.3
+        )
+
+
+class Command(BaseCommand):
+    help = '상품 검색 역색인 구성 시간과 검색 시간(p50/p99) 측정'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--products', type=int, default=100000)
+        parser.add_argument('--creators', type=int, default=5000)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--limit', type=int, default=100)
+        parser.add_argument('--repeat', type=int, default=50)
+        parser.add_argument('--queries', nargs='+', default=DEFAULT_QUERIES)
+        parser.add_argument('--suggest', action='store_true', help='자동완성 색인도 측정')
+        parser.add_argument('--prefixes', nargs='+', default=DEFAULT_PREFIXES)
+        parser.add_argument('--fuzzy', action='store_true', help='오타 교정 색인도 측정')
+        parser.add_argument('--typos', nargs='+', default=DEFAULT_TYPOS)
+
+    def handle(self, *args, **options):
+        index = SearchIndex(price_buckets=SEARCH_PRICE_BUCKETS)
+        start = time.perf_counter()
+
+        for document in generate_documents(options['products'], options['creators'], options['seed']):
+            index.add(document)
+
+        self.stdout.write(
+            f'products={len(index)} tokens={len(index.postings)}'
+            f' build={time.perf_counter() - start:.1f}s'
+        )
+
+        for query in options['queries']:
+            for sorting in (None, 'popular'):
+                elapsed = []
+
+                for _ in range(options['repeat']):
+                    index.results.clear()
+                    start   = time.perf_counter()
+                    results = index.search(query, options['limit'], sorting)
+                    elapsed.append((time.perf_counter() - start) * 1000)
+
+                start = time.perf_counter()
+                index.search(query, options['limit'], sorting)
+                cached = (time.perf_counter() - start) * 1000
+
+                elapsed.sort()
+                shortest = min((len(index.postings.get(token, ((),))[0]) for token in tokenize(query)), default=0)
+
+                self.stdout.write(
+                    f'{query:<16} sorting={str(sorting):<8}'
+                    f' matches={len(index.match(query)[0]):<8} shortest={shortest:<8} results={len(results):<4}'
+                    f' p50={statistics.median(elapsed):8.2f}ms'
+                    f' p99={elapsed[min(len(elapsed) - 1, int(len(elapsed) * 0.99))]:8.2f}ms'
+                    f' cached={cached:6.3f}ms'
+                )
+
+            elapsed = []
+
+            for _ in range(options['repeat']):
+                index.results.clear()
+                start = time.perf_counter()
+                index.facets(query)
+                elapsed.append((time.perf_counter() - start) * 1000)
+
+            self.stdout.write(f'{query:<16} facets p50={statistics.median(elapsed):8.2f}ms max={max(elapsed):8.2f}ms')
+
+        if options['suggest']:
+            self.measure_suggest(options)
+
+        if options['fuzzy']:
+            self.measure_fuzzy(options)
+
+    def measure_suggest(self, options):
+        suggestions = SuggestIndex()
+        start       = time.perf_counter()
+
+        for document in generate_documents(options['products'], options['creators'], options['seed']):
+            suggestions.add(document)
+
+        suggestions.warm()
+
+        self.stdout.write(
+            f'suggest terms={len(suggestions.labels)} entries={len(suggestions.entries)}'
+            f' build={time.perf_counter() - start:.1f}s'
+        )
+
+        for prefix in options['prefixes']:
+            elapsed = []
+
+            for _ in range(options['repeat']):
+                suggestions.memo.pop(prefix, None)
+                start   = time.perf_counter()
+                results = suggestions.suggest(prefix, 10)
+                elapsed.append((time.perf_counter() - start) * 1000)
+
+            start = time.perf_counter()
+            suggestions.suggest(prefix, 10)
+            cached = (time.perf_counter() - start) * 1000
+
+            self.stdout.write(
+                f'{prefix:<16} results={len(results):<4}'
+                f' p50={statistics.median(elapsed):8.3f}ms max={max(elapsed):8.3f}ms cached={cached:6.3f}ms'
+            )
+
+    def measure_fuzzy(self, options):
+        fuzzy = FuzzyIndex()
+        start = time.perf_counter()
+
+        for document in generate_documents(options['products'], options['creators'], options['seed']):
+            fuzzy.add(document)
+
+        self.stdout.write(
+            f'fuzzy words={len(fuzzy.texts)} trigrams={len(fuzzy.trigrams)}'
+            f' build={time.perf_counter() - start:.1f}s'
+        )
+
+        for typo in options['typos']:
+            elapsed = []
+
+            for _ in range(options['repeat']):
+                start     = time.perf_counter()
+                corrected = fuzzy.correct(typo)
+                elapsed.append((time.perf_counter() - start) * 1000)
+
+            self.stdout.write(
+                f'{typo:<16} corrected={str(corrected):<16}'
+                f' p50={statistics.median(elapsed):8.3f}ms max={max(elapsed):8.3f}ms'
+            )
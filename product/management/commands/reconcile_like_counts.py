@@ -0,0 +1,34 @@
+""" 좋아요 수 카운터 보정
+
+    Product.like_count, Community.like_count 를 실제 좋아요 수와 비교하여 어긋난 행만 갱신한다.
+    cron 등으로 주기적으로 실행한다.
+
+    사용법:
+        python manage.py reconcile_like_counts
+        python manage.py reconcile_like_counts --target product --dry-run
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from product.like_counts import COUNTERS, reconcile_like_counts
+
+
+class Command(BaseCommand):
+    help = '좋아요 수 카운터(like_count)를 실제 좋아요 수로 보정'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--target', choices=list(COUNTERS), action='append', help='기본값: 전체')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--dry-run', action='store_true', help='보정하지 않고 어긋난 행 수만 출력')
+
+    def handle(self, *args, **options):
+        for name in options['target'] or COUNTERS:
+            start            = time.perf_counter()
+            checked, drifted = reconcile_like_counts(name, options['batch_size'], options['dry_run'])
+
+            self.stdout.write(
+                f'{name}: checked={checked} drifted={drifted}'
+                f'{" (dry run)" if options["dry_run"] else " fixed"}'
+                f' in {time.perf_counter() - start:.2f}s'
+            )
@@ -0,0 +1,17 @@
+# Generated by Django 3.1.5 on 2026-10-18 12:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('product', '0002_auto_20210120_0219'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='community',
+            index=models.Index(fields=['product', '-updated_at', '-id'], name='communities_feed_idx'),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 3.1.5 on 2026-10-18 12:11
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_like_counts(apps, schema_editor):
+    for model_name, like_app, like_model_name, field in (
+        ('Product', 'user', 'ProductLike', 'product'),
+        ('Community', 'product', 'CommunityLike', 'community'),
+    ):
+        model      = apps.get_model('product', model_name)
+        like_model = apps.get_model(like_app, like_model_name)
+
+        model.objects.update(like_count=Coalesce(
+            Subquery(
+                like_model.objects.filter(**{field: OuterRef('pk')}).order_by().
+                    values(field).annotate(count=Count('id')).values('count')
+            ),
+            0
+        ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('product', '0003_community_feed_index'),
+        ('user', '0004_recently_view_viewed_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='community',
+            name='like_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='like_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(fill_like_counts, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['-like_count'], name='products_like_count_idx'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 3.1.5 on 2026-10-18 12:15
+
+from django.db import migrations, models
+
+from django.db.models import Count, Min, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def remove_duplicated_likes(apps, schema_editor):
+    """ (user, community) 마다 가장 먼저(id 가 가장 작은) 누른 좋아요만 남기고 해당 글의 like_count 를 다시 센다 """
+    Community     = apps.get_model('product', 'Community')
+    CommunityLike = apps.get_model('product', 'CommunityLike')
+    duplicated    = list(
+        CommunityLike.objects.values('user_id', 'community_id').annotate(first_id=Min('id'), count=Count('id')). \
+            filter(count__gt=1)
+    )
+
+    for row in duplicated:
+        CommunityLike.objects.filter(user_id=row['user_id'], community_id=row['community_id']). \
+            exclude(id=row['first_id']).delete()
+
+    Community.objects.filter(id__in={row['community_id'] for row in duplicated}).update(like_count=Coalesce(
+        Subquery(
+            CommunityLike.objects.filter(community=OuterRef('pk')).order_by().
+                values('community').annotate(count=Count('id')).values('count')
+        ),
+        0
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('product', '0004_like_count'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicated_likes, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='communitylike',
+            constraint=models.UniqueConstraint(fields=('user', 'community'), name='community_likes_user_community_unique'),
+        ),
+    ]
@@ -17,9 +17,14 @@ class Product(models.Model):
     created_at      = models.DateTimeField(auto_now_add=True)
     updated_at      = models.DateField(auto_now=True, editable=True)
     is_deleted      = models.BooleanField(default=False)
+    like_count      = models.IntegerField(default=0)
     
     class Meta:
         db_table = 'products'
+        indexes  = [
+            models.Index(fields=['-like_count', '-id'], name='products_popular_idx'),
+            models.Index(fields=['-created_at', '-id'], name='products_updated_idx'),
+        ]
 
 class ProductSubImage(models.Model):
     image_url = models.URLField(max_length=1000)
@@ -54,9 +59,13 @@ class Community(models.Model):
     product     = models.ForeignKey('product.Product', on_delete=models.CASCADE)
     created_at  = models.DateTimeField(auto_now_add=True)
     updated_at  = models.DateTimeField(auto_now=True, editable=True)
+    like_count  = models.IntegerField(default=0)
     
     class Meta:
         db_table = 'communities'
+        indexes  = [
+            models.Index(fields=['product', '-updated_at', '-id'], name='communities_feed_idx'),
+        ]
 
 class CommunityComment(models.Model):
     content    = models.CharField(max_length=500)
@@ -73,7 +82,10 @@ class CommunityLike(models.Model):
     community = models.ForeignKey('product.Community', on_delete=models.CASCADE)
     
     class Meta:
-        db_table = 'community_likes'
+        db_table    = 'community_likes'
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'community'], name='community_likes_user_community_unique'),
+        ]
 
 class MainCategory(models.Model):
     name = models.CharField(max_length=50)
@@ -0,0 +1,419 @@
+""" 상품 검색
+
+    SearchView 의 검색을 메모리 역색인(product/search_index.py)으로 처리한다.
+
+    - 색인은 프로세스마다 하나이며 첫 검색 때 백그라운드에서 DB 를 id 순으로 읽어 만든다.
+      색인이 준비되기 전에는 DB(icontains) 로 검색한다.
+    - 상품/키트/상세 카테고리가 바뀌면 signals 에서 search_changes(변경 로그)에 상품 id 를 기록한다.
+      밀린 변경이 있으면 백그라운드에서 그 상품만 DB 에서 다시 읽어 색인에 반영한다. (다른 프로세스의 변경 포함)
+      검색 요청은 반영을 기다리지 않으며, DB 조회는 lock 밖에서 하므로 반영 중에도 검색은 막히지 않는다.
+    - SEARCH_INDEX_MAX_AGE 가 지나면 백그라운드에서 전체를 다시 만든다.
+      signal 이 없는 변경(좋아요 수, 조회 수, 크리에이터/카테고리 이름 변경, bulk 작업)은 이때 반영된다.
+    - 순수 Python 검색은 GIL 을 잡고 실행되므로 색인 변경과 검색은 하나의 lock 으로 직렬화한다.
+    - 자동완성 색인(product/suggest_index.py), 오타 교정 색인(product/fuzzy_index.py)도 같은 문서로 함께 만들고 갱신한다.
+      자동완성 요청은 DB 를 읽지 않는다. 변경 반영은 백그라운드에서 하고, 색인 준비 전에는 빈 목록으로 응답한다.
+
+    History:
+        2026-10-18 - 초기 생성
+"""
+import logging
+import threading
+import time
+
+from collections import defaultdict
+
+from django.db        import connections
+from django.db.models import Count, Q
+
+from core.change_log       import ChangeLog
+from product.models        import Product, ProductKit, ProductDetailCategory, SubCategory
+from product.search_index  import SearchIndex, SearchDocument
+from product.suggest_index import SuggestIndex
+from product.fuzzy_index   import FuzzyIndex
+from user.models           import RecentlyView
+from clnass_101.settings   import (
+    SEARCH_RESULT_LIMIT,
+    SEARCH_INDEX_CACHE_ALIAS,
+    SEARCH_INDEX_MAX_AGE,
+    SEARCH_INDEX_BATCH_SIZE,
+    SEARCH_SUGGEST_LIMIT,
+    SEARCH_PRICE_BUCKETS
+)
+
+logger = logging.getLogger(__name__)
+
+PRODUCT_FIELDS = (
+    'id',
+    'name',
+    'main_category__name',
+    'sub_category__name',
+    'creator__name',
+    'like_count',
+    'created_at',
+    'sub_category_id',
+    'main_category_id',
+    'difficulty_id',
+    'difficulty__name',
+    'price',
+    'sale'
+)
+
+search_changes = ChangeLog('search-index-changes', cache_alias=SEARCH_INDEX_CACHE_ALIAS, ttl=SEARCH_INDEX_MAX_AGE * 2)
+
+
+def load_documents(product_ids=None, batch_size=SEARCH_INDEX_BATCH_SIZE):
+    """ id 순으로 batch_size 개씩 읽은 SearchDocument (batch 마다 상품, 키트, 상세 카테고리, 조회 수 네 번의 쿼리) """
+    products = Product.objects.order_by('id').values_list(*PRODUCT_FIELDS)
+
+    if product_ids is not None:
+        products = products.filter(id__in=product_ids)
+
+    last_id = 0
+
+    while True:
+        rows = list(products.filter(id__gt=last_id)[:batch_size])
+
+        if not rows:
+            return
+
+        ids     = [row[0] for row in rows]
+        related = defaultdict(list)
+
+        for product_id, name in ProductKit.objects.filter(product_id__in=ids).values_list('product_id', 'kit__name'):
+            related[product_id].append(('kit', name or ''))
+
+        for product_id, name in ProductDetailCategory.objects.filter(product_id__in=ids). \
+                values_list('product_id', 'detail_category__name'):
+            related[product_id].append(('detail_category', name))
+
+        view_counts = dict(
+            RecentlyView.objects.filter(product_id__in=ids).order_by().values('product_id').
+                annotate(count=Count('id')).values_list('product_id', 'count')
+        )
+
+        for (product_id, name, main_category, sub_category, creator, like_count, created_at,
+                sub_category_id, main_category_id, difficulty_id, difficulty, price, sale) in rows:
+            yield SearchDocument(
+                id               = product_id,
+                texts            = (
+                    ('name', name),
+                    ('main_category', main_category or ''),
+                    ('sub_category', sub_category or ''),
+                    ('creator', creator or ''),
+                    *sorted(related[product_id])
+                ),
+                like_count       = like_count,
+                created_at       = int(created_at.timestamp()),
+                sub_category_id  = sub_category_id,
+                main_category_id = main_category_id,
+                difficulty_id    = difficulty_id,
+                difficulty       = difficulty or '',
+                price            = int(price * (1 - sale)),
+                has_kit          = any(field == 'kit' for field, _ in related[product_id]),
+                view_count       = view_counts.get(product_id, 0)
+            )
+
+        last_id = ids[-1]
+
+
+class ProductSearch:
+    def __init__(self, changes, max_age, batch_size, background=True):
+        self.changes     = changes
+        self.max_age     = max_age
+        self.batch_size  = batch_size
+        self.background  = background
+        self.index       = None
+        self.suggestions = None
+        self.fuzzy       = None
+        self.seq         = 0
+        self.built_at    = 0
+        self.synced_at   = 0
+        self.building    = False
+        self.syncing     = False
+        self.rebuilds    = 0
+        self.updates     = 0
+        self._lock       = threading.Lock()
+        self._state      = threading.Lock()
+
+    def search(self, query, limit, sorting=None, sub_category_ids=None, offset=0):
+        """ 정렬 기준 offset 번째부터 limit 개 상품 id. 색인이 아직 준비되지 않았으면 None """
+        if not self.ready():
+            return None
+
+        with self._lock:
+            return self.index.search(query, limit, sorting, sub_category_ids, offset)
+
+    def count(self, query, sub_category_ids=None):
+        """ 검색 결과 전체 상품 수 (search 직후 호출). 색인이 준비되지 않았으면 None """
+        with self._lock:
+            return self.index.count(query, sub_category_ids) if self.index is not None else None
+
+    def facets(self, query, sub_category_ids=None):
+        """ 검색 결과 전체의 facet 별 상품 수 (search 직후 호출). 색인이 준비되지 않았으면 None """
+        with self._lock:
+            if self.index is None:
+                return None
+
+            counts = self.index.facets(query, sub_category_ids)
+            names  = self.index.names
+
+            return format_facets(counts, names, self.index.price_buckets)
+
+    def suggest(self, query, limit):
+        """ 자동완성 후보 [(종류, 텍스트), ...]. 색인이 아직 준비되지 않았으면 빈 목록 """
+        if self.index is None:
+            self.rebuild()
+
+            if self.index is None:
+                return []
+
+        elif time.time() - self.built_at > self.max_age:
+            self.rebuild()
+
+        self.refresh()
+
+        with self._lock:
+            return self.suggestions.suggest(query, limit)
+
+    def correct(self, query):
+        """ 오타를 교정한 검색어. 색인이 준비되지 않았거나 바꿀 단어가 없으면 None """
+        with self._lock:
+            return self.fuzzy.correct(query) if self.fuzzy is not None else None
+
+    def refresh(self):
+        """ 밀린 변경이 있으면 sync (background 이면 요청을 기다리게 하지 않도록 별도 스레드에서) """
+        if not self.background:
+            self.sync()
+            return
+
+        if self.changes.last_seq() == self.seq and time.time() - self.synced_at <= self.changes.ttl:
+            return
+
+        with self._state:
+            if self.syncing:
+                return
+
+            self.syncing = True
+
+        threading.Thread(target=self._refresh, name='product-search-sync', daemon=True).start()
+
+    def _refresh(self):
+        try:
+            self.sync()
+
+        except Exception:
+            logger.exception('product search index sync failed')
+
+        finally:
+            with self._state:
+                self.syncing = False
+
+            connections.close_all()
+
+    def ready(self):
+        if self.index is None:
+            self.rebuild()
+            return self.index is not None
+
+        if time.time() - self.built_at > self.max_age:
+            self.rebuild()
+
+        self.refresh()
+        return True
+
+    def sync(self):
+        """ 변경 로그에서 마지막으로 반영한 이후의 변경을 읽어 반영 """
+        if time.time() - self.synced_at > self.changes.ttl:
+            # 로그 항목이 만료되었을 수 있다. 재구성이 끝날 때까지 현재 색인으로 응답한다
+            self.rebuild()
+            return
+
+        start        = self.seq
+        seq, changed = self.changes.changes_since(start)
+
+        if changed is None:
+            self.rebuild()
+            return
+
+        # DB 조회는 lock 밖에서 한다 (반영하는 동안 검색을 막지 않도록)
+        documents = {document.id: document for document in load_documents(changed, self.batch_size)} if changed else {}
+
+        with self._lock:
+            # 그 사이 다른 sync 나 재구성이 먼저 반영했으면 버린다 (순번이 되돌아가지 않도록)
+            if self.seq == start:
+                self._apply(seq, changed, documents)
+
+    def _apply(self, seq, changed, documents):
+        """ self._lock 을 잡은 상태에서 호출 """
+        if changed:
+            for product_id in changed:
+                if product_id in documents:
+                    self.index.add(documents[product_id])
+                    self.suggestions.add(documents[product_id])
+                    self.fuzzy.add(documents[product_id])
+                else:
+                    self.index.remove(product_id)
+                    self.suggestions.remove(product_id)
+                    self.fuzzy.remove(product_id)
+
+            self.updates += len(changed)
+
+        self.seq       = seq
+        self.synced_at = time.time()
+
+    def rebuild(self):
+        with self._state:
+            if self.building:
+                return
+
+            self.building = True
+
+        if not self.background:
+            self._rebuild()
+            return
+
+        threading.Thread(target=self._rebuild, name='product-search-rebuild', daemon=True).start()
+
+    def _rebuild(self):
+        try:
+            # 구성 전에 순번을 읽으므로 구성 중에 기록된 변경은 다음 sync 에서 다시 반영된다
+            seq         = self.changes.last_seq()
+            index       = SearchIndex(price_buckets=SEARCH_PRICE_BUCKETS)
+            suggestions = SuggestIndex()
+            fuzzy       = FuzzyIndex()
+
+            for document in load_documents(batch_size=self.batch_size):
+                index.add(document)
+                suggestions.add(document)
+                fuzzy.add(document)
+
+            suggestions.warm()
+
+            with self._lock:
+                self.index       = index
+                self.suggestions = suggestions
+                self.fuzzy       = fuzzy
+                self.seq         = seq
+                self.built_at    = self.synced_at = time.time()
+                self.rebuilds   += 1
+
+        except Exception:
+            logger.exception('product search index rebuild failed')
+
+        finally:
+            with self._state:
+                self.building = False
+
+            if self.background:
+                connections.close_all()
+
+    def reset(self):
+        with self._lock:
+            self.index       = None
+            self.suggestions = None
+            self.fuzzy       = None
+            self.seq         = 0
+            self.built_at    = self.synced_at = 0
+            self.rebuilds    = self.updates = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'ready'    : self.index is not None,
+                'products' : len(self.index) if self.index is not None else 0,
+                'tokens'   : len(self.index.postings) if self.index is not None else 0,
+                'terms'    : len(self.suggestions.labels) if self.suggestions is not None else 0,
+                'words'    : len(self.fuzzy.texts) if self.fuzzy is not None else 0,
+                'seq'      : self.seq,
+                'rebuilds' : self.rebuilds,
+                'updates'  : self.updates,
+            }
+
+
+product_search = ProductSearch(search_changes, max_age=SEARCH_INDEX_MAX_AGE, batch_size=SEARCH_INDEX_BATCH_SIZE)
+
+
+def format_facets(counts, names, price_buckets):
+    """ SearchIndex.facets 의 {값: 상품 수} 를 응답 형식으로 (상품 수 많은 순, 가격은 구간 순) """
+    def named(facet):
+        return [
+            {'id': value, 'name': names.get((facet, value), ''), 'count': count}
+            for value, count in sorted(counts[facet].items(), key=lambda item: (-item[1], item[0])) if value
+        ]
+
+    return {
+        'subCategory'  : named('sub_category'),
+        'mainCategory' : named('main_category'),
+        'difficulty'   : named('difficulty'),
+        'price'        : [{
+            'min'   : price_buckets[bucket],
+            'max'   : price_buckets[bucket + 1] if bucket + 1 < len(price_buckets) else None,
+            'count' : counts['price'][bucket]
+        } for bucket in sorted(counts['price'])],
+        'hasKit'       : [
+            {'value': value, 'count': counts['has_kit'][value]} for value in (True, False) if counts['has_kit'][value]
+        ],
+    }
+
+
+def search_products(query, sorting=None, sub_category_name=None, limit=SEARCH_RESULT_LIMIT, offset=0):
+    """ (검색어에 맞는 offset 번째부터 limit 개 상품 id, 검색 결과 전체 상품 수, 검색 결과 전체의 facet 별 상품 수)
+
+        sorting: 'relevance'(관련도), 'popular'(좋아요 수), 'updated'(생성 시각), 'views'(조회 수)
+        색인이 준비되지 않았으면 DB 로 검색하며 facet 은 None 이다.
+    """
+    sorting          = None if sorting == 'relevance' else sorting
+    sub_category_ids = None
+
+    if sub_category_name:
+        sub_category_ids = set(SubCategory.objects.filter(name=sub_category_name).values_list('id', flat=True))
+
+    product_ids = product_search.search(query, limit, sorting, sub_category_ids, offset)
+
+    if product_ids is None:
+        return search_database(query, sorting, sub_category_name, limit, offset) + (None,)
+
+    return product_ids, product_search.count(query, sub_category_ids), product_search.facets(query, sub_category_ids)
+
+
+def search_suggestions(query, limit=SEARCH_SUGGEST_LIMIT):
+    """ 자동완성 후보 [(종류, 텍스트), ...] (종류: 'product', 'creator', 'category') """
+    return product_search.suggest(query, limit)
+
+
+def did_you_mean(query):
+    """ 오타를 교정한 검색어 (메모리 색인, DB 조회 없음). 없으면 None """
+    return product_search.correct(query)
+
+
+def search_database(query, sorting, sub_category_name, limit, offset=0):
+    """ 색인 없이 DB 에서 icontains 로 검색 (색인 준비 전). (상품 id 목록, 검색 결과 전체 상품 수) """
+    orderings = {
+        'popular' : ('-like_count', '-id'),
+        'updated' : ('-created_at', '-id'),
+        'views'   : ('-view_count', '-id'),
+    }
+    products  = Product.objects.filter(
+        Q(name__icontains=query) |
+        Q(main_category__name__icontains=query) |
+        Q(sub_category__name__icontains=query) |
+        Q(creator__name__icontains=query) |
+        Q(kit__name__icontains=query) |
+        Q(detail_category__name__icontains=query)
+    )
+
+    if sub_category_name:
+        products = products.filter(sub_category__name=sub_category_name)
+
+    product_ids = Product.objects.filter(id__in=products.values('id'))
+
+    if sorting == 'views':
+        product_ids = product_ids.annotate(view_count=Count('product_view_user'))
+
+    return (
+        list(
+            product_ids.order_by(*orderings.get(sorting, ('-like_count', '-id'))).
+                values_list('id', flat=True)[offset:offset + limit]
+        ),
+        products.distinct().count()
+    )
@@ -0,0 +1,369 @@
+""" 상품 검색 메모리 역색인
+
+    상품명, 메인/서브 카테고리명, 크리에이터명, 키트명, 상세 카테고리명을 한글 bigram 으로 색인한다.
+
+    - 정규화: NFC, 소문자, 글자/숫자 외 문자(공백 포함) 제거 후 연속 두 글자씩 자른다.
+      공백을 지우고 자르므로 '코딩 클래스' 와 '코딩클래스' 는 같은 토큰이 된다. 한 글자 필드는 그 글자가 토큰이다.
+    - 토큰마다 상품 id 오름차순 배열(array) 과 같은 위치의 가중치 배열을 둔다.
+      가중치는 토큰이 나온 필드 가중치(FIELD_WEIGHTS)의 합이다.
+    - 검색은 질의의 모든 토큰을 가진 상품(posting list 교집합)이다. 가장 짧은 목록부터 차례로 이진 탐색하므로
+      비용은 가장 짧은 posting list 길이에 비례한다. 정렬 기준 상위 limit 개만 heap 으로 고른다.
+    - 상품 속성(좋아요 수, 조회 수, 생성 시각, 서브 카테고리, facet 그룹)은 상품 id 를 인덱스로 하는 배열에 둔다.
+    - 페이지는 정렬 기준 상위 offset + limit 개를 고른 뒤 앞 offset 개를 버린다. 전체 결과 수는 facet 과 함께 센다.
+    - facet: (서브 카테고리, 메인 카테고리, 난이도, 가격 구간, 키트 여부) 조합마다 그룹 번호를 붙여 두고,
+      검색 결과 전체(상위 limit 개가 아님)의 그룹 번호를 한 번 센 뒤(Counter) 몇 개 안 되는 그룹을 facet 별로 합친다.
+      서브 카테고리 facet 은 서브 카테고리 필터를 적용하기 전 결과로 세므로 다른 서브 카테고리로 바로 바꿀 수 있다.
+    - 색인 텍스트가 바뀌지 않은 갱신은 속성만 바꾼다. 텍스트가 바뀌면 상품의 토큰에서 상품을 지우고 다시 넣는다.
+      상품마다 토큰 목록을 두므로 삭제 비용은 전체 토큰 수가 아니라 그 상품의 토큰 수에 비례한다.
+    - 매우 흔한 토큰 하나로 된 검색은 결과 전체를 정렬 기준으로 골라야 하므로 posting list 길이만큼 걸린다.
+      최근 검색 결과를 RESULT_CACHE_SIZE 개까지 둔다.
+    - 결과 캐시 무효화: add/remove 는 바뀐 상품의 토큰(과 그 글자)을 changed 에 모으기만 한다.
+      다음 조회 때 한 번, 질의 토큰이 모두 changed 에 있는 결과만 지운다. (그 외 질의의 결과에는 바뀐 상품이 나올 수 없다)
+      변경 로그의 변경 여러 건을 반영해도 캐시는 한 번만 훑고, 관계없는 검색어의 결과는 유지된다.
+
+    Django 에 의존하지 않는 자료구조이며, DB 에서 읽어 채우고 동기화하는 부분은 product/search.py 에 있다.
+
+    History:
+        2026-10-18 - 초기 생성
+"""
+import heapq
+import unicodedata
+
+from array       import array
+from bisect      import bisect_left, bisect_right
+from collections import Counter, OrderedDict, defaultdict, namedtuple
+from itertools   import compress
+
+FIELD_WEIGHTS = {
+    'name'            : 8,
+    'creator'         : 4,
+    'main_category'   : 2,
+    'sub_category'    : 2,
+    'kit'             : 2,
+    'detail_category' : 1,
+}
+MAX_WEIGHT = 255
+RESULT_CACHE_SIZE = 1024 # 색인이 바뀌지 않는 동안 재사용할 (검색어, 정렬, 필터) 결과 수
+
+# texts: ((필드 이름, 텍스트), ...), created_at: epoch 초, *_id: 없으면 0, price: 할인 적용 가격, view_count: 조회 수
+SearchDocument = namedtuple(
+    'SearchDocument',
+    'id texts like_count created_at sub_category_id main_category_id difficulty_id difficulty price has_kit view_count',
+    defaults=(0, 0, '', 0, False, 0)
+)
+
+
+def normalize(text):
+    return ''.join(char for char in unicodedata.normalize('NFC', text or '').lower() if char.isalnum())
+
+
+def tokenize(text):
+    """ 정규화한 텍스트의 bigram 집합 (한 글자면 그 글자) """
+    text = normalize(text)
+
+    if len(text) == 1:
+        return {text}
+
+    return {text[index:index + 2] for index in range(len(text) - 1)}
+
+
+def token_weights(texts):
+    weights = defaultdict(int)
+
+    for field, text in texts:
+        for token in tokenize(text):
+            weights[token] = min(weights[token] + FIELD_WEIGHTS[field], MAX_WEIGHT)
+
+    return weights
+
+
+class SearchIndex:
+    def __init__(self, price_buckets=(0,)):
+        self.postings        = {} # token -> (상품 id 배열, 가중치 배열)
+        self.product_tokens  = {} # 상품 id -> (token, ...) (삭제 시 확인할 posting)
+        self.char_tokens     = defaultdict(set) # 글자 -> 그 글자를 포함한 토큰 (한 글자 검색용)
+        self.present         = bytearray()
+        self.like_counts     = array('i')
+        self.view_counts     = array('i')
+        self.created_ats     = array('q')
+        self.categories      = array('i')
+        self.facet_groups    = array('i')
+        self.groups          = {} # (서브 카테고리, 메인 카테고리, 난이도, 가격 구간, 키트 여부) -> 그룹 번호
+        self.group_values    = [] # 그룹 번호 -> 조합
+        self.text_hashes     = array('q')
+        self.price_buckets   = price_buckets # 가격 구간 시작 값 (오름차순, 첫 값 0)
+        self.names           = {} # (facet, id) -> 이름
+        self.size            = 0
+        self.results         = OrderedDict() # (토큰, limit, 정렬, 서브 카테고리, offset) -> 상품 id 목록 (facet 도 같이 둔다)
+        self.changed         = set() # 마지막 조회 이후 바뀐 상품의 토큰과 글자 (결과 캐시 무효화용)
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, product_id):
+        return product_id < len(self.present) and self.present[product_id] == 1
+
+    def _reserve(self, product_id):
+        missing = product_id + 1 - len(self.present)
+
+        if missing > 0:
+            self.present.extend(bytes(missing))
+            self.like_counts.extend([0] * missing)
+            self.view_counts.extend([0] * missing)
+            self.created_ats.extend([0] * missing)
+            self.categories.extend([0] * missing)
+            self.facet_groups.extend([0] * missing)
+            self.text_hashes.extend([0] * missing)
+
+    def add(self, document):
+        """ 상품 추가 또는 갱신 """
+        text_hash = hash(document.texts)
+
+        if document.id in self and self.text_hashes[document.id] == text_hash:
+            self._touch(self.product_tokens[document.id])
+            self._set_attributes(document, text_hash)
+            return
+
+        self.remove(document.id)
+        self._reserve(document.id)
+
+        tokens = token_weights(document.texts)
+
+        for token, weight in tokens.items():
+            posting = self.postings.get(token)
+
+            if posting is None:
+                posting = self.postings[token] = (array('i'), array('B'))
+
+                for char in token:
+                    self.char_tokens[char].add(token)
+
+            ids, weights = posting
+
+            # 전체 색인은 id 순으로 채우므로 대부분 끝에 붙는다
+            if not ids or ids[-1] < document.id:
+                ids.append(document.id)
+                weights.append(weight)
+            else:
+                position = bisect_left(ids, document.id)
+                ids.insert(position, document.id)
+                weights.insert(position, weight)
+
+        self.product_tokens[document.id] = tuple(tokens)
+        self._touch(tokens)
+        self.present[document.id] = 1
+        self.size += 1
+        self._set_attributes(document, text_hash)
+
+    def _set_attributes(self, document, text_hash):
+        texts = dict(document.texts)
+
+        group = (
+            document.sub_category_id or 0,
+            document.main_category_id or 0,
+            document.difficulty_id or 0,
+            max(bisect_right(self.price_buckets, document.price) - 1, 0),
+            bool(document.has_kit)
+        )
+
+        if group not in self.groups:
+            self.groups[group] = len(self.group_values)
+            self.group_values.append(group)
+
+        self.like_counts[document.id]  = document.like_count
+        self.view_counts[document.id]  = document.view_count
+        self.created_ats[document.id]  = document.created_at
+        self.categories[document.id]   = document.sub_category_id or 0
+        self.facet_groups[document.id] = self.groups[group]
+        self.text_hashes[document.id]  = text_hash
+
+        self.names[('sub_category', document.sub_category_id)]   = texts.get('sub_category', '')
+        self.names[('main_category', document.main_category_id)] = texts.get('main_category', '')
+        self.names[('difficulty', document.difficulty_id)]       = document.difficulty
+
+    def remove(self, product_id):
+        """ 상품 삭제 (상품의 토큰만 확인한다) """
+        if product_id not in self:
+            return
+
+        self._touch(self.product_tokens[product_id])
+
+        for token in self.product_tokens.pop(product_id):
+            ids, weights = self.postings[token]
+            position     = bisect_left(ids, product_id)
+
+            if position < len(ids) and ids[position] == product_id:
+                del ids[position]
+                del weights[position]
+
+                if not ids:
+                    del self.postings[token]
+
+        self.present[product_id] = 0
+        self.size -= 1
+
+    def _touch(self, tokens):
+        """ 바뀐 상품의 토큰 기록 (한 글자 검색 결과도 무효화하도록 글자도 함께) """
+        if not self.results:
+            # 지울 결과가 없다 (전체 구성 중에는 기록하지 않음)
+            return
+
+        for token in tokens:
+            self.changed.add(token)
+            self.changed.update(token)
+
+    def _expire_results(self):
+        """ 바뀐 상품이 나올 수 있는 결과 캐시만 삭제 (질의 토큰이 모두 changed 에 있는 결과) """
+        if not self.changed:
+            return
+
+        changed = self.changed
+
+        for key in [key for key in self.results if (key[1] if key[0] == 'facets' else key[0]) <= changed]:
+            del self.results[key]
+
+        self.changed = set()
+
+    def match(self, query):
+        """ 질의의 모든 토큰을 가진 상품 (상품 id 목록, 같은 위치의 점수 목록) """
+        tokens = tokenize(query)
+
+        if not tokens:
+            return [], []
+
+        if len(tokens) == 1 and len(next(iter(tokens))) == 1:
+            return self._match_char(next(iter(tokens)))
+
+        postings = [self.postings.get(token) for token in tokens]
+
+        if None in postings:
+            return [], []
+
+        postings.sort(key=lambda posting: len(posting[0]))
+        (base_ids, base_weights), rest = postings[0], postings[1:]
+
+        if not rest:
+            return base_ids, base_weights
+
+        ids, scores = [], []
+        positions   = [0] * len(rest)
+
+        for product_id, score in zip(base_ids, base_weights):
+            for index, (other_ids, weights) in enumerate(rest):
+                position         = bisect_left(other_ids, product_id, positions[index])
+                positions[index] = position
+
+                if position == len(other_ids):
+                    return ids, scores
+
+                if other_ids[position] != product_id:
+                    break
+
+                score += weights[position]
+            else:
+                ids.append(product_id)
+                scores.append(score)
+
+        return ids, scores
+
+    def _match_char(self, char):
+        scores = {}
+
+        for token in self.char_tokens.get(char, ()):
+            posting = self.postings.get(token)
+
+            if posting is None:
+                continue
+
+            for product_id, weight in zip(*posting):
+                if weight > scores.get(product_id, 0):
+                    scores[product_id] = weight
+
+        return list(scores), list(scores.values())
+
+    def search(self, query, limit, sorting=None, sub_category_ids=None, offset=0):
+        """ 정렬 기준 offset 번째부터 limit 개 상품 id
+
+            sorting: None(관련도, 좋아요 수, 최신 id 순), 'popular'(좋아요 수), 'updated'(생성 시각), 'views'(조회 수)
+            sub_category_ids: 이 서브 카테고리의 상품만
+
+            정렬 키를 (키, ..., 상품 id) 튜플로 만들어 비교하므로 heap 선택이 Python 함수 호출 없이 진행된다.
+        """
+        key = (
+            frozenset(tokenize(query)),
+            limit,
+            sorting if sorting in ('popular', 'updated', 'views') else None,
+            frozenset(sub_category_ids) if sub_category_ids is not None else None,
+            offset
+        )
+
+        self._expire_results()
+
+        if key in self.results:
+            self.results.move_to_end(key)
+            return self.results[key]
+
+        product_ids = self.results[key] = self._search(query, limit, sorting, sub_category_ids, offset)
+
+        if len(self.results) > RESULT_CACHE_SIZE:
+            self.results.popitem(last=False)
+
+        return product_ids
+
+    def _search(self, query, limit, sorting, sub_category_ids, offset):
+        ids, scores = self.match(query)
+
+        if sub_category_ids is not None:
+            selected = [category in sub_category_ids for category in map(self.categories.__getitem__, ids)]
+            ids      = list(compress(ids, selected))
+            scores   = list(compress(scores, selected))
+
+        if sorting == 'popular':
+            keys = zip(map(self.like_counts.__getitem__, ids), ids)
+        elif sorting == 'updated':
+            keys = zip(map(self.created_ats.__getitem__, ids), ids)
+        elif sorting == 'views':
+            keys = zip(map(self.view_counts.__getitem__, ids), ids)
+        else:
+            keys = zip(scores, map(self.like_counts.__getitem__, ids), ids)
+
+        return [key[-1] for key in heapq.nlargest(offset + limit, keys)[offset:]]
+
+    def count(self, query, sub_category_ids=None):
+        """ 검색 결과 전체 상품 수 (서브 카테고리 필터 적용, facets 결과 재사용) """
+        return sum(self.facets(query, sub_category_ids)['has_kit'].values())
+
+    def facets(self, query, sub_category_ids=None):
+        """ 검색 결과 전체의 facet 별 {값: 상품 수}
+
+            sub_category: 서브 카테고리 id (필터 적용 전), main_category/difficulty: id (0 은 없음),
+            price: price_buckets 구간 번호, has_kit: True/False
+        """
+        key = ('facets', frozenset(tokenize(query)), frozenset(sub_category_ids) if sub_category_ids is not None else None)
+
+        self._expire_results()
+
+        if key in self.results:
+            self.results.move_to_end(key)
+            return self.results[key]
+
+        ids, _ = self.match(query)
+        facets = {facet: Counter() for facet in ('sub_category', 'main_category', 'difficulty', 'price', 'has_kit')}
+
+        for group, count in Counter(map(self.facet_groups.__getitem__, ids)).items():
+            sub_category, main_category, difficulty, price, has_kit = self.group_values[group]
+
+            facets['sub_category'][sub_category] += count
+
+            if sub_category_ids is None or sub_category in sub_category_ids:
+                facets['main_category'][main_category] += count
+                facets['difficulty'][difficulty]       += count
+                facets['price'][price]                 += count
+                facets['has_kit'][has_kit]             += count
+
+        self.results[key] = facets
+
+        if len(self.results) > RESULT_CACHE_SIZE:
+            self.results.popitem(last=False)
+
+        return facets
@@ -0,0 +1,85 @@
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch          import receiver
+
+from product.documents        import invalidate_product_document
+from product.main_feed        import invalidate_main_feed
+from product.search           import search_changes
+from product.models           import (
+    Product,
+    Chapter,
+    Lecture,
+    LectureVideo,
+    ProductSubImage,
+    ProductKit,
+    ProductDetailCategory
+)
+from kit.models               import Kit, KitSubImageUrl
+
+
+@receiver([post_save, post_delete], sender=Product)
+def invalidate_product(sender, instance, **kwargs):
+    invalidate_product_document(instance.id)
+    invalidate_main_feed()
+    search_changes.record(instance.id)
+
+
+@receiver([post_save, post_delete], sender=Chapter)
+@receiver([post_save, post_delete], sender=Lecture)
+@receiver([post_save, post_delete], sender=ProductSubImage)
+@receiver([post_save, post_delete], sender=ProductKit)
+def invalidate_product_child(sender, instance, **kwargs):
+    invalidate_product_document(instance.product_id)
+
+    if sender is ProductKit:
+        search_changes.record(instance.product_id)
+
+
+@receiver([post_save, post_delete], sender=ProductDetailCategory)
+def invalidate_product_detail_category(sender, instance, **kwargs):
+    search_changes.record(instance.product_id)
+
+
+@receiver([post_save, post_delete], sender=LectureVideo)
+def invalidate_lecture_video(sender, instance, **kwargs):
+    for product_id in Lecture.objects.filter(video_id=instance.id).values_list('product_id', flat=True):
+        invalidate_product_document(product_id)
+
+
+@receiver([post_save, post_delete], sender=Kit)
+@receiver([post_save, post_delete], sender=KitSubImageUrl)
+def invalidate_kit(sender, instance, **kwargs):
+    kit_id = instance.id if sender is Kit else instance.kit_id
+
+    for product_id in ProductKit.objects.filter(kit_id=kit_id).values_list('product_id', flat=True):
+        invalidate_product_document(product_id)
+
+        if sender is Kit:
+            search_changes.record(product_id)
+
+
+def get_m2m_product_ids(instance, action, reverse, pk_set):
+    """ m2m_changed 에서 바뀐 상품 id (reverse 면 instance 는 Kit/DetailCategory) """
+    if not reverse:
+        return [instance.id] if action.startswith('post_') else []
+
+    if action == 'pre_clear':
+        return list(instance.product_set.values_list('id', flat=True))
+
+    if action in ('post_add', 'post_remove'):
+        return pk_set
+
+    return []
+
+
+@receiver(m2m_changed, sender=Product.kit.through)
+def invalidate_product_kits(sender, instance, action, reverse, pk_set, **kwargs):
+    """ product.kit.add()/remove() 는 ProductKit 의 post_save 를 보내지 않는다 """
+    for product_id in get_m2m_product_ids(instance, action, reverse, pk_set):
+        invalidate_product_document(product_id)
+        search_changes.record(product_id)
+
+
+@receiver(m2m_changed, sender=Product.detail_category.through)
+def invalidate_product_detail_categories(sender, instance, action, reverse, pk_set, **kwargs):
+    for product_id in get_m2m_product_ids(instance, action, reverse, pk_set):
+        search_changes.record(product_id)
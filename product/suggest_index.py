@@ -0,0 +1,286 @@
+""" 검색어 자동완성 메모리 색인
+
+    상품명, 크리에이터명, 카테고리명(메인/서브)을 후보(term)로 두고 입력한 접두어로 시작하는 후보를 인기순으로 찾는다.
+
+    - 후보 텍스트는 search_index.normalize 로 정규화(공백 제거)한 키로 비교한다.
+      단어 시작 위치마다 항목을 두므로 '퇴근 후 코딩 모임' 은 '코딩' 으로도 찾아진다.
+    - 항목은 (후보 id << 8 | 시작 위치) 정수 하나이며, 시작 위치부터의 키 순서로 정렬한 배열(array)에 둔다.
+      접두어로 시작하는 항목은 배열의 연속 구간이므로 이진 탐색 두 번으로 찾는다. (문자열 trie 대신 접미 배열)
+    - 초성 검색: 키의 글자마다 초성으로 바꾼 문자열(한글 외 글자는 그대로)로 정렬한 배열을 따로 둔다.
+      'ㅋㄷ' 처럼 초성만 입력하면 초성 배열에서 찾는다.
+      '코ㄷ' 처럼 입력 중인 마지막 글자가 초성이면 '코다'~'코딯' 구간(초성이 같은 음절은 연속된 코드)에서 찾는다.
+    - 인기도는 후보를 가진 상품들의 좋아요 수 합이다.
+    - 접두어별 상위 MAX_SUGGESTIONS 개를 memo 에 두고, 후보의 인기도가 바뀌면 그 후보의 키 접두어 memo 만 고친다.
+      (오르면 목록에 넣어 다시 정렬, 목록 안의 후보가 내려가면 그 접두어 memo 삭제)
+    - 새 후보의 항목은 pending 에 모았다가 다음 조회 때 정렬하여 합친다. (전체 구성 시 한 번만 정렬)
+      상품이 모두 빠진 후보는 항목을 지우지 않고 결과에서 제외(dead)하며, 다음 전체 재구성 때 정리된다.
+
+    History:
+        2026-10-18 - 초기 생성
+"""
+import heapq
+
+from array       import array
+from collections import OrderedDict
+from itertools   import repeat
+from operator    import neg, rshift
+
+from product.search_index import normalize
+
+SUGGEST_FIELDS = {
+    'name'          : 'product',
+    'creator'       : 'creator',
+    'main_category' : 'category',
+    'sub_category'  : 'category',
+}
+CHOSEONG        = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+HANGUL_FIRST    = 0xAC00 # '가'
+HANGUL_LAST     = 0xD7A3 # '힣'
+HANGUL_BLOCK    = 21 * 28 # 초성이 같은 음절 수
+MAX_KEY_LENGTH  = 64
+MAX_SUGGESTIONS = 20
+MEMO_SIZE       = 10000
+
+
+def choseong(text):
+    """ 한글 음절을 초성으로 바꾼 문자열 (글자 수 유지) """
+    return ''.join(
+        CHOSEONG[(ord(char) - HANGUL_FIRST) // HANGUL_BLOCK] if HANGUL_FIRST <= ord(char) <= HANGUL_LAST else char
+        for char in text
+    )
+
+
+def word_offsets(text):
+    """ 정규화한 키에서 단어가 시작하는 위치 """
+    offsets, offset = [], 0
+
+    for word in text.split():
+        length = len(normalize(word))
+
+        if length and offset < min(MAX_KEY_LENGTH, 256):
+            offsets.append(offset)
+
+        offset += length
+
+    return offsets
+
+
+class SuggestIndex:
+    def __init__(self):
+        self.terms         = {} # (종류, 텍스트) -> 후보 id
+        self.kinds         = []
+        self.labels        = []
+        self.keys          = []
+        self.initials      = []
+        self.scores        = []
+        self.counts        = [] # 후보를 가진 상품 수
+        self.dead          = set() # 상품이 모두 빠진 후보 (결과에서 제외)
+        self.entries       = array('q')
+        self.initial_items = array('q')
+        self.pending       = []
+        self.products      = {} # 상품 id -> (후보 id, ...), 좋아요 수
+        self.memo          = OrderedDict()
+
+    def __len__(self):
+        return len(self.products)
+
+    def add(self, document):
+        """ 상품 추가 또는 갱신 (SearchDocument) """
+        terms = tuple(sorted({
+            (SUGGEST_FIELDS[field], text.strip())
+            for field, text in document.texts
+            if field in SUGGEST_FIELDS and normalize(text)
+        }))
+        term_ids = tuple(self._term_id(kind, label) for kind, label in terms)
+
+        if self.products.get(document.id) == (term_ids, document.like_count):
+            return
+
+        self.remove(document.id)
+        self.products[document.id] = (term_ids, document.like_count)
+
+        for term_id in term_ids:
+            self._update(term_id, document.like_count, 1)
+
+    def remove(self, product_id):
+        term_ids, like_count = self.products.pop(product_id, ((), 0))
+
+        for term_id in term_ids:
+            self._update(term_id, -like_count, -1)
+
+    def _term_id(self, kind, label):
+        term_id = self.terms.get((kind, label))
+
+        if term_id is not None:
+            return term_id
+
+        term_id = self.terms[(kind, label)] = len(self.labels)
+        key     = normalize(label)[:MAX_KEY_LENGTH]
+
+        self.kinds.append(kind)
+        self.labels.append(label)
+        self.keys.append(key)
+        self.initials.append(choseong(key))
+        self.scores.append(0)
+        self.counts.append(0)
+        self.pending.extend(term_id << 8 | offset for offset in word_offsets(label))
+
+        return term_id
+
+    def _update(self, term_id, score, count):
+        self.scores[term_id] += score
+        self.counts[term_id] += count
+
+        if self.counts[term_id] > 0:
+            self.dead.discard(term_id)
+        else:
+            self.dead.add(term_id)
+
+        if self.memo:
+            self._rerank(term_id, increased=score > 0 or count > 0)
+
+    def _rerank(self, term_id, increased):
+        """ 후보가 나올 수 있는 접두어의 memo 갱신
+
+            인기도가 오른 후보는 목록에 넣어 다시 정렬한다. (목록 밖 후보의 순위는 바뀌지 않음)
+            내려간 후보가 목록에 있으면 다음 후보를 알 수 없으므로 memo 를 지운다.
+        """
+        key, initials = self.keys[term_id], self.initials[term_id]
+        scores, dead  = self.scores, self.dead
+
+        for offset in word_offsets(self.labels[term_id]):
+            for end in range(offset + 1, len(key) + 1):
+                for prefix in {key[offset:end], initials[offset:end], key[offset:end - 1] + initials[end - 1]}:
+                    term_ids = self.memo.get(prefix)
+
+                    if term_ids is None:
+                        continue
+
+                    if not increased or term_id in dead:
+                        if term_id in term_ids:
+                            del self.memo[prefix]
+
+                        continue
+
+                    if term_id not in term_ids:
+                        if len(term_ids) == MAX_SUGGESTIONS and \
+                                (scores[term_id], -term_id) <= (scores[term_ids[-1]], -term_ids[-1]):
+                            continue
+
+                        term_ids.append(term_id)
+
+                    term_ids.sort(key=lambda term: (scores[term], -term), reverse=True)
+                    del term_ids[MAX_SUGGESTIONS:]
+
+    def _flush(self):
+        if not self.pending:
+            return
+
+        keys, initials = self.keys, self.initials
+
+        if len(self.pending) * 8 > len(self.entries):
+            entries = list(self.entries) + self.pending
+
+            self.entries       = array('q', sorted(entries, key=lambda entry: keys[entry >> 8][entry & 255:]))
+            self.initial_items = array('q', sorted(entries, key=lambda entry: initials[entry >> 8][entry & 255:]))
+        else:
+            for entry in self.pending:
+                self.entries.insert(bisect(self.entries, keys, keys[entry >> 8][entry & 255:]), entry)
+                self.initial_items.insert(
+                    bisect(self.initial_items, initials, initials[entry >> 8][entry & 255:]), entry
+                )
+
+        self.pending = []
+
+    def suggest(self, query, limit=MAX_SUGGESTIONS):
+        """ 접두어로 시작하는 후보 (종류, 텍스트) 를 인기순으로 최대 limit(<= MAX_SUGGESTIONS) 개 """
+        query = normalize(query)[:MAX_KEY_LENGTH]
+
+        if not query:
+            return []
+
+        if query in self.memo:
+            self.memo.move_to_end(query)
+            term_ids = self.memo[query]
+        else:
+            self._flush()
+            term_ids = self._rank(query)
+
+            # 초성이 두 글자 이상 이어지는 섞인 입력('코ㄷㅁ')은 _forget 으로 지울 수 없으므로 memo 하지 않는다
+            if query.rstrip(CHOSEONG) in ('', query[:-1], query):
+                self.memo[query] = term_ids
+
+                if len(self.memo) > MEMO_SIZE:
+                    self.memo.popitem(last=False)
+
+        return [(self.kinds[term_id], self.labels[term_id]) for term_id in term_ids[:limit]]
+
+    def _rank(self, query):
+        head = query.rstrip(CHOSEONG)
+        tail = query[len(head):]
+
+        if not head:
+            # 초성만 입력
+            entries, texts, start, end, tail = self.initial_items, self.initials, query, next_prefix(query), ''
+        elif tail:
+            # 입력 중인 글자의 초성: 초성이 같은 음절 구간
+            first = HANGUL_FIRST + CHOSEONG.index(tail[0]) * HANGUL_BLOCK
+            start = head + chr(first)
+            end   = head + chr(first + HANGUL_BLOCK)
+
+            entries, texts, tail = self.entries, self.keys, tail[1:]
+        else:
+            entries, texts, start, end = self.entries, self.keys, query, next_prefix(query)
+
+        lo, hi = bisect(entries, texts, start), bisect(entries, texts, end)
+
+        if tail:
+            offset     = len(head) + 1
+            initials   = self.initials
+            candidates = {
+                entry >> 8 for entry in entries[lo:hi]
+                if initials[entry >> 8][(entry & 255) + offset:(entry & 255) + offset + len(tail)] == tail
+            }
+        else:
+            candidates = set(map(rshift, entries[lo:hi], repeat(8)))
+
+        candidates -= self.dead
+
+        # (인기도, -후보 id, 후보 id) 튜플 비교로 Python 함수 호출 없이 상위를 고른다
+        ranked = heapq.nlargest(
+            MAX_SUGGESTIONS,
+            zip(map(self.scores.__getitem__, candidates), map(neg, candidates), candidates)
+        )
+
+        return [term_id for _, _, term_id in ranked]
+
+    def warm(self):
+        """ 한 글자 접두어(첫 글자, 초성) memo 를 미리 채운다 (전체 구성 직후) """
+        self._flush()
+
+        for char in {self.keys[entry >> 8][entry & 255] for entry in self.entries}:
+            self.suggest(char)
+
+        for char in CHOSEONG:
+            self.suggest(char)
+
+
+def next_prefix(prefix):
+    """ prefix 로 시작하는 문자열보다 큰 가장 작은 문자열 """
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def bisect(entries, texts, target):
+    """ texts[후보][시작 위치:] 순으로 정렬된 entries 에서 target 이 들어갈 첫 위치 """
+    lo, hi = 0, len(entries)
+
+    while lo < hi:
+        mid   = (lo + hi) // 2
+        entry = entries[mid]
+
+        if texts[entry >> 8][entry & 255:] < target:
+            lo = mid + 1
+        else:
+            hi = mid
+
+    return lo
@@ -1,8 +1,18 @@
-from datetime       import date, timedelta
+import json
+import threading
+import time
+import tracemalloc
 
-from django.test    import Client, TransactionTestCase
-from django.urls    import reverse
-from django.db      import connection
+from datetime       import date, datetime, timedelta
+from io             import StringIO
+from unittest.mock  import patch
+
+from django.core.cache import caches
+from django.core.management import call_command
+from django.test       import Client, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls       import reverse
+from django.db         import IntegrityError, OperationalError, connection, transaction
 
 from product.models import (
     Product,
@@ -14,17 +24,29 @@ from product.models import (
     Community,
     Signature
 )
-from user.models    import User
-from kit.models     import Kit
-from core.utils     import issue_token
+from user.models    import User, ProductLike, RecentlyView
+from kit.models     import Kit, KitSubImageUrl
+from core.common_utils import issue_access_token
+from user.recently_views import recently_view_buffer
+from product.like_counts import increase_like_count, reconcile_like_counts, toggle_like
+from product.main_feed import main_feed_cache, invalidate_main_feed
+from product.search_index import SearchIndex, SearchDocument, tokenize
+from product.suggest_index import SuggestIndex, choseong
+from product.fuzzy_index import FuzzyIndex, edit_distance, jamo
+from clnass_101.settings import MAIN_FEED_TTL, MAIN_FEED_STALE_TTL, MAIN_FEED_CACHE_ALIAS
 
 class TestProductDetailView(TransactionTestCase):
+    reset_sequences = True
     
     @classmethod
     def setUpTestData(cls):
         pass
     
     def setUp(self):
+        # reset_sequences 로 매 테스트 같은 id 를 쓰므로 이전 테스트의 캐시(문서, 좋아요 집합)를 비운다
+        for cache in caches.all():
+            cache.clear()
+        
         self.client = Client()
         
         self.PRODUCT_NOT_EXIST = 'PRODUCT_NOT_EXIST'
@@ -63,7 +85,7 @@ class TestProductDetailView(TransactionTestCase):
             is_creator = False
         )
 
-        token = issue_token(self.user.id)
+        token = issue_access_token(self.user.id)
         
         self.header = {
             'HTTP_Authorization': token,
@@ -117,20 +139,7 @@ class TestProductDetailView(TransactionTestCase):
             )
     
     def tearDown(self):
-        with connection.cursor() as cursor:
-            cursor.execute('set foreign_key_checks=0')
-            cursor.execute('truncate main_categories')
-            cursor.execute('truncate sub_categories')
-            cursor.execute('truncate users')
-            cursor.execute('truncate products')
-            cursor.execute('truncate chapters')
-            cursor.execute('truncate communities')
-            cursor.execute('truncate users_coupons')
-            cursor.execute('truncate coupons')
-            cursor.execute('truncate difficulties')
-            cursor.execute('truncate kits')
-            cursor.execute('truncate recently_views')
-            cursor.execute('set foreign_key_checks=1')
+        recently_view_buffer.clear()
     
     def test_product_detail_get_fail_wrong_product_id(self):
         url = reverse('products', args=[2])
@@ -190,7 +199,7 @@ class TestProductDetailView(TransactionTestCase):
     def test_product_detail_get_success_with_token_display_is_like(self):
         url = reverse('products', args=[1])
         
-        self.user.product_like.add(self.product)
+        toggle_like('product', self.user.id, self.product.id)
         
         response = self.client.get(
             url,
@@ -271,17 +280,15 @@ class TestProductDetailView(TransactionTestCase):
     def test_display_is_take_class_take_impossible_now(self):
         url = reverse('products', args=[1])
         
-        self.product.start_date = '2020-12-31'
+        self.product.start_date = date.today() + timedelta(days=10)
         self.product.save()
         
         response = self.client.get(url, content_type='application/json')
         
-        print(response.json()['CLASS']['isTakeClass'])
-        
         self.assertEqual(response.status_code, 200)
         self.assertEqual(
             response.json()['CLASS']['isTakeClass'],
-            '12월 31일 부터 수강 가능'
+            f'{self.product.start_date.month}월 {self.product.start_date.day}일 부터 수강 가능'
         )
     
     def test_display_class_owner_is_user(self):
@@ -309,3 +316,897 @@ class TestProductDetailView(TransactionTestCase):
             '기용좌',
             response.json()['CLASS']['classOwner']
         )
+
+
+class TestProductDetailQueryCount(TestCase):
+    def setUp(self):
+        self.client = Client()
+        
+        self.creator = User.objects.create(
+            name       = '송은우',
+            nick_name  = '신의 코드 송은우',
+            is_creator = True
+        )
+        
+        self.product = Product.objects.create(
+            name            = '퇴근 후 함께 즐기는 코딩 모임!',
+            effective_time  = timedelta(days=30),
+            price           = 10000.00,
+            sale            = 0.05,
+            start_date      = date.today(),
+            thumbnail_image = 'test_thumbnail_image_url',
+            main_category   = MainCategory.objects.create(name='크리에이티브'),
+            sub_category    = SubCategory.objects.create(name='데이터/개발'),
+            difficulty      = Difficulty.objects.create(name='초급자'),
+            creator         = self.creator
+        )
+        
+        self.url = reverse('products', args=[self.product.id])
+    
+    def create_communities(self, count):
+        for i in range(count):
+            user = User.objects.create(
+                name              = f'유저{i}',
+                nick_name         = f'닉네임{i}',
+                profile_image_url = f'https://clnass101.com/{i}.png'
+            )
+            Community.objects.create(
+                description = f'test_community_description{i}',
+                user        = user if i % 2 else self.creator,
+                product     = self.product
+            )
+    
+    def count_queries(self):
+        caches['default'].clear()
+        
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+    
+    def test_query_count_does_not_grow_with_communities(self):
+        self.create_communities(2)
+        few = self.count_queries()
+        
+        self.create_communities(20)
+        many = self.count_queries()
+        
+        self.assertEqual(few, many)
+    
+    def test_community_author_info(self):
+        self.create_communities(3)
+        
+        response = self.client.get(self.url).json()['CLASS']
+        
+        self.assertEqual(len(response['community']), 3)
+        self.assertEqual(len(response['creatorCommunity']), 2)
+        self.assertEqual(response['creatorInfo'], {
+            'id'            : self.creator.id,
+            'nick_name'     : '신의 코드 송은우',
+            'profile_image' : None,
+        })
+        self.assertIn(
+            {'id': self.creator.id + 2, 'nick_name': '닉네임1', 'profile_image': 'https://clnass101.com/1.png'},
+            [community['communityUserInfo'] for community in response['community']]
+        )
+
+
+class TestProductCommunityView(TestCase):
+    def setUp(self):
+        self.client = Client()
+        
+        self.creator = User.objects.create(name='송은우', nick_name='신의 코드 송은우', is_creator=True)
+        self.user    = User.objects.create(name='김민구', nick_name='민구좌')
+        
+        self.product = Product.objects.create(
+            name            = '퇴근 후 함께 즐기는 코딩 모임!',
+            effective_time  = timedelta(days=30),
+            price           = 10000.00,
+            sale            = 0.05,
+            start_date      = date.today(),
+            thumbnail_image = 'test_thumbnail_image_url',
+            main_category   = MainCategory.objects.create(name='크리에이티브'),
+            sub_category    = SubCategory.objects.create(name='데이터/개발'),
+            difficulty      = Difficulty.objects.create(name='초급자'),
+            creator         = self.creator
+        )
+        
+        for i in range(25):
+            Community.objects.create(
+                description = f'test_community_description{i}',
+                user        = self.creator if i % 5 == 0 else self.user,
+                product     = self.product
+            )
+        
+        # 같은 updated_at 인 글은 id 역순으로 정렬되어야 한다
+        Community.objects.filter(id__lte=Community.objects.order_by('id')[10].id).update(
+            updated_at=datetime(2021, 1, 20, 12, 0)
+        )
+        
+        self.url = reverse('product_community', args=[self.product.id])
+        self.expected_ids = list(
+            Community.objects.order_by('-updated_at', '-id').values_list('id', flat=True)
+        )
+    
+    def fetch_all(self, **params):
+        ids, cursor = [], None
+        
+        while True:
+            data = dict(params, **({'cursor': cursor} if cursor else {}))
+            response = self.client.get(self.url, data)
+            
+            self.assertEqual(response.status_code, 200)
+            
+            page   = response.json()['COMMUNITY']
+            ids   += [community['communityId'] for community in page['communities']]
+            cursor = page['nextCursor']
+            
+            if not cursor:
+                return ids
+    
+    def test_pages_cover_every_community_in_order(self):
+        self.assertEqual(self.fetch_all(limit=7), self.expected_ids)
+    
+    def test_creator_only_pages(self):
+        creator_ids = list(
+            Community.objects.filter(user=self.creator).order_by('-updated_at', '-id').values_list('id', flat=True)
+        )
+        
+        self.assertEqual(self.fetch_all(limit=2, creator='true'), creator_ids)
+    
+    def test_invalid_cursor(self):
+        response = self.client.get(self.url, {'cursor': 'not-a-cursor'})
+        
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['MESSAGE'], 'INVALID_CURSOR')
+    
+    def test_product_detail_embeds_first_page(self):
+        response = self.client.get(reverse('products', args=[self.product.id])).json()['CLASS']
+        
+        self.assertEqual(
+            [community['communityId'] for community in response['community']],
+            self.expected_ids[:20]
+        )
+        self.assertIsNotNone(response['communityCursor'])
+        self.assertEqual(len(response['creatorCommunity']), 5)
+        self.assertIsNone(response['creatorCommunityCursor'])
+        
+        next_page = self.client.get(self.url, {'cursor': response['communityCursor']}).json()['COMMUNITY']
+        
+        self.assertEqual(
+            [community['communityId'] for community in next_page['communities']],
+            self.expected_ids[20:]
+        )
+
+
+class TestProductDocument(TestCase):
+    def setUp(self):
+        caches['default'].clear()
+        self.addCleanup(recently_view_buffer.clear)
+        
+        self.client  = Client()
+        self.creator = User.objects.create(name='송은우', nick_name='신의 코드 송은우', is_creator=True)
+        self.user    = User.objects.create(name='김민구', nick_name='민구좌')
+        self.header  = {'HTTP_Authorization': issue_access_token(self.user.id)}
+        
+        self.product = Product.objects.create(
+            name            = '퇴근 후 함께 즐기는 코딩 모임!',
+            effective_time  = timedelta(days=30),
+            price           = 10000.00,
+            sale            = 0.05,
+            start_date      = date.today(),
+            thumbnail_image = 'test_thumbnail_image_url',
+            main_category   = MainCategory.objects.create(name='크리에이티브'),
+            sub_category    = SubCategory.objects.create(name='데이터/개발'),
+            difficulty      = Difficulty.objects.create(name='초급자'),
+            creator         = self.creator
+        )
+        self.chapter = Chapter.objects.create(
+            name            = 'chapter1',
+            product         = self.product,
+            order           = 1,
+            thumbnail_image = 'image_url'
+        )
+        
+        self.url = reverse('products', args=[self.product.id])
+    
+    def get_class(self, **header):
+        response = self.client.get(self.url, **header)
+        
+        self.assertEqual(response.status_code, 200)
+        return response.json()['CLASS']
+    
+    def test_cached_document_skips_product_queries(self):
+        with CaptureQueriesContext(connection) as cold:
+            self.get_class()
+        
+        with CaptureQueriesContext(connection) as warm:
+            self.get_class()
+        
+        self.assertLess(len(warm), len(cold))
+        self.assertFalse(any('"chapters"' in query['sql'] for query in warm.captured_queries))
+    
+    def test_chapter_change_invalidates_document(self):
+        self.get_class()
+        
+        self.chapter.name = 'chapter1 수정'
+        self.chapter.save()
+        Chapter.objects.create(name='chapter2', product=self.product, order=2, thumbnail_image='image_url')
+        
+        curriculum = self.get_class()['curriculum']
+        
+        self.assertEqual([chapter['chapterName'] for chapter in curriculum], ['chapter1 수정', 'chapter2'])
+    
+    def test_kit_changes_invalidate_document(self):
+        self.get_class()
+        
+        kit = Kit.objects.create(name='test_kit', main_image_url='image_url', price=10000)
+        self.product.kit.add(kit)
+        
+        self.assertEqual([kit['kitName'] for kit in self.get_class()['kitInfo']], ['test_kit'])
+        
+        KitSubImageUrl.objects.create(image_url='sub_image_url', kit=kit)
+        
+        self.assertEqual(
+            self.get_class()['kitInfo'][0]['subImageUrls'],
+            [{'subImageUrl': 'sub_image_url'}]
+        )
+    
+    def test_evicted_version_does_not_revive_old_document(self):
+        self.get_class()
+        caches['default'].delete(f'product-document-version:{self.product.id}')
+        
+        self.chapter.name = 'chapter1 수정'
+        self.chapter.save()
+        
+        self.assertEqual(self.get_class()['curriculum'][0]['chapterName'], 'chapter1 수정')
+    
+    def test_soft_deleted_product_is_not_served_from_cache(self):
+        self.get_class()
+        
+        self.product.is_deleted = True
+        self.product.save()
+        
+        response = self.client.get(self.url)
+        
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['MESSAGE'], 'PRODUCT_NOT_EXIST')
+    
+    @patch.object(recently_view_buffer, 'interval', None)
+    def test_per_user_fields_are_not_cached(self):
+        self.get_class()
+        ProductLike.objects.create(user=self.user, product=self.product)
+        increase_like_count(Product, self.product.id, 1)
+        
+        anonymous = self.get_class()
+        user      = self.get_class(**self.header)
+        
+        self.assertFalse(anonymous['isLike'])
+        self.assertTrue(user['isLike'])
+        self.assertEqual(user['likeCount'], 1)
+
+
+class TestLikeCount(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.user   = User.objects.create(name='김민구', nick_name='민구좌')
+        self.header = {'HTTP_Authorization': issue_access_token(self.user.id)}
+        
+        self.products = [
+            Product.objects.create(
+                name            = f'클래스{i}',
+                price           = 10000,
+                sale            = 0,
+                start_date      = date.today(),
+                thumbnail_image = 'thumbnail_image',
+                sub_category    = SubCategory.objects.create(name='드로잉'),
+                difficulty      = Difficulty.objects.create(name='입문자'),
+                creator         = self.user
+            ) for i in range(2)
+        ]
+        self.community = Community.objects.create(
+            description = 'test_community_description',
+            user        = self.user,
+            product     = self.products[0]
+        )
+    
+    def toggle(self, url, body):
+        return self.client.post(url, json.dumps(body), content_type='application/json', **self.header)
+    
+    def test_product_like_toggle_updates_counter(self):
+        product = self.products[0]
+        
+        response = self.toggle('/products/like', {'product_id': product.id})
+        product.refresh_from_db()
+        
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(product.like_count, 1)
+        
+        response = self.toggle('/products/like', {'product_id': product.id})
+        product.refresh_from_db()
+        
+        self.assertEqual(response.json()['message'], 'REMOVED')
+        self.assertEqual(product.like_count, 0)
+    
+    def test_community_like_toggle_updates_counter(self):
+        self.toggle('/products/community/like', {'community_id': self.community.id})
+        self.community.refresh_from_db()
+        
+        self.assertEqual(self.community.like_count, 1)
+    
+    def test_main_page_sorts_by_like_count(self):
+        self.toggle('/products/like', {'product_id': self.products[1].id})
+        
+        response = self.client.get('/products/main', {'sorting': 'popular'})
+        
+        self.assertEqual(
+            [(product['id'], product['likeCount']) for product in response.json()['RESULT']],
+            [(self.products[1].id, 1), (self.products[0].id, 0)]
+        )
+    
+    def test_reconcile_fixes_drift(self):
+        ProductLike.objects.create(user=self.user, product=self.products[0])
+        Product.objects.filter(id=self.products[1].id).update(like_count=7)
+        
+        self.assertEqual(reconcile_like_counts('product', batch_size=1, dry_run=True), (2, 2))
+        
+        call_command('reconcile_like_counts', stdout=StringIO())
+        
+        self.assertEqual(
+            list(Product.objects.order_by('id').values_list('like_count', flat=True)),
+            [1, 0]
+        )
+        self.assertEqual(reconcile_like_counts('product'), (2, 0))
+    
+    def test_duplicate_like_is_rejected(self):
+        ProductLike.objects.create(user=self.user, product=self.products[0])
+        
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            ProductLike.objects.create(user=self.user, product=self.products[0])
+    
+    def test_toggle_returns_state_and_count(self):
+        response = self.toggle('/products/like', {'product_id': self.products[0].id})
+        
+        self.assertEqual(response.json(), {'message': 'LIKED_PRODUCT', 'isLiked': True, 'likeCount': 1})
+        
+        response = self.toggle('/products/community/like', {'community_id': self.community.id})
+        
+        self.assertEqual(response.json(), {'message': 'LIKED_COMMUNITY', 'isLiked': True, 'likeCount': 1})
+        
+        response = self.toggle('/products/community/like', {'community_id': self.community.id})
+        
+        self.assertEqual(response.json(), {'message': 'REMOVED', 'isLiked': False, 'likeCount': 0})
+
+
+class TestLikeToggleConcurrency(TransactionTestCase):
+    def setUp(self):
+        self.user    = User.objects.create(name='김민구', nick_name='민구좌')
+        self.product = Product.objects.create(
+            name            = '클래스',
+            price           = 10000,
+            sale            = 0,
+            start_date      = date.today(),
+            thumbnail_image = 'thumbnail_image',
+            sub_category    = SubCategory.objects.create(name='드로잉'),
+            difficulty      = Difficulty.objects.create(name='입문자'),
+            creator         = self.user
+        )
+    
+    def test_concurrent_toggles_keep_one_row_and_exact_count(self):
+        threads, toggles = 8, 5
+        barrier          = threading.Barrier(threads)
+        results          = []
+        
+        def worker():
+            barrier.wait()
+            
+            for _ in range(toggles):
+                # SQLite 는 동시 쓰기를 잠금 오류로 거절한다. 거절된 토글은 통째로 롤백되어야 한다
+                try:
+                    results.append(toggle_like('product', self.user.id, self.product.id))
+                
+                except OperationalError:
+                    pass
+            
+            connection.close()
+        
+        workers = [threading.Thread(target=worker) for _ in range(threads)]
+        
+        for thread in workers:
+            thread.start()
+        
+        for thread in workers:
+            thread.join()
+        
+        self.product.refresh_from_db()
+        likes = ProductLike.objects.filter(user=self.user, product=self.product).count()
+        
+        self.assertTrue(results)
+        self.assertIn(likes, (0, 1))
+        self.assertEqual(self.product.like_count, likes)
+        self.assertTrue(all(like_count in (0, 1) for _, like_count in results))
+
+
+class TestMainPageProjection(TestCase):
+    def setUp(self):
+        self.client  = Client()
+        self.creator = User.objects.create(name='김민구', nick_name='민구좌')
+        self.products = [
+            Product.objects.create(
+                name            = f'클래스{i}',
+                price           = 10000,
+                sale            = 0.1,
+                start_date      = date.today(),
+                thumbnail_image = 'thumbnail_image',
+                sub_category    = SubCategory.objects.create(name='드로잉'),
+                creator         = self.creator
+            ) for i in range(3)
+        ]
+    
+    def get_main(self):
+        # 피드 캐시를 거치지 않고 매번 조회 경로를 측정한다
+        invalidate_main_feed()
+        
+        with CaptureQueriesContext(connection) as queries:
+            tracemalloc.start()
+            
+            try:
+                response = self.client.get('/products/main')
+                _, peak  = tracemalloc.get_traced_memory()
+            
+            finally:
+                tracemalloc.stop()
+        
+        return response, [query['sql'] for query in queries.captured_queries], peak
+    
+    def add_engagement(self, users):
+        User.objects.bulk_create([User(name=f'팬{i}', email=f'fan{i}@gmail.com') for i in range(users)])
+        fans = User.objects.filter(name__startswith='팬')
+        
+        ProductLike.objects.bulk_create(
+            [ProductLike(user=fan, product=product) for fan in fans for product in self.products]
+        )
+        RecentlyView.objects.bulk_create(
+            [RecentlyView(user=fan, product=product) for fan in fans for product in self.products]
+        )
+    
+    def test_card_fields(self):
+        response, queries, _ = self.get_main()
+        product              = response.json()['RESULT'][0]
+        
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(product['title'], '클래스0')
+        self.assertEqual(product['subCategory'], '드로잉')
+        self.assertEqual(product['creator'], '김민구')
+        self.assertEqual(product['finalPrice'], 9000)
+    
+    def test_memory_is_independent_of_engagement(self):
+        self.get_main()
+        _, _, quiet_peak = self.get_main()
+        
+        self.add_engagement(500)
+        
+        response, queries, busy_peak = self.get_main()
+        
+        self.assertEqual(len(response.json()['RESULT']), 3)
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('product_likes', queries[0])
+        self.assertNotIn('recently_views', queries[0])
+        self.assertLess(busy_peak, quiet_peak * 1.5)
+
+
+class TestMainPagePagination(TestCase):
+    def setUp(self):
+        self.client  = Client()
+        self.creator = User.objects.create(name='김민구', nick_name='민구좌')
+        self.products = [
+            Product.objects.create(
+                name            = f'클래스{i}',
+                price           = 10000,
+                sale            = 0,
+                start_date      = date.today(),
+                thumbnail_image = 'thumbnail_image',
+                creator         = self.creator,
+                like_count      = like_count
+            ) for i, like_count in enumerate([3, 7, 7, 1, 5])
+        ]
+    
+    def get_page(self, **params):
+        return self.client.get('/products/main', params)
+    
+    def walk(self, **params):
+        ids, cursor = [], None
+        
+        while True:
+            with self.assertNumQueries(1):
+                response = self.get_page(**params, **({'cursor': cursor} if cursor else {}))
+            
+            ids   += [product['id'] for product in response.json()['RESULT']]
+            cursor = response.json()['NEXT_CURSOR']
+            
+            if not cursor:
+                return ids
+    
+    def test_pages_follow_each_sort(self):
+        self.assertEqual(
+            self.walk(sorting='popular', limit=2),
+            [product.id for product in sorted(self.products, key=lambda product: (-product.like_count, -product.id))]
+        )
+        self.assertEqual(
+            self.walk(sorting='updated', limit=2),
+            [
+                product.id for product in
+                sorted(self.products, key=lambda product: (product.created_at, product.id), reverse=True)
+            ]
+        )
+        self.assertEqual(self.walk(limit=3), [product.id for product in self.products])
+    
+    def test_cursor_is_stable_across_inserts(self):
+        first = self.get_page(sorting='popular', limit=2).json()
+        
+        Product.objects.create(
+            name            = '새 인기 클래스',
+            price           = 10000,
+            sale            = 0,
+            start_date      = date.today(),
+            thumbnail_image = 'thumbnail_image',
+            creator         = self.creator,
+            like_count      = 100
+        )
+        
+        second = self.get_page(sorting='popular', limit=2, cursor=first['NEXT_CURSOR']).json()
+        
+        self.assertEqual(
+            [product['id'] for product in first['RESULT'] + second['RESULT']],
+            [self.products[2].id, self.products[1].id, self.products[4].id, self.products[0].id]
+        )
+    
+    def test_page_size_limits(self):
+        self.assertEqual(len(self.get_page(limit='abc').json()['RESULT']), 5)
+        self.assertEqual(len(self.get_page(limit=0).json()['RESULT']), 1)
+    
+    def test_invalid_cursor(self):
+        popular_cursor = self.get_page(sorting='popular', limit=2).json()['NEXT_CURSOR']
+        
+        for cursor in ('not-a-cursor', popular_cursor):
+            response = self.get_page(sorting='updated', cursor=cursor)
+            
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.json()['MESSAGE'], 'INVALID_CURSOR')
+
+
+class TestMainFeedCache(TestCase):
+    def setUp(self):
+        patcher = patch.object(main_feed_cache, 'background', False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        
+        self.client  = Client()
+        self.creator = User.objects.create(name='김민구', nick_name='민구좌')
+        self.product = self.create_product('클래스')
+    
+    def create_product(self, name, like_count=0):
+        return Product.objects.create(
+            name            = name,
+            price           = 10000,
+            sale            = 0,
+            start_date      = date.today(),
+            thumbnail_image = 'thumbnail_image',
+            creator         = self.creator,
+            like_count      = like_count
+        )
+    
+    def titles(self, **params):
+        return [product['title'] for product in self.client.get('/products/main', params).json()['RESULT']]
+    
+    def test_repeated_requests_hit_cache(self):
+        self.titles(sorting='popular')
+        self.titles()
+        
+        with self.assertNumQueries(0):
+            self.titles(sorting='popular')
+            self.titles(sorting='unknown') # 알 수 없는 정렬은 기본 정렬과 같은 키
+            self.titles()
+    
+    def test_product_save_invalidates(self):
+        self.assertEqual(self.titles(), ['클래스'])
+        
+        self.product.name = '새 이름'
+        self.product.save()
+        
+        self.assertEqual(self.titles(), ['새 이름'])
+    
+    def test_evicted_version_does_not_revive_old_feed(self):
+        self.assertEqual(self.titles(), ['클래스'])
+        caches[MAIN_FEED_CACHE_ALIAS].delete(main_feed_cache.version_key())
+        
+        self.product.name = '새 이름'
+        self.product.save()
+        
+        self.assertEqual(self.titles(), ['새 이름'])
+    
+    def test_stale_entry_is_served_while_refreshing(self):
+        self.titles(sorting='popular')
+        Product.objects.filter(id=self.product.id).update(like_count=3)
+        Product.objects.bulk_create([Product(
+            name            = '인기 클래스',
+            price           = 10000,
+            sale            = 0,
+            start_date      = date.today(),
+            thumbnail_image = 'thumbnail_image',
+            creator         = self.creator,
+            like_count      = 10
+        )])
+        
+        with patch('core.stale_cache.time.time', return_value=time.time() + MAIN_FEED_TTL + 1):
+            stale = self.titles(sorting='popular')
+        
+        self.assertEqual(stale, ['클래스'])
+        self.assertEqual(self.titles(sorting='popular'), ['인기 클래스', '클래스'])
+        
+        with patch('core.stale_cache.time.time', return_value=time.time() + MAIN_FEED_TTL + MAIN_FEED_STALE_TTL + 1):
+            self.assertEqual(self.titles(sorting='popular'), ['인기 클래스', '클래스'])
+    
+    def test_invalid_category(self):
+        response = self.client.get('/products/main', {'main': 'abc'})
+        
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['MESSAGE'], 'VALUE_ERROR')
+    
+    def test_invalid_or_expired_token_is_anonymous(self):
+        user = User.objects.create(name='재훈', email='jae@gmail.com')
+        
+        with patch('core.common_utils.time.time', return_value=0), \
+                patch('core.common_utils.ACCESS_TOKEN_CLAIMS_ENABLED', True):
+            expired = issue_access_token(user.id, user)
+        
+        for token in ('not-a-token', expired):
+            response = self.client.get('/products/main', HTTP_Authorization=token)
+            
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response.json()['RESULT'])
+            self.assertFalse(any(product['isLiked'] for product in response.json()['RESULT']))
+
+
+class TestSearchIndex(TestCase):
+    def document(self, product_id, name, creator='', like_count=0, created_at=0, sub_category_id=1, kits=()):
+        return SearchDocument(
+            id              = product_id,
+            texts           = (('name', name), ('creator', creator), *(('kit', kit) for kit in kits)),
+            like_count      = like_count,
+            created_at      = created_at,
+            sub_category_id = sub_category_id
+        )
+    
+    def setUp(self):
+        self.index = SearchIndex()
+        
+        for document in (
+            self.document(1, '코딩 클래스', like_count=5, created_at=30),
+            self.document(2, '드로잉 클래스', creator='코딩왕', like_count=50, created_at=20, sub_category_id=2),
+            self.document(3, '파이썬 코딩 기초', like_count=1, created_at=10, kits=('코딩 키트',)),
+            self.document(4, '수채화', like_count=100, created_at=40),
+        ):
+            self.index.add(document)
+    
+    def test_tokenize(self):
+        self.assertEqual(tokenize('코딩 클래스'), {'코딩', '딩클', '클래', '래스'})
+        self.assertEqual(tokenize('A-b'), {'ab'})
+        self.assertEqual(tokenize('책'), {'책'})
+        self.assertEqual(tokenize(' !'), set())
+    
+    def test_ranking(self):
+        # 상품명(8) > 크리에이터(4), 같은 점수는 좋아요 수 순
+        self.assertEqual(self.index.search('코딩', 10), [3, 1, 2])
+        self.assertEqual(self.index.search('코딩', 10, 'popular'), [2, 1, 3])
+        self.assertEqual(self.index.search('코딩', 10, 'updated'), [1, 2, 3])
+        self.assertEqual(self.index.search('코딩', 2), [3, 1])
+        self.assertEqual(self.index.search('코딩', 10, sub_category_ids={2}), [2])
+        self.assertEqual(self.index.search('코딩', 2, offset=2), [2])
+        self.assertEqual(self.index.count('코딩'), 3)
+        self.assertEqual(self.index.count('코딩', sub_category_ids={2}), 1)
+    
+    def test_views_sorting(self):
+        self.index.add(self.document(1, '코딩 클래스', like_count=5, created_at=30)._replace(view_count=7))
+        
+        self.assertEqual(self.index.search('코딩', 1, 'views'), [1])
+        self.assertEqual(self.index.search('코딩', 10, 'views'), [1, 3, 2])
+    
+    def test_intersection(self):
+        self.assertEqual(self.index.search('코딩클래스', 10), [1])
+        self.assertEqual(self.index.search('클래스', 10), [2, 1])
+        self.assertEqual(self.index.search('코딩 수채화', 10), [])
+        self.assertEqual(self.index.search('없는말', 10), [])
+    
+    def test_single_character(self):
+        self.assertEqual(self.index.search('채', 10), [4])
+        self.assertEqual(self.index.search('딩', 10), [3, 1, 2])
+    
+    def test_incremental_update(self):
+        self.index.add(self.document(4, '코딩 수채화', like_count=100, created_at=40))
+        self.index.add(self.document(1, '코딩 클래스', like_count=500, created_at=30))
+        self.index.remove(3)
+        
+        self.assertEqual(self.index.search('코딩', 10, 'popular'), [1, 4, 2])
+        self.assertEqual(self.index.search('수채화', 10), [4])
+        self.assertEqual(self.index.search('파이썬', 10), [])
+        self.assertEqual(len(self.index), 3)
+        self.assertNotIn('파이', self.index.postings)
+    
+    def test_remove_touches_only_product_tokens(self):
+        looked_up = []
+        
+        class Postings(dict):
+            def __getitem__(self, token):
+                looked_up.append(token)
+                return super().__getitem__(token)
+        
+        self.index.postings = Postings(self.index.postings)
+        self.index.remove(4)
+        
+        self.assertEqual(sorted(looked_up), sorted(tokenize('수채화')))
+        self.assertNotIn(4, self.index.product_tokens)
+        self.assertEqual(self.index.search('채', 10), [])
+    
+    def test_result_cache_keeps_unrelated_queries(self):
+        self.assertEqual(self.index.search('코딩', 10), [3, 1, 2])
+        self.assertEqual(self.index.search('수채화', 10), [4])
+        self.assertEqual(self.index.search('채', 10), [4])
+        self.index.facets('코딩')
+        
+        self.index.add(self.document(5, '수채화 코딩', like_count=1000))
+        self.index.add(self.document(2, '드로잉 클래스', creator='코딩왕', like_count=0, created_at=20, sub_category_id=2))
+        
+        self.assertEqual(self.index.search('코딩', 10), [3, 5, 1, 2])
+        self.assertEqual(self.index.search('수채화', 10), [5, 4])
+        self.assertEqual(self.index.search('채', 10), [5, 4])
+        self.assertEqual(sum(self.index.facets('코딩')['has_kit'].values()), 4)
+        self.assertEqual(self.index.changed, set())
+        
+        self.index.search('드로잉', 10)
+        self.index.add(self.document(4, '수채화', like_count=100, created_at=40))
+        
+        with patch.object(self.index, '_search', wraps=self.index._search) as search:
+            self.index.search('드로잉', 10)
+            search.assert_not_called()
+    
+    def test_facets(self):
+        index = SearchIndex(price_buckets=(0, 50000, 100000))
+        
+        for product_id, sub_category_id, main_category_id, difficulty_id, price, has_kit in (
+            (1, 1, 1, 1, 30000, False),
+            (2, 1, 1, 2, 70000, True),
+            (3, 2, 1, 2, 150000, True),
+            (4, 2, 2, 0, 90000, False),
+        ):
+            index.add(SearchDocument(
+                id               = product_id,
+                texts            = (('name', '코딩 클래스'), ('sub_category', f'서브{sub_category_id}')),
+                like_count       = 0,
+                created_at       = 0,
+                sub_category_id  = sub_category_id,
+                main_category_id = main_category_id,
+                difficulty_id    = difficulty_id,
+                difficulty       = f'난이도{difficulty_id}',
+                price            = price,
+                has_kit          = has_kit
+            ))
+        
+        facets = index.facets('코딩')
+        
+        self.assertEqual(facets['sub_category'], {1: 2, 2: 2})
+        self.assertEqual(facets['main_category'], {1: 3, 2: 1})
+        self.assertEqual(facets['difficulty'], {1: 1, 2: 2, 0: 1})
+        self.assertEqual(facets['price'], {0: 1, 1: 2, 2: 1})
+        self.assertEqual(facets['has_kit'], {True: 2, False: 2})
+        self.assertEqual(index.names[('sub_category', 2)], '서브2')
+        
+        # 서브 카테고리 facet 은 필터 적용 전, 나머지는 필터 적용 후
+        facets = index.facets('코딩', sub_category_ids={2})
+        
+        self.assertEqual(facets['sub_category'], {1: 2, 2: 2})
+        self.assertEqual(facets['main_category'], {1: 1, 2: 1})
+        self.assertEqual(facets['has_kit'], {True: 1, False: 1})
+        self.assertEqual(index.facets('없는말'), {
+            'sub_category': {}, 'main_category': {}, 'difficulty': {}, 'price': {}, 'has_kit': {}
+        })
+
+
+class TestSuggestIndex(TestCase):
+    def document(self, product_id, name, creator='이소헌', sub_category='개발', like_count=0):
+        return SearchDocument(
+            id              = product_id,
+            texts           = (('name', name), ('sub_category', sub_category), ('creator', creator), ('kit', '키트')),
+            like_count      = like_count,
+            created_at      = 0,
+            sub_category_id = 1
+        )
+    
+    def setUp(self):
+        self.index = SuggestIndex()
+        
+        for document in (
+            self.document(1, '퇴근 후 코딩 모임', like_count=5),
+            self.document(2, '코딩 기초', like_count=50),
+            self.document(3, '코바늘 뜨개질', creator='김코치', sub_category='공예', like_count=1),
+        ):
+            self.index.add(document)
+    
+    def texts(self, query, limit=10):
+        return [text for _, text in self.index.suggest(query, limit)]
+    
+    def test_choseong(self):
+        self.assertEqual(choseong('코딩 A1'), 'ㅋㄷ A1')
+    
+    def test_prefix_ranked_by_popularity(self):
+        self.assertEqual(self.texts('코딩'), ['코딩 기초', '퇴근 후 코딩 모임'])
+        self.assertEqual(self.texts('코'), ['코딩 기초', '퇴근 후 코딩 모임', '코바늘 뜨개질'])
+        self.assertEqual(self.texts('코', limit=1), ['코딩 기초'])
+        self.assertEqual(self.index.suggest('이소'), [('creator', '이소헌')])
+        self.assertEqual(self.index.suggest('공'), [('category', '공예')])
+        self.assertEqual(self.texts('딩'), [])
+    
+    def test_choseong_query(self):
+        self.assertEqual(self.texts('ㅋㄷ'), ['코딩 기초', '퇴근 후 코딩 모임'])
+        self.assertEqual(self.texts('코ㄷ'), ['코딩 기초', '퇴근 후 코딩 모임'])
+        self.assertEqual(self.texts('코ㅂㄴ'), ['코바늘 뜨개질'])
+        self.assertEqual(self.texts('ㄱㅇ'), ['공예'])
+    
+    def test_incremental_update(self):
+        self.texts('코')
+        self.texts('ㅋ')
+        self.index.add(self.document(4, '코딩 심화', like_count=10))
+        
+        self.assertEqual(self.texts('코'), ['코딩 기초', '코딩 심화', '퇴근 후 코딩 모임', '코바늘 뜨개질'])
+        
+        self.index.add(self.document(3, '코바늘 뜨개질', creator='김코치', sub_category='공예', like_count=500))
+        self.index.remove(2)
+        
+        self.assertEqual(self.texts('코'), ['코바늘 뜨개질', '코딩 심화', '퇴근 후 코딩 모임'])
+        self.assertEqual(self.texts('ㅋ'), ['코바늘 뜨개질', '코딩 심화', '퇴근 후 코딩 모임'])
+        self.assertEqual(self.texts('코딩ㄱ'), [])
+        self.assertEqual(len(self.index), 3)
+
+
+class TestFuzzyIndex(TestCase):
+    def document(self, product_id, name, creator='이소헌', like_count=0):
+        return SearchDocument(
+            id              = product_id,
+            texts           = (('name', name), ('sub_category', '개발'), ('creator', creator)),
+            like_count      = like_count,
+            created_at      = 0,
+            sub_category_id = 1
+        )
+    
+    def setUp(self):
+        self.index = FuzzyIndex()
+        
+        for document in (
+            self.document(1, '코딩 클래스', like_count=5),
+            self.document(2, '드로잉 기초'),
+            self.document(3, '로딩 화면 만들기', creator='김로딩', like_count=50),
+        ):
+            self.index.add(document)
+    
+    def test_edit_distance(self):
+        self.assertEqual(jamo('코딩'), '\u110f\u1169\u1103\u1175\u11bc') # ㅋㅗㄷㅣㅇ
+        self.assertEqual(edit_distance(jamo('코딩'), jamo('코팅'), 2), 1)
+        self.assertEqual(edit_distance('abcdef', 'uvwxyz', 2), 3)
+    
+    def test_correct(self):
+        self.assertEqual(self.index.correct('코팅'), '코딩')
+        self.assertEqual(self.index.correct('드로인 기초'), '드로잉 기초')
+        self.assertEqual(self.index.correct('코딩 클래쓰'), '코딩 클래스')
+        self.assertEqual(self.index.correct('이소훈'), '이소헌')
+        self.assertIsNone(self.index.correct('코딩 클래스'))
+        self.assertIsNone(self.index.correct('전혀다른말'))
+    
+    def test_more_popular_word_wins_tie(self):
+        # '코딩', '로딩' 모두 자모 한 글자 차이
+        self.assertEqual(self.index.correct('오딩'), '로딩')
+        
+        self.index.remove(3)
+        
+        self.assertEqual(self.index.correct('오딩'), '코딩')
+        self.assertEqual(self.index.correct('로딩'), '코딩')
@@ -1,12 +1,14 @@
 from django.urls import path
 
-from product.views import ProductDetailView, LectureDetailView, ClassDetailView, MainPageView
+from product.views import ProductDetailView, LectureDetailView, ClassDetailView, MainPageView, \
+    ProductCommunityView
 from user.views import CommunityView, CommunityCommentView, LectureCommentView, CommunityLikeView, \
     ProductLikeView
 
 urlpatterns = [
     path('/main', MainPageView.as_view()),
     path('/<int:product_id>', ProductDetailView.as_view(), name='products'),
+    path('/<int:product_id>/community', ProductCommunityView.as_view(), name='product_community'),
     path('/<int:product_id>/challenge', ClassDetailView.as_view(), name='class_detail'),
     path('/chapters/<int:chapter_id>/lecture/<int:lecture_id>',
          LectureDetailView.as_view(), name='lectures'),
@@ -1,14 +1,29 @@
 import json
 from datetime import date, datetime
 
-from django.db.models import Count
 from django.views import View
 from django.http import JsonResponse
 
-from product.models import Product, Chapter, Lecture, LectureVideo, LectureContent
-from user.models import User, ProductLike, RecentlyView, UserProduct
+from product.models import Product, Chapter, Lecture, LectureVideo, LectureContent, Community
+from user.models import User, UserProduct
+from user.recently_views import record_recently_viewed
+from user.liked_products import get_request_liked_product_ids
 from core.common_utils import login_decorator
-from clnass_101.settings import S3_BUCKET_URL
+from core.exception import InvalidCursor
+from core.pagination import paginate, parse_limit
+from product.documents import get_product_document
+from product.main_feed import get_main_feed
+from clnass_101.settings import (
+    S3_BUCKET_URL,
+    COMMUNITY_PAGE_SIZE,
+    COMMUNITY_MAX_PAGE_SIZE,
+    MAIN_PAGE_SIZE,
+    MAIN_MAX_PAGE_SIZE
+)
+
+COMMUNITY_FIELDS   = ('id', 'description', 'user', 'product', 'updated_at')
+AUTHOR_FIELDS      = ('id', 'nick_name', 'profile_image_url')
+COMMUNITY_ORDERING = ('-updated_at', '-id')
 
 
 class ProductDetailView(View):
@@ -19,120 +34,32 @@ class ProductDetailView(View):
             if not isinstance(product_id, int):
                 raise TypeError
             
-            product = Product.objects. \
-                select_related(
-                    'sub_category',
-                    'difficulty',
-                    'creator',
-                    'signature',
-                ).prefetch_related(
-                    'productsubimage_set',
-                    'chapter_set',
-                    'community_set',
-                    'productlike_set',
-                    'productkit_set',
-                ).get(id=product_id, is_deleted=0)
+            document = get_product_document(product_id)
             
-            product_sub_images = [
-                {
-                    'imageUrl': sub_image['image_url']
-                } for sub_image in product.productsubimage_set.all().values('image_url')
-            ]
+            creator_communities, creator_community_cursor = get_community_page(
+                product_id, user_ids=document['creatorIds']
+            )
+            communities, community_cursor = get_community_page(product_id)
             
-            chapters = product.chapter_set.all(). \
-                prefetch_related('lecture_set').order_by('order')
+            is_like = product_id in get_request_liked_product_ids(request)
             
-            kits = [
-                product_kits.kit for product_kits in product.productkit_set.all()
-            ]
-            
-            product_communities = product.community_set.all().order_by('-updated_at')
-            
-            creator_communities = [
-                community for community in product_communities
-                if community.user_id == product.creator_id
-                   or community.user_id == product.signature_id
-            ]
-            
-            communities = [
-                community for community in product_communities
-            ]
-            
-            is_like = False
             if request.user:
-                is_like = ProductLike.objects.filter(
-                    user_id=request.user.id,
-                    product_id=product_id
-                ).exists()
-                
-                if not RecentlyView.objects.filter(
-                    user_id=request.user.id,
-                    product_id=product.id
-                ).exists():
-                    RecentlyView.objects.create(
-                        user_id=request.user.id,
-                        product_id=product_id
-                    )
+                record_recently_viewed(request.user.id, product_id)
             
+            start_date   = document['startDate']
             product_info = {
-                'mainImage'       : product.thumbnail_image,
-                'subImages'       : product_sub_images,
-                'title'           : product.name,
-                'subCategoryName' : product.sub_category.name,
-                'classOwner'      : product.creator.nick_name if not product.signature else
-                                    product.signature.name,
-                'isTakeClass'     : '바로 수강 가능' if product.start_date <= date.today() else
-                                    str(product.start_date.month) + '월' + ' ' +
-                                    str(product.start_date.day) + '일 부터 수강 가능',
-                'sale'            : int(product.sale * 100),
-                'price'           : '{:,}원'.format(int(product.price * (1 - product.sale))),
-                'difficulty'      : f'{product.difficulty.name} 대상',
-                'likeCount'       : product.productlike_set.count(),
+                **document['info'],
+                'isTakeClass'     : '바로 수강 가능' if start_date <= date.today() else
+                                    str(start_date.month) + '월' + ' ' +
+                                    str(start_date.day) + '일 부터 수강 가능',
+                'likeCount'       : Product.objects.filter(id=product_id).values_list('like_count', flat=True).first(),
                 'isLike'          : is_like,
-                'curriculum' : [
-                    {
-                        'thumbnailImage' : chapter.thumbnail_image,
-                        'chapterName'    : chapter.name,
-                        'order'          : chapter.order,
-                        'chapterDetail'  : [
-                            {
-                                'lectureNum'      : index + 1,
-                                'lectureTitle'    : lecture.name,
-                                'lectureVideoUrl' : lecture.video.video_url,
-                            } for index, lecture in enumerate(chapter.lecture_set.all())
-                        ]
-                    } for chapter in chapters
-                ],
-                'kitInfo' : [
-                    {
-                        'mainImageUrl' : kit.main_image_url,
-                        'kitName'      : kit.name,
-                        'subImageUrls' : [
-                            {
-                                'subImageUrl' : sub_image.image_url
-                            } for sub_image in kit.kitsubimageurl_set.all()
-                        ]
-                    } for kit in kits
-                ],
                 'creatorInfo' : get_user_info(creator_communities[0])
                                     if creator_communities else {},
-                'creatorCommunity' : [
-                    {
-                        'communityUserInfo'      : get_user_info(community),
-                        'communityCommentedDate' : community.updated_at.strftime('%Y.%m.%d.'),
-                        'comment'                : community.description,
-                        'communityId'            : community.id
-                    } for community in creator_communities
-                ],
-                'community' : [
-                    {
-                        'communityUserInfo'      : get_user_info(community),
-                        'communityCommentedDate' : community.updated_at.strftime('%Y.%m.%d.'),
-                        'comment'                : community.description,
-                        'communityId'            : community.id
-                    } for community in communities
-                ],
-                'classId' : product.id
+                'creatorCommunity'       : [serialize_community(community) for community in creator_communities],
+                'creatorCommunityCursor' : creator_community_cursor,
+                'community'              : [serialize_community(community) for community in communities],
+                'communityCursor'        : community_cursor,
             }
         
         except TypeError:
@@ -238,10 +165,69 @@ class ClassDetailView(View):
         
         return JsonResponse({'MESSAGE': classData}, status=200)
 
+class ProductCommunityView(View):
+    """ 클래스 커뮤니티 목록 (최신 수정 순, 커서 페이지네이션)
+    
+        GET /products/<product_id>/community?cursor=<nextCursor>&limit=20&creator=true
+    """
+    def get(self, request, product_id):
+        try:
+            product = Product.objects.only('id', 'creator', 'signature').get(id=product_id, is_deleted=0)
+            
+            communities, next_cursor = get_community_page(
+                product_id,
+                cursor   = request.GET.get('cursor'),
+                limit    = parse_limit(request.GET.get('limit'), COMMUNITY_PAGE_SIZE, COMMUNITY_MAX_PAGE_SIZE),
+                user_ids = [product.creator_id, product.signature_id]
+                           if request.GET.get('creator') == 'true' else None
+            )
+        
+        except Product.DoesNotExist:
+            return JsonResponse({'MESSAGE': 'PRODUCT_NOT_EXIST'}, status=400)
+        
+        except InvalidCursor as e:
+            return JsonResponse({'MESSAGE': e.__str__()}, status=400)
+        
+        return JsonResponse({
+            'COMMUNITY' : {
+                'communities' : [serialize_community(community) for community in communities],
+                'nextCursor'  : next_cursor,
+            }
+        }, status=200)
+
+
+def get_community_page(product_id, cursor=None, limit=COMMUNITY_PAGE_SIZE, user_ids=None):
+    """ (커뮤니티 목록, 다음 페이지 커서). 작성자는 같은 쿼리에서 함께 조회한다.
+    
+        user_ids: 해당 유저들이 작성한 글만 (크리에이터/시그니처 글)
+    """
+    communities = Community.objects.filter(product_id=product_id).select_related('user').only(
+        *COMMUNITY_FIELDS,
+        *(f'user__{field}' for field in AUTHOR_FIELDS)
+    )
+    
+    if user_ids is not None:
+        communities = communities.filter(user_id__in=user_ids)
+    
+    return paginate(communities, COMMUNITY_ORDERING, cursor, limit)
+
+
+def serialize_community(community):
+    return {
+        'communityUserInfo'      : get_user_info(community),
+        'communityCommentedDate' : community.updated_at.strftime('%Y.%m.%d.'),
+        'comment'                : community.description,
+        'communityId'            : community.id
+    }
+
+
 def get_user_info(community):
-    return User.objects.values(
-        'id', 'nick_name', 'profile_image'
-    ).get(id=community.user_id)
+    """ 커뮤니티 작성자 정보 (community.user 는 select_related 로 함께 조회되어 있어야 한다) """
+    return {
+        'id'            : community.user.id,
+        'nick_name'     : community.user.nick_name,
+        'profile_image' : community.user.profile_image_url,
+    }
 
 
 class ExpiredUsePeriodException(Exception):
@@ -250,54 +236,37 @@ class ExpiredUsePeriodException(Exception):
 
 
 class MainPageView(View):
+    """ 메인 페이지 상품 목록 (커서 페이지네이션)
+    
+        GET /products/main?sorting=updated|popular&main=<id>&sub=<id>&cursor=<NEXT_CURSOR>&limit=40
+    """
+    @login_decorator(login_required=False)
     def get(self, request):
         try:
-            sorting = request.GET.get('sorting')
-            main_category_id = request.GET.get('main')
-            sub_category_id = request.GET.get('sub')
-            products = Product.objects.select_related(
-                'main_category',
-                'sub_category',
-                'creator'
-            ).prefetch_related(
-                'product_like_user',
-                'product_view_user'
-            ).annotate(likecount=Count('product_like_user'))
-            
-            filters = {}
-            
-            if main_category_id:
-                filters['main_category__id'] = main_category_id
-            if sub_category_id:
-                filters['sub_category__id'] = sub_category_id
-            
-            sortings = {
-                'updated': '-created_at',
-                'popular': '-likecount'
-            }
-            
-            if sorting in sortings:
-                products = products.order_by(sortings[sorting])
-            products_list = [{
-                'created_at' : product.created_at,
-                'id'         : product.id,
-                'title'      : product.name,
-                'thumbnail'  : product.thumbnail_image,
-                'subCategory': product.sub_category.name,
-                'creator'    : product.creator.name,
-                'isLiked'    : False,
-                'likeCount'  : product.likecount,
-                'price'      : int(product.price),
-                'sale'       : product.sale,
-                'finalPrice' : round(int(product.price * (1 - product.sale)), 2)
-            } for product in products.filter(**filters)]
+            products_list, next_cursor = get_main_feed(
+                request.GET.get('sorting'),
+                request.GET.get('main'),
+                request.GET.get('sub'),
+                request.GET.get('cursor'),
+                parse_limit(request.GET.get('limit'), MAIN_PAGE_SIZE, MAIN_MAX_PAGE_SIZE)
+            )
             
             if not products_list:
                 return JsonResponse({'MESSAGE': 'NO_RESULT'}, status=400)
+            
+            # 목록은 요청 간에 공유되므로 복사하여 유저별 값을 채운다
+            liked_product_ids = get_request_liked_product_ids(request)
+            products_list     = [
+                {**product, 'isLiked': product['id'] in liked_product_ids} for product in products_list
+            ]
+        except InvalidCursor as e:
+            return JsonResponse({'MESSAGE': e.__str__()}, status=400)
+        except ValueError:
+            return JsonResponse({'MESSAGE': 'VALUE_ERROR'}, status=400)
         except KeyError as e:
             return JsonResponse({'MESSAGE': f'KEY_ERROR:{e}'}, status=400)
         except TypeError:
             return JsonResponse({'MESSAGE': 'TYPE_ERROR'}, status=400)
         except json.JSONDecodeError as e:
             return JsonResponse({'MESSAGE': f'JSON_DECODE_ERROR:{e}'}, status=400)
-        return JsonResponse({'RESULT': products_list}, status=200)
\ No newline at end of file
+        return JsonResponse({'RESULT': products_list, 'NEXT_CURSOR': next_cursor}, status=200)
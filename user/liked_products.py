@@ -0,0 +1,92 @@
+""" 유저별 좋아요한 상품 id 집합
+
+    목록 API(메인, 검색, 상세)가 카드마다 ProductLike 를 조회하지 않고
+    요청당 한 번 읽은 집합으로 isLiked 를 채운다.
+
+    - 정렬된 int64 배열(array)로 보관하여 id 당 8 바이트만 쓰고, 포함 여부는 이진 탐색으로 확인한다.
+    - 캐시에는 배열의 bytes 를 저장한다. 키: liked-products:<user_id>:<version>
+    - 좋아요 토글 시 invalidate_liked_products 로 version 을 올린다. (product/documents.py 와 같은 방식)
+      유저 삭제 등 토글 외의 변경은 LIKED_PRODUCTS_TTL 후 반영된다.
+
+    History:
+        2026-10-18 - 초기 생성
+"""
+from array  import array
+from bisect import bisect_left
+
+from django.core.cache import caches
+
+from core.cache_version  import get_version, bump_version
+from user.models         import ProductLike
+from clnass_101.settings import LIKED_PRODUCTS_CACHE_ALIAS, LIKED_PRODUCTS_TTL
+
+
+class LikedProductIds:
+    """ 정렬된 상품 id 배열 (in 연산은 이진 탐색) """
+    __slots__ = ('ids',)
+
+    def __init__(self, ids=()):
+        self.ids = array('q', sorted(set(ids)))
+
+    @classmethod
+    def frombytes(cls, data):
+        liked = cls()
+        liked.ids.frombytes(data)
+        return liked
+
+    def tobytes(self):
+        return self.ids.tobytes()
+
+    def __contains__(self, product_id):
+        index = bisect_left(self.ids, product_id)
+        return index < len(self.ids) and self.ids[index] == product_id
+
+    def __iter__(self):
+        return iter(self.ids)
+
+    def __len__(self):
+        return len(self.ids)
+
+
+def get_cache():
+    return caches[LIKED_PRODUCTS_CACHE_ALIAS]
+
+
+def version_key(user_id):
+    return f'liked-products-version:{user_id}'
+
+
+def liked_key(user_id, version):
+    return f'liked-products:{user_id}:{version}'
+
+
+def get_liked_product_ids(user_id):
+    """ 유저가 좋아요한 상품 id 집합 (캐시에 없으면 한 번의 쿼리로 만들어서 저장) """
+    cache   = get_cache()
+    version = get_version(cache, version_key(user_id))
+    key     = liked_key(user_id, version)
+    data    = cache.get(key)
+
+    if data is not None:
+        return LikedProductIds.frombytes(data)
+
+    liked = LikedProductIds(ProductLike.objects.filter(user_id=user_id).values_list('product_id', flat=True))
+    cache.set(key, liked.tobytes(), LIKED_PRODUCTS_TTL)
+    return liked
+
+
+def get_request_liked_product_ids(request):
+    """ login_decorator 를 거친 요청의 좋아요 집합 (비로그인이면 빈 집합, 쿼리 없음)
+
+        비로그인 요청의 request.user 는 빈 QuerySet 이므로 평가(bool)하지 않고 id 유무만 확인한다.
+    """
+    user_id = getattr(request.user, 'id', None)
+
+    if user_id is None:
+        return LikedProductIds()
+
+    return get_liked_product_ids(user_id)
+
+
+def invalidate_liked_products(user_id):
+    bump_version(get_cache(), version_key(user_id))
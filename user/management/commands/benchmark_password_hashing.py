@@ -0,0 +1,66 @@
+""" bcrypt 해싱 마이크로 벤치마크
+
+    cost 별 단일 코어 처리량(hashes/sec)과 password_hashing_pool 을 통한 전체 처리량을 측정한다.
+    BCRYPT_ROUNDS 를 정할 때 참고한다.
+
+    사용법:
+        python manage.py benchmark_password_hashing --rounds 10 12 --iterations 20
+"""
+import os
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from core.common_utils   import hash_password
+from core.hashing        import HashingPool
+from clnass_101.settings import BCRYPT_ROUNDS, PASSWORD_HASHING_WORKERS
+
+
+class Command(BaseCommand):
+    help = 'bcrypt 해싱 처리량(hashes/sec per core) 측정'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rounds', type=int, nargs='+', default=[BCRYPT_ROUNDS])
+        parser.add_argument('--iterations', type=int, default=20)
+        parser.add_argument('--workers', type=int, default=PASSWORD_HASHING_WORKERS)
+
+    def handle(self, *args, **options):
+        workers    = options['workers']
+        iterations = options['iterations']
+
+        self.stdout.write(f'cpu={os.cpu_count()} workers={workers} iterations={iterations}')
+
+        for rounds in options['rounds']:
+            single = self.measure_single(rounds, iterations)
+            pooled = self.measure_pool(rounds, iterations * workers, workers)
+
+            self.stdout.write(
+                f'rounds={rounds:<3}'
+                f' single={single:8.2f} hashes/sec/core'
+                f' ({1000 / single:7.1f} ms/hash)'
+                f' pool={pooled:8.2f} hashes/sec'
+                f' ({pooled / workers:8.2f} hashes/sec/core)'
+            )
+
+    def measure_single(self, rounds, iterations):
+        start = time.perf_counter()
+
+        for _ in range(iterations):
+            hash_password('benchmark1234', rounds)
+
+        return iterations / (time.perf_counter() - start)
+
+    def measure_pool(self, rounds, iterations, workers):
+        pool = HashingPool(max_workers=workers, max_pending=iterations, timeout=None)
+
+        start = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=workers) as callers:
+            list(callers.map(
+                lambda _: pool.run(hash_password, 'benchmark1234', rounds),
+                range(iterations)
+            ))
+
+        return iterations / (time.perf_counter() - start)
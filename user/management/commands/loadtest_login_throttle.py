@@ -0,0 +1,70 @@
+""" 로그인 시도 제한 부하 테스트
+
+    같은 IP/이메일로 SignInView 에 요청을 반복하여
+    허용된 요청과 거절된 요청(429)의 평균 처리 시간, 실행된 쿼리 수를 비교한다.
+    거절된 요청은 DB/bcrypt 작업 없이 수 µs 안에 끝나야 한다.
+
+    사용법:
+        python manage.py loadtest_login_throttle --requests 10000 --email test@gmail.com
+"""
+import json
+import time
+
+from django.core.management.base import BaseCommand
+from django.db                   import connection
+from django.test                 import RequestFactory
+from django.test.utils           import CaptureQueriesContext
+
+from core.common_utils import login_throttle
+from user.views        import SignInView
+
+
+class Command(BaseCommand):
+    help = '로그인 시도 제한 부하 테스트 (허용/거절 요청 비용 비교)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=10000)
+        parser.add_argument('--email', default='attacker@clnass101.com')
+        parser.add_argument('--password', default='wrongpassword1')
+        parser.add_argument('--ip', default='10.0.0.1')
+
+    def handle(self, *args, **options):
+        view    = SignInView.as_view()
+        factory = RequestFactory()
+        body    = json.dumps({'email': options['email'], 'password': options['password']})
+        results = {
+            'allowed'  : {'count': 0, 'seconds': 0.0, 'queries': 0},
+            'rejected' : {'count': 0, 'seconds': 0.0, 'queries': 0},
+        }
+
+        login_throttle.reset()
+
+        for _ in range(options['requests']):
+            request = factory.post(
+                '/user/sign-in',
+                body,
+                content_type = 'application/json',
+                REMOTE_ADDR  = options['ip']
+            )
+
+            with CaptureQueriesContext(connection) as queries:
+                start    = time.perf_counter()
+                response = view(request)
+                elapsed  = time.perf_counter() - start
+
+            result = results['rejected' if response.status_code == 429 else 'allowed']
+            result['count']   += 1
+            result['seconds'] += elapsed
+            result['queries'] += len(queries)
+
+        for name, result in results.items():
+            count = result['count'] or 1
+
+            self.stdout.write(
+                f'{name:<8} requests={result["count"]:<8}'
+                f' avg={result["seconds"] / count * 1000000:10.1f}us'
+                f' total={result["seconds"]:8.3f}s'
+                f' queries/request={result["queries"] / count:.2f}'
+            )
+
+        self.stdout.write(json.dumps(login_throttle.stats(), ensure_ascii=False))
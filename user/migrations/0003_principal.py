@@ -0,0 +1,24 @@
+# Generated by Django 3.1.5 on 2026-10-18 11:48
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0002_auto_20210120_0221'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Principal',
+            fields=[
+            ],
+            options={
+                'proxy': True,
+                'indexes': [],
+                'constraints': [],
+            },
+            bases=('user.user',),
+        ),
+    ]
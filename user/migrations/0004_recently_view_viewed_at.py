@@ -0,0 +1,43 @@
+# Generated by Django 3.1.5 on 2026-10-18 12:09
+
+from django.db import migrations, models
+import django.utils.timezone
+
+from django.db.models import Count, Max
+
+
+def remove_duplicated_views(apps, schema_editor):
+    """ (user, product) 마다 가장 최근(id 가 가장 큰) 기록만 남긴다 (중복된 조합만 조회) """
+    RecentlyView = apps.get_model('user', 'RecentlyView')
+    duplicated   = list(
+        RecentlyView.objects.values('user_id', 'product_id').annotate(latest_id=Max('id'), count=Count('id')). \
+            filter(count__gt=1)
+    )
+
+    for row in duplicated:
+        RecentlyView.objects.filter(user_id=row['user_id'], product_id=row['product_id']). \
+            exclude(id=row['latest_id']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0003_principal'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recentlyview',
+            name='viewed_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.RunPython(remove_duplicated_views, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='recentlyview',
+            index=models.Index(fields=['user', '-viewed_at'], name='recently_views_recent_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='recentlyview',
+            constraint=models.UniqueConstraint(fields=('user', 'product'), name='recently_views_user_product_unique'),
+        ),
+    ]
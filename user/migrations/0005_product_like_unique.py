@@ -0,0 +1,44 @@
+# Generated by Django 3.1.5 on 2026-10-18 12:15
+
+from django.db import migrations, models
+
+from django.db.models import Count, Min, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def remove_duplicated_likes(apps, schema_editor):
+    """ (user, product) 마다 가장 먼저(id 가 가장 작은) 누른 좋아요만 남기고 해당 상품의 like_count 를 다시 센다 """
+    Product     = apps.get_model('product', 'Product')
+    ProductLike = apps.get_model('user', 'ProductLike')
+    duplicated  = list(
+        ProductLike.objects.values('user_id', 'product_id').annotate(first_id=Min('id'), count=Count('id')). \
+            filter(count__gt=1)
+    )
+
+    for row in duplicated:
+        ProductLike.objects.filter(user_id=row['user_id'], product_id=row['product_id']). \
+            exclude(id=row['first_id']).delete()
+
+    Product.objects.filter(id__in={row['product_id'] for row in duplicated}).update(like_count=Coalesce(
+        Subquery(
+            ProductLike.objects.filter(product=OuterRef('pk')).order_by().
+                values('product').annotate(count=Count('id')).values('count')
+        ),
+        0
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0004_recently_view_viewed_at'),
+        ('product', '0004_like_count'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicated_likes, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='productlike',
+            constraint=models.UniqueConstraint(fields=('user', 'product'), name='product_likes_user_product_unique'),
+        ),
+    ]
@@ -1,4 +1,5 @@
-from django.db import models
+from django.db    import models
+from django.utils import timezone
 
 
 class User(models.Model):
@@ -44,6 +45,37 @@ class User(models.Model):
         db_table = 'users'
 
 
+class Principal(User):
+    """ 토큰 클레임으로 만든 인증 유저 (DB 조회 없음)
+        
+        클레임에 없는 필드는 지연(deferred) 필드로 남겨두고, 뷰에서 처음 접근할 때
+        get_principal(principal_cache 경유)로 나머지 필드를 한 번에 채운다.
+        유저가 삭제되었으면 InvalidPrincipal 을 발생시킨다.
+        User 의 프록시 모델이므로 FK 할당(user=request.user) 등에 그대로 사용할 수 있다.
+    """
+    class Meta:
+        proxy = True
+    
+    def refresh_from_db(self, using=None, fields=None):
+        deferred_fields = self.get_deferred_fields()
+        
+        if not fields or not deferred_fields.issuperset(fields):
+            return super().refresh_from_db(using, fields)
+        
+        from core.common_utils import get_principal
+        from core.exception    import InvalidPrincipal
+        
+        try:
+            user = get_principal(self.id)
+        
+        except User.DoesNotExist:
+            # 토큰 발행 후 삭제된 유저: 뷰의 User.DoesNotExist 처리와 구분하여 login_decorator 에서 401 로 응답
+            raise InvalidPrincipal
+        
+        for field_name in deferred_fields:
+            setattr(self, field_name, getattr(user, field_name))
+
+
 class ApplyChannel(models.Model):
     name = models.CharField(max_length=50)
     
@@ -74,11 +106,18 @@ class UserCoupon(models.Model):
 
 
 class RecentlyView(models.Model):
-    user    = models.ForeignKey('user.User', on_delete=models.CASCADE)
-    product = models.ForeignKey('product.Product', on_delete=models.CASCADE)
+    user      = models.ForeignKey('user.User', on_delete=models.CASCADE)
+    product   = models.ForeignKey('product.Product', on_delete=models.CASCADE)
+    viewed_at = models.DateTimeField(default=timezone.now)
     
     class Meta:
-        db_table = 'recently_views'
+        db_table    = 'recently_views'
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'product'], name='recently_views_user_product_unique'),
+        ]
+        indexes     = [
+            models.Index(fields=['user', '-viewed_at'], name='recently_views_recent_idx'),
+        ]
 
 
 class UserProduct(models.Model):
@@ -96,4 +135,7 @@ class ProductLike(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
-        db_table = 'product_likes'
+        db_table    = 'product_likes'
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'product'], name='product_likes_user_product_unique'),
+        ]
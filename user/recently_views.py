@@ -0,0 +1,92 @@
+""" 최근 본 클래스 기록
+
+    유저마다 서로 다른 상품 최근 RECENTLY_VIEW_MAX_PER_USER 개를 본 시간(viewed_at)과 함께 보관한다.
+
+    - 상품 상세 조회마다 바로 쓰지 않고 write-behind 버퍼에 모아 한 번에 저장한다.
+    - (user, product) 는 유일하다. 다시 본 상품은 viewed_at 만 갱신하여 맨 앞으로 옮긴다.
+    - 저장할 때 이번에 기록된 유저의 오래된 기록만 정리한다. (전체 테이블을 훑지 않음)
+    - 조회는 (user, -viewed_at) 인덱스로 최근 순 N 개만 읽는다.
+
+    History:
+        2026-10-18 - 초기 생성
+        2026-10-18 - viewed_at, (user, product) 유일 제약, 최근 순 조회
+"""
+from django.db    import transaction
+from django.utils import timezone
+
+from core.write_behind   import WriteBehindBuffer
+from user.models         import RecentlyView
+from clnass_101.settings import (
+    RECENTLY_VIEW_BUFFER_SIZE,
+    RECENTLY_VIEW_FLUSH_INTERVAL,
+    RECENTLY_VIEW_MAX_PER_USER
+)
+
+
+def save_recently_views(views):
+    """ views: [(user_id, product_id, viewed_at), ...] 오래된 순, (user_id, product_id) 중복 없음 """
+    viewed_at = {(user_id, product_id): viewed for user_id, product_id, viewed in views}
+    user_ids  = {user_id for user_id, _ in viewed_at}
+
+    with transaction.atomic():
+        existing = [
+            recent for recent in RecentlyView.objects.filter(
+                user_id__in    = user_ids,
+                product_id__in = {product_id for _, product_id in viewed_at}
+            ).only('id', 'user', 'product')
+            if (recent.user_id, recent.product_id) in viewed_at
+        ]
+
+        for recent in existing:
+            recent.viewed_at = viewed_at.pop((recent.user_id, recent.product_id))
+
+        RecentlyView.objects.bulk_update(existing, ['viewed_at'])
+
+        # 다른 프로세스가 먼저 추가한 (user, product) 는 건너뛴다
+        RecentlyView.objects.bulk_create(
+            [
+                RecentlyView(user_id=user_id, product_id=product_id, viewed_at=viewed)
+                for (user_id, product_id), viewed in viewed_at.items()
+            ],
+            ignore_conflicts=True
+        )
+
+        prune_recently_views(user_ids)
+
+
+def prune_recently_views(user_ids, keep=RECENTLY_VIEW_MAX_PER_USER):
+    """ 유저마다 최근 keep 개를 제외한 기록 삭제 """
+    kept    = dict.fromkeys(user_ids, 0)
+    expired = []
+
+    for row_id, user_id in RecentlyView.objects.filter(user_id__in=user_ids). \
+            order_by('user_id', '-viewed_at', '-id').values_list('id', 'user_id'):
+        kept[user_id] += 1
+
+        if kept[user_id] > keep:
+            expired.append(row_id)
+
+    if expired:
+        RecentlyView.objects.filter(id__in=expired).delete()
+
+
+def get_recently_viewed(user_id, limit=RECENTLY_VIEW_MAX_PER_USER):
+    """ 최근 본 순서의 RecentlyView 목록 (product, 카테고리, 크리에이터 포함 한 번의 쿼리) """
+    return list(
+        RecentlyView.objects.filter(user_id=user_id).select_related(
+            'product__sub_category',
+            'product__creator'
+        ).order_by('-viewed_at', '-id')[:limit]
+    )
+
+
+recently_view_buffer = WriteBehindBuffer(
+    'recently-views',
+    save_recently_views,
+    max_size = RECENTLY_VIEW_BUFFER_SIZE,
+    interval = RECENTLY_VIEW_FLUSH_INTERVAL
+)
+
+
+def record_recently_viewed(user_id, product_id):
+    recently_view_buffer.add((user_id, product_id), (user_id, product_id, timezone.now()))
@@ -0,0 +1,12 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch          import receiver
+
+from core.common_utils        import principal_cache
+from user.models              import User, Principal
+
+
+# Principal(프록시 모델)의 save/delete 는 sender=Principal 로 signal 을 보내므로 함께 연결한다
+@receiver([post_save, post_delete], sender=User)
+@receiver([post_save, post_delete], sender=Principal)
+def invalidate_principal(sender, instance, **kwargs):
+    principal_cache.invalidate(instance.id)
@@ -1,37 +1,57 @@
 import json
 import bcrypt
 import jwt
+import threading
 
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta
 
-from django.test import TestCase, Client
+from django.core.cache import caches
+from django.db import connection
+from django.test import TestCase, Client, RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.http import JsonResponse
 from unittest.mock import MagicMock, patch
 
 from requests import request
 
-from .models import User, ProductLike
+from .models import User, ProductLike, RecentlyView
 from kit.models import Kit
-from core.utils import (
-    get_hashed_pw,
-    checkpw,
-    issue_token)
+from order.models import OrderStatus, PaymentMethod
+from order.views import OrderProductView
 from product.models import (
     Product,
     SubCategory,
     MainCategory,
     Difficulty)
+from core.common_utils import (
+    login_decorator,
+    issue_access_token,
+    get_hashed_pw,
+    check_password,
+    principal_cache,
+    login_throttle)
+from product.models import Community
+from core.principal_cache import PrincipalCache
+from core.hashing import HashingPool, get_hash_rounds
+from core.exception import HashingQueueFull
+from core.throttle import TokenBucketLimiter
+from user.recently_views import recently_view_buffer, record_recently_viewed, get_recently_viewed
+from product.like_counts import increase_like_count
+from user.liked_products import LikedProductIds, get_liked_product_ids
+from product.search import product_search, search_changes
+from clnass_101.settings import LIKED_PRODUCTS_CACHE_ALIAS, ACCESS_TOKEN_CLAIMS_TTL
 
 class UserSignUpTest(TestCase):
     def setUp(self):
-        self.URL = '/user/signup'
+        self.URL = '/user/sign-up'
         self.client = Client()
-        self.PASS_NAME = 'jaehoon'
+        self.PASS_NAME = '김재훈'
         self.PASS_EMAIL = 'jae@gmail.com'
-        self.PASS_PASSWORD = '12345678'
+        self.PASS_PASSWORD = 'password1234'
 
-        self.TEST_NAME = 'test'
+        self.TEST_NAME = '테스트'
         self.TEST_EMAIL = 'test@gmail.com'
-        self.TEST_PASSWORD = '123456789'
+        self.TEST_PASSWORD = 'password12345'
 
         self.user = User(
             name=self.TEST_NAME,
@@ -53,7 +73,8 @@ class UserSignUpTest(TestCase):
         response = self.client.post(
             self.URL, request, content_type='application/json')
         self.assertEqual(response.status_code, 201)
-        self.assertEqual(response.json()['MESSAGE'], 'SUCCESS')
+        self.assertEqual(response.json()['message'], 'SIGN_UP_SUCCESS')
+        self.assertTrue(User.objects.filter(email=self.PASS_EMAIL).exists())
 
     def test_post_sign_up_key_error(self):
         requests = [
@@ -73,10 +94,11 @@ class UserSignUpTest(TestCase):
                 'password': self.PASS_PASSWORD
             }]
 
-        response = self.client.post(
-            self.URL, request, content_type='application/json')
-        self.assertEqual(response.status_code, 400)
-        self.assertEqual(response.json()['MESSAGE'], 'KEY_ERROR')
+        for request in requests:
+            response = self.client.post(
+                self.URL, request, content_type='application/json')
+            self.assertEqual(response.status_code, 400)
+            self.assertTrue(response.json()['message'].startswith('KEY_ERROR'))
 
     def test_post_sign_up_duplicate_info(self):
         request = {
@@ -87,8 +109,8 @@ class UserSignUpTest(TestCase):
 
         response = self.client.post(
             self.URL, request, content_type='application/json')
-        self.assertEqual(response.status_code, 409)
-        self.assertEqual(response.json()['MESSAGE'], 'DUPLICATE_INFORMATION')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['message'], 'DUPLICATED_USER')
 
     def test_post_sign_up_is_valid_name(self):
         request = {
@@ -100,10 +122,10 @@ class UserSignUpTest(TestCase):
         response = self.client.post(
             self.URL, request, content_type='application/json')
         self.assertEqual(response.status_code, 400)
-        self.assertEqual(response.json()['MESSAGE'], 'INVALID_NAME')
+        self.assertEqual(response.json()['message'], 'INVALID_USER_NAME')
 
     def test_post_sign_up_is_valid_email(self):
-        request = [
+        requests = [
             {
                 'name': self.PASS_NAME,
                 'email': 'test.com',
@@ -115,17 +137,18 @@ class UserSignUpTest(TestCase):
                 'password': self.PASS_PASSWORD
             }]
 
-        response = self.client.post(
-            self.URL, request, content_type='application/json')
-        self.assertEqual(response.status_code, 400)
-        self.assertEqual(response.json()['MESSAGE'], 'INVALID_EMAIL')
+        for request in requests:
+            response = self.client.post(
+                self.URL, request, content_type='application/json')
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.json()['message'], 'INVALID_EMAIL_FORMAT')
 
     def test_post_sign_up_is_valid_password(self):
-        request = [
+        requests = [
             {
                 'name': self.PASS_NAME,
                 'email': self.PASS_EMAIL,
-                'password': '12345'
+                'password': 'abc12'
             },
             {
                 'name': self.PASS_NAME,
@@ -133,24 +156,27 @@ class UserSignUpTest(TestCase):
                 'password': '123456789012345678901234567'
             }]
 
-        response = self.client.post(
-            self.URL, request, content_type='application/json')
-        self.assertEqual(response.status_code, 400)
-        self.assertEqual(response.json()['MESSAGE'], 'INVALID_PASSWORD')
+        for request in requests:
+            response = self.client.post(
+                self.URL, request, content_type='application/json')
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.json()['message'], 'INVALID_PASSWORD_FORMAT')
 
 
 class UserLogInTest(TestCase):
     def setUp(self):
-        self.URL = '/user/login'
-        self.SIGN_UP_URL = '/user/signup'
+        login_throttle.reset()
+
+        self.URL = '/user/sign-in'
+        self.SIGN_UP_URL = '/user/sign-up'
+        self.KAKAO_URL = '/user/social-sign-in'
         self.client = Client()
-        self.PASS_NAME = 'jaehoon'
         self.PASS_EMAIL = 'jae@gmail.com'
-        self.PASS_PASSWORD = '12345678'
+        self.PASS_PASSWORD = 'password1234'
 
-        self.TEST_NAME = 'test'
+        self.TEST_NAME = '테스트'
         self.TEST_EMAIL = 'test@gmail.com'
-        self.TEST_PASSWORD = '123456789'
+        self.TEST_PASSWORD = 'password12345'
 
         request = {
             'name': self.TEST_NAME,
@@ -160,21 +186,20 @@ class UserLogInTest(TestCase):
         self.client.post(self.SIGN_UP_URL, request,
                          content_type='application/json')
         self.user = User.objects.get(email=self.TEST_EMAIL)
-        self.access_token = issue_token(self.user.pk)
 
-    def tearsDown(self):
-        pass
+    def tearDown(self):
+        login_throttle.reset()
 
     def test_post_log_in_key_error(self):
-        request = [
+        requests = [
             {'email': self.PASS_EMAIL},
             {'password': self.PASS_PASSWORD}
         ]
 
-        response = self.client.post(
-            self.URL, request, content_type='application/json')
-        self.assertEqual(response.status_code, 400)
-        self.assertEqual(response.json()['MESSAGE'], 'KEY_ERROR')
+        for request in requests:
+            response = self.client.post(
+                self.URL, request, content_type='application/json')
+            self.assertEqual(response.status_code, 400)
 
     def test_post_log_in_is_user_exist(self):
         request = {
@@ -184,7 +209,7 @@ class UserLogInTest(TestCase):
         response = self.client.post(
             self.URL, request, content_type='application/json')
         self.assertEqual(response.status_code, 400)
-        self.assertEqual(response.json()['MESSAGE'], 'NO_EXIST_USER')
+        self.assertEqual(response.json()['message'], 'NOT_EXIST_USER')
 
     def test_post_log_in_success(self):
         request = {
@@ -194,9 +219,12 @@ class UserLogInTest(TestCase):
 
         response = self.client.post(
             self.URL, request, content_type='application/json')
+        payload = jwt.decode(
+            response.json()['access_token'], options={'verify_signature': False})
+
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(response.json()['name'], self.user.name)
-        self.assertEqual(response.json()['token'], self.access_token)
+        self.assertEqual(response.json()['message'], 'SIGN_IN_SUCCESS')
+        self.assertEqual(payload['user_id'], self.user.id)
 
     def test_post_log_in_check_pw(self):
         request = {
@@ -205,27 +233,28 @@ class UserLogInTest(TestCase):
         }
         response = self.client.post(
             self.URL, request, content_type='application/json')
-        hashed_pw = get_hashed_pw(self.PASS_PASSWORD)
 
-        self.assertEqual(response.status_code, 401)
-        self.assertEqual(response.json()['MESSAGE'], 'INVALID_PASSWORD')
-        self.assertEqual(checkpw(hashed_pw, self.user), False)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['message'], 'WRONG_PASSWORD')
+        self.assertEqual(check_password(request['password'], self.user.password), False)
 
-    def test_post_kakao_login_wrong_token(self):
+    @patch('user.views.requests')
+    def test_post_kakao_login_wrong_token(self, mocked_request):
+        mocked_request.get = MagicMock(return_value=MagicMock(json=lambda: {'msg': 'this access token does not exist'}))
         header = {'HTTP_Authorization': 'wrong_token'}
         response = self.client.post(
-            '/user/login/kakao', content_type='application/json', **header)
+            self.KAKAO_URL, content_type='application/json', **header)
 
         self.assertEqual(response.status_code, 400)
-        self.assertEqual(response.json(), {'MESSAGE': 'INVALID_TOKEN'})
+        self.assertEqual(response.json(), {'message': "KEY_ERROR:'kakao_account'"})
 
     def test_post_kakao_login_key_error(self):
         header = {'HTTP_Wrong': 'wrong_token'}
         response = self.client.post(
-            '/user/login/kakao', content_type='application/json', **header)
+            self.KAKAO_URL, content_type='application/json', **header)
 
         self.assertEqual(response.status_code, 400)
-        self.assertEqual(response.json(), {'MESSAGE': 'KEY_ERROR'})
+        self.assertEqual(response.json(), {'message': 'TOKEN_REQUIRED'})
 
     @patch('user.views.requests')
     def test_post_kakao_login_success(self, mocked_request):
@@ -244,14 +273,21 @@ class UserLogInTest(TestCase):
         mocked_request.get = MagicMock(return_value=FakeResponse())
         header = {'HTTP_Authorization': 'fake_token'}
         response = self.client.post(
-            '/user/login/kakao', content_type='application/json', **header)
+            self.KAKAO_URL, content_type='application/json', **header)
 
         self.assertEqual(response.status_code, 200)
         self.assertContains(response, 'token')
+        self.assertEqual(response.json()['profile_image'], 'test_image_url')
+        self.assertEqual(User.objects.get(email='test@email.com').profile_image_url, 'test_image_url')
 
 
 class ProductSearchTest(TestCase):
     def setUp(self):
+        product_search.reset()
+        patcher = patch.object(product_search, 'background', False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
         self.main_categories = MainCategory.objects.create(
             id=1,
             name='크리에이티브'
@@ -282,7 +318,7 @@ class ProductSearchTest(TestCase):
             password='12345678',
             is_creator=False
         )
-        Product.objects.create(
+        self.product = Product.objects.create(
             name='퇴근 후 함께 즐기는 코딩 모임! 직장인을 위한  취미반, 함께해요!',
             thumbnail_image='test_thumbnail_image_url',
             effective_time=timedelta(days=30),
@@ -304,9 +340,9 @@ class ProductSearchTest(TestCase):
         self.maxDiff = None
         response = client.get('/user/search?search=코딩')
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(response.json(),
-                         {
-            'id': 3,
+        self.assertEqual(response.json()['search_result'],
+                         [{
+            'id': self.product.id,
             'title': '퇴근 후 함께 즐기는 코딩 모임! 직장인을 위한  취미반, 함께해요!',
             'thumbnail': 'test_thumbnail_image_url',
             'subCategory': self.sub_categories.name,
@@ -314,9 +350,9 @@ class ProductSearchTest(TestCase):
             'isLiked': False,
             'likeCount': 0,
             'price': 10000,
-            'sale': 0.05,
+            'sale': '0.05',
             'finalPrice': 9500
-        }
+        }]
         )
 
     def test_get_search_fail(self):
@@ -325,12 +361,10 @@ class ProductSearchTest(TestCase):
         response = client.get('/user/search?sch=클래스',
                               content_type='application/json')
 
-        print(response)
-
         self.assertEqual(response.status_code, 400)
         self.assertEqual(response.json(),
                          {
-            'MESSAGE': 'WRONG_KEY'
+            'message': 'WRONG_KEY'
         }
         )
 
@@ -358,3 +392,837 @@ class ProductSearchTest(TestCase):
     #
     #     self.assertEqual(response.status_code, 200)
     #     self.assertContains(response, 'token')
+
+
+class PrincipalView:
+    @login_decorator(login_required=True)
+    def get(self, request):
+        return JsonResponse({'id': request.user.id, 'point': request.user.point}, status=200)
+
+
+class PrincipalCacheTest(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.user = User.objects.create(
+            name='재훈',
+            email='jae@gmail.com',
+            phone_number='01012345678',
+            point=100
+        )
+        self.header = {'HTTP_Authorization': issue_access_token(self.user.id)}
+        principal_cache.clear()
+        principal_cache.reset_stats()
+
+    def tearDown(self):
+        principal_cache.clear()
+        User.objects.all().delete()
+
+    def get_principal_response(self):
+        return PrincipalView().get(self.factory.get('/', **self.header))
+
+    def test_login_decorator_second_request_hits_cache(self):
+        with self.assertNumQueries(1):
+            self.get_principal_response()
+
+        with self.assertNumQueries(0):
+            response = self.get_principal_response()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(principal_cache.stats()['hits'], 1)
+        self.assertEqual(principal_cache.stats()['misses'], 1)
+
+    def test_login_decorator_user_save_invalidates_cache(self):
+        self.get_principal_response()
+
+        self.user.point = 300
+        self.user.save()
+
+        with self.assertNumQueries(1):
+            response = self.get_principal_response()
+
+        self.assertEqual(json.loads(response.content)['point'], 300)
+
+    def test_login_decorator_deleted_user_is_not_served_from_cache(self):
+        self.get_principal_response()
+
+        self.user.delete()
+
+        response = self.get_principal_response()
+        self.assertEqual(response.status_code, 401)
+
+    def test_order_does_not_overwrite_newer_point_with_cached_principal(self):
+        self.get_principal_response()
+
+        # 다른 프로세스가 저장한 변경 (이 프로세스의 principal_cache 는 모름)
+        User.objects.filter(id=self.user.id).update(point=500, name='민구')
+
+        OrderStatus.objects.create(id=7, status='수강신청')
+        payment_method = PaymentMethod.objects.create(name='신용카드')
+        product        = Product.objects.create(
+            name            = '클래스',
+            price           = 10000,
+            sale            = 0,
+            start_date      = date.today(),
+            main_category   = MainCategory.objects.create(name='크리에이티브'),
+            sub_category    = SubCategory.objects.create(name='개발'),
+            difficulty      = Difficulty.objects.create(name='초급자'),
+            creator         = User.objects.create(name='이소헌', is_creator=True)
+        )
+        payload = {
+            'user_name'         : '재훈',
+            'phone_number'      : '01012345678',
+            'post_number'       : '06234',
+            'address'           : '서울시 강남구',
+            'sub_address'       : '테헤란로 427',
+            'request_option'    : None,
+            'coupon_id'         : None,
+            'price'             : 100000,
+            'payment_method_id' : payment_method.id,
+        }
+        request  = self.factory.post('/', json.dumps(payload), content_type='application/json', **self.header)
+        response = OrderProductView().post(request, product.id)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(User.objects.values_list('point', 'name').get(id=self.user.id), (3500, '민구'))
+
+    def test_principal_cache_ttl_expired(self):
+        cache = PrincipalCache(max_size=10, ttl=0)
+        cache.set(1, 'value')
+
+        self.assertIsNone(cache.get(1))
+        self.assertEqual(cache.stats()['misses'], 1)
+
+    def test_principal_cache_evicts_least_recently_used(self):
+        cache = PrincipalCache(max_size=2, ttl=60)
+        cache.set(1, 'first')
+        cache.set(2, 'second')
+        cache.get(1)
+        cache.set(3, 'third')
+
+        self.assertEqual(cache.get(1), 'first')
+        self.assertIsNone(cache.get(2))
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+    def test_principal_cache_skip_store_when_invalidated_during_load(self):
+        cache = PrincipalCache(max_size=10, ttl=60)
+
+        def loader(key):
+            cache.invalidate(key)
+            return 'stale'
+
+        self.assertEqual(cache.get_or_load(1, loader), 'stale')
+        self.assertIsNone(cache.get(1))
+
+
+class ClaimsView:
+    @login_decorator(login_required=True)
+    def get(self, request):
+        return JsonResponse({'id': request.user.id, 'name': request.user.name}, status=200)
+
+    @login_decorator(login_required=True)
+    def post(self, request):
+        return JsonResponse({'email': request.user.email, 'point': request.user.point}, status=200)
+
+
+class ClaimsAccessTokenTest(TestCase):
+    def setUp(self):
+        patcher = patch('core.common_utils.ACCESS_TOKEN_CLAIMS_ENABLED', True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.factory = RequestFactory()
+        self.user = User.objects.create(
+            name='재훈',
+            email='jae@gmail.com',
+            phone_number='01012345678',
+            point=100
+        )
+        self.header = {'HTTP_Authorization': issue_access_token(self.user.id, self.user)}
+        principal_cache.clear()
+
+    def tearDown(self):
+        principal_cache.clear()
+        User.objects.all().delete()
+
+    def test_claims_token_payload_is_versioned(self):
+        payload = jwt.decode(
+            self.header['HTTP_Authorization'], options={'verify_signature': False})
+
+        self.assertEqual(payload['user_id'], self.user.id)
+        self.assertEqual(payload['ver'], 1)
+        self.assertEqual(payload['claims']['name'], self.user.name)
+        self.assertEqual(payload['exp'] - payload['iat'], ACCESS_TOKEN_CLAIMS_TTL)
+
+    def test_expired_claims_token_is_rejected(self):
+        with patch('core.common_utils.time.time', return_value=0):
+            header = {'HTTP_Authorization': issue_access_token(self.user.id, self.user)}
+
+        response = ClaimsView().get(self.factory.get('/', **header))
+
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(json.loads(response.content)['message'], 'TOKEN_EXPIRED')
+
+    def test_deleted_user_claims_token_is_unauthorized(self):
+        self.user.delete()
+
+        response = ClaimsView().post(self.factory.post('/', **self.header))
+
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(json.loads(response.content)['message'], 'INVALID_USER')
+
+    def test_claims_token_authenticates_without_query(self):
+        with self.assertNumQueries(0):
+            response = ClaimsView().get(self.factory.get('/', **self.header))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content)['name'], self.user.name)
+
+    def test_claims_token_loads_other_fields_once(self):
+        with self.assertNumQueries(1):
+            response = ClaimsView().post(self.factory.post('/', **self.header))
+
+        self.assertEqual(
+            json.loads(response.content),
+            {'email': self.user.email, 'point': self.user.point}
+        )
+
+    def test_claims_principal_assignable_to_foreign_key(self):
+        request = self.factory.get('/', **self.header)
+        principal = {}
+
+        class CaptureView:
+            @login_decorator(login_required=True)
+            def get(self, request):
+                principal['user'] = request.user
+
+        CaptureView().get(request)
+
+        community = Community(user=principal['user'], description='test')
+        self.assertEqual(community.user_id, self.user.id)
+
+    def test_claims_principal_save_invalidates_cache(self):
+        principal = {}
+
+        class SaveView:
+            @login_decorator(login_required=True)
+            def post(self, request):
+                request.user.point
+                principal['user'] = request.user
+
+        SaveView().post(self.factory.post('/', **self.header))
+        self.assertIsNotNone(principal_cache.get(self.user.id))
+
+        principal['user'].save()
+
+        self.assertIsNone(principal_cache.get(self.user.id))
+
+    def test_plain_token_falls_back_to_database(self):
+        header = {'HTTP_Authorization': issue_access_token(self.user.id)}
+
+        with self.assertNumQueries(1):
+            response = ClaimsView().get(self.factory.get('/', **header))
+
+        self.assertEqual(response.status_code, 200)
+
+
+class PasswordHashingTest(TestCase):
+    def setUp(self):
+        patcher = patch('core.common_utils.BCRYPT_ROUNDS', 5)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        login_throttle.reset()
+
+        self.client = Client()
+        self.URL = '/user/sign-in'
+        self.PASSWORD = 'password1234'
+        self.user = User.objects.create(
+            name='재훈',
+            email='jae@gmail.com',
+            password=get_hashed_pw(self.PASSWORD, rounds=4)
+        )
+
+    def tearDown(self):
+        User.objects.all().delete()
+
+    def test_sign_in_rehash_when_cost_differs(self):
+        response = self.client.post(
+            self.URL,
+            {'email': self.user.email, 'password': self.PASSWORD},
+            content_type='application/json'
+        )
+        self.user.refresh_from_db()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(get_hash_rounds(self.user.password), 5)
+        self.assertTrue(bcrypt.checkpw(self.PASSWORD.encode(), self.user.password.encode()))
+
+    def test_sign_in_wrong_password(self):
+        response = self.client.post(
+            self.URL,
+            {'email': self.user.email, 'password': 'wrong1234'},
+            content_type='application/json'
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['message'], 'WRONG_PASSWORD')
+
+    def test_sign_in_hashing_pool_saturated(self):
+        with patch('core.common_utils.password_hashing_pool.run', side_effect=HashingQueueFull):
+            response = self.client.post(
+                self.URL,
+                {'email': self.user.email, 'password': self.PASSWORD},
+                content_type='application/json'
+            )
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()['message'], 'SERVICE_UNAVAILABLE')
+
+    def test_sign_in_succeeds_when_rehash_pool_saturated(self):
+        original = self.user.password
+
+        with patch('user.views.get_hashed_pw', side_effect=HashingQueueFull):
+            response = self.client.post(
+                self.URL,
+                {'email': self.user.email, 'password': self.PASSWORD},
+                content_type='application/json'
+            )
+        self.user.refresh_from_db()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.user.password, original)
+
+    def test_hashing_pool_rejects_when_queue_full(self):
+        pool = HashingPool(max_workers=1, max_pending=0, timeout=5)
+        started, release = threading.Event(), threading.Event()
+
+        def blocking_task():
+            started.set()
+            release.wait(5)
+
+        worker = threading.Thread(target=pool.run, args=(blocking_task,))
+        worker.start()
+        started.wait(5)
+
+        with self.assertRaises(HashingQueueFull):
+            pool.run(lambda: None)
+
+        release.set()
+        worker.join()
+
+        self.assertEqual(pool.stats()['rejected'], 1)
+        self.assertIsNone(pool.run(lambda: None))
+
+
+class LoginThrottleTest(TestCase):
+    def setUp(self):
+        login_throttle.reset()
+        self.client = Client()
+        self.URL = '/user/sign-in'
+        self.request = {'email': 'attacker@gmail.com', 'password': 'password1234'}
+
+    def tearDown(self):
+        login_throttle.reset()
+
+    def test_token_bucket_refills_over_time(self):
+        limiter = TokenBucketLimiter('test', capacity=2, refill_rate=1)
+
+        self.assertTrue(limiter.consume('key', now=0))
+        self.assertTrue(limiter.consume('key', now=0))
+        self.assertFalse(limiter.consume('key', now=0.5))
+        self.assertTrue(limiter.consume('key', now=1.5))
+        self.assertEqual(limiter.stats()['rejected'], 1)
+
+    def test_token_bucket_keys_are_independent(self):
+        limiter = TokenBucketLimiter('test', capacity=1, refill_rate=0)
+
+        self.assertTrue(limiter.consume('first', now=0))
+        self.assertTrue(limiter.consume('second', now=0))
+        self.assertFalse(limiter.consume('first', now=0))
+
+    def test_sign_in_rejected_before_database_access(self):
+        for _ in range(login_throttle.email_limiter.capacity):
+            self.client.post(self.URL, self.request, content_type='application/json')
+
+        with self.assertNumQueries(0):
+            response = self.client.post(self.URL, self.request, content_type='application/json')
+
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.json()['message'], 'TOO_MANY_REQUESTS')
+        self.assertEqual(login_throttle.stats()['email']['rejected'], 1)
+
+    def test_successful_sign_in_resets_email_bucket(self):
+        User.objects.create(name='김민구', email=self.request['email'], password=get_hashed_pw('password1234', rounds=4))
+        wrong = dict(self.request, password='wrongpassword1')
+
+        for _ in range(login_throttle.email_limiter.capacity - 1):
+            self.assertEqual(self.client.post(self.URL, wrong, content_type='application/json').status_code, 400)
+
+        for _ in range(login_throttle.email_limiter.capacity + 1):
+            response = self.client.post(self.URL, self.request, content_type='application/json')
+            self.assertEqual(response.status_code, 200)
+
+        for _ in range(login_throttle.email_limiter.capacity - 1):
+            self.assertEqual(self.client.post(self.URL, wrong, content_type='application/json').status_code, 400)
+
+        self.assertEqual(login_throttle.stats()['email']['rejected'], 0)
+
+    def test_concurrent_attempts_reserve_email_tokens(self):
+        # 실패가 기록되기 전에 동시에 들어온 요청도 각각 토큰을 사용한다
+        allowed = [
+            login_throttle.allow(self.request['email'], f'10.0.0.{index}')
+            for index in range(login_throttle.email_limiter.capacity + 1)
+        ]
+
+        self.assertEqual(allowed, [True] * login_throttle.email_limiter.capacity + [False])
+
+    def test_sign_in_aborted_before_password_check_releases_email_token(self):
+        User.objects.create(name='김민구', email=self.request['email'], password=get_hashed_pw('password1234', rounds=4))
+
+        with patch('user.views.check_password', side_effect=HashingQueueFull):
+            for _ in range(login_throttle.email_limiter.capacity + 1):
+                response = self.client.post(self.URL, self.request, content_type='application/json')
+                self.assertEqual(response.status_code, 503)
+
+        self.assertEqual(self.client.post(self.URL, self.request, content_type='application/json').status_code, 200)
+
+    def test_shared_token_bucket_uses_sliding_window(self):
+        caches['default'].clear()
+        limiter = TokenBucketLimiter('shared-test', capacity=2, refill_rate=1, cache_alias='default')
+
+        self.assertTrue(limiter.consume('key', now=0))
+        self.assertTrue(limiter.consume('key', now=1))
+        self.assertFalse(limiter.consume('key', now=1.5))
+        limiter.refund('key', now=1.5)
+        self.assertTrue(limiter.consume('key', now=1.5))
+        # 다음 구간(2~4초): 이전 구간 사용 수 2 중 지난 비율만큼 충전
+        self.assertFalse(limiter.consume('key', now=2.5))
+        self.assertTrue(limiter.consume('key', now=3.5))
+        self.assertEqual(limiter.stats()['rejected'], 2)
+
+        limiter.clear('key', now=3.5)
+        self.assertTrue(limiter.consume('key', now=3.5))
+        self.assertTrue(limiter.consume('key', now=3.5))
+
+    def test_shared_token_bucket_does_not_lock_around_cache(self):
+        caches['default'].clear()
+        limiter = TokenBucketLimiter('shared-test', capacity=2, refill_rate=1, cache_alias='default')
+        incr    = caches['default'].incr
+
+        def assert_unlocked_incr(*args, **kwargs):
+            self.assertFalse(limiter._lock.locked())
+            return incr(*args, **kwargs)
+
+        with patch.object(caches['default'], 'incr', side_effect=assert_unlocked_incr) as mocked:
+            self.assertTrue(limiter.consume('key', now=0))
+
+        mocked.assert_called_once()
+
+
+class RecentlyViewBufferTest(TestCase):
+    def setUp(self):
+        patcher = patch.object(recently_view_buffer, 'interval', None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(recently_view_buffer.clear)
+        recently_view_buffer.clear()
+
+        self.client = Client()
+        self.user = User.objects.create(name='김민구', email='test@gmail.com')
+        self.header = {'HTTP_Authorization': issue_access_token(self.user.id)}
+        self.products = [
+            Product.objects.create(
+                name            = f'클래스{i}',
+                price           = 10000,
+                sale            = 0,
+                start_date      = date.today(),
+                thumbnail_image = 'thumbnail_image',
+                sub_category    = SubCategory.objects.create(name='드로잉'),
+                difficulty      = Difficulty.objects.create(name='입문자'),
+                creator         = self.user
+            ) for i in range(5)
+        ]
+
+    def recent_product_ids(self):
+        return [recent.product_id for recent in get_recently_viewed(self.user.id)]
+
+    def test_detail_view_does_not_write(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f'/products/{self.products[0].id}', **self.header)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(any('recently_views' in query['sql'] for query in queries.captured_queries))
+        self.assertEqual(recently_view_buffer.stats()['pending'], 1)
+
+        recently_view_buffer.flush()
+
+        self.assertEqual(self.recent_product_ids(), [self.products[0].id])
+
+    def test_flush_deduplicates_and_moves_reviews_to_front(self):
+        first, second, third = (product.id for product in self.products[:3])
+        RecentlyView.objects.create(user=self.user, product_id=first, viewed_at=datetime(2021, 1, 1))
+        RecentlyView.objects.create(user=self.user, product_id=second, viewed_at=datetime(2021, 1, 2))
+
+        for product_id in (third, first, third, first):
+            record_recently_viewed(self.user.id, product_id)
+
+        self.assertEqual(recently_view_buffer.stats()['pending'], 2)
+
+        recently_view_buffer.flush()
+
+        self.assertEqual(self.recent_product_ids(), [first, third, second])
+
+    def test_flush_caps_history_per_user(self):
+        for product in self.products:
+            record_recently_viewed(self.user.id, product.id)
+
+        with patch('user.recently_views.prune_recently_views.__defaults__', (3,)):
+            recently_view_buffer.flush()
+
+        self.assertEqual(self.recent_product_ids(), [product.id for product in self.products[:1:-1]])
+
+    def test_buffer_flushes_at_max_size(self):
+        with patch.object(recently_view_buffer, 'max_size', 2):
+            record_recently_viewed(self.user.id, self.products[0].id)
+            self.assertEqual(RecentlyView.objects.count(), 0)
+
+            record_recently_viewed(self.user.id, self.products[1].id)
+
+        self.assertEqual(RecentlyView.objects.count(), 2)
+        self.assertEqual(recently_view_buffer.stats()['pending'], 0)
+
+    def test_review_updates_existing_row(self):
+        recent = RecentlyView.objects.create(
+            user=self.user, product=self.products[0], viewed_at=datetime(2021, 1, 1)
+        )
+
+        record_recently_viewed(self.user.id, self.products[0].id)
+        recently_view_buffer.flush()
+
+        recent.refresh_from_db()
+        self.assertEqual(RecentlyView.objects.count(), 1)
+        self.assertGreater(recent.viewed_at, datetime(2021, 1, 1))
+
+    def test_my_page_reads_recent_views_most_recent_first(self):
+        for day, product in enumerate(self.products, 1):
+            RecentlyView.objects.create(user=self.user, product=product, viewed_at=datetime(2021, 1, day))
+
+        ProductLike.objects.create(user=self.user, product=self.products[-1])
+        increase_like_count(Product, self.products[-1].id, 1)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/user/my-page', **self.header)
+
+        recent_views = response.json()['RECENT_VIEW']
+        recent_queries = [query for query in queries.captured_queries if 'recently_views' in query['sql']]
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [recent['classId'] for recent in recent_views],
+            [product.id for product in reversed(self.products)]
+        )
+        self.assertEqual(
+            [recent['isLiked'] for recent in recent_views],
+            [True, False, False, False, False]
+        )
+        self.assertEqual(recent_views[0]['likeCount'], 1)
+        self.assertEqual(len(recent_queries), 1)
+
+
+class LikedProductsTest(TestCase):
+    def setUp(self):
+        caches[LIKED_PRODUCTS_CACHE_ALIAS].clear()
+        product_search.reset()
+        patcher = patch.object(product_search, 'background', False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.client = Client()
+        self.user = User.objects.create(name='김민구', email='test@gmail.com')
+        self.other = User.objects.create(name='김민지', email='other@gmail.com')
+        self.header = {'HTTP_Authorization': issue_access_token(self.user.id)}
+        self.products = [
+            Product.objects.create(
+                name            = f'코딩 클래스{i}',
+                price           = 10000,
+                sale            = 0,
+                start_date      = date.today(),
+                thumbnail_image = 'thumbnail_image',
+                sub_category    = SubCategory.objects.create(name='드로잉'),
+                difficulty      = Difficulty.objects.create(name='입문자'),
+                creator         = self.user
+            ) for i in range(4)
+        ]
+        ProductLike.objects.create(user=self.user, product=self.products[1])
+        ProductLike.objects.create(user=self.other, product=self.products[2])
+
+    def liked_flags(self, response, key):
+        return {product['id']: product['isLiked'] for product in response.json()[key]}
+
+    def test_liked_product_ids(self):
+        liked = LikedProductIds([30, 5, 12, 5])
+
+        self.assertEqual(list(liked), [5, 12, 30])
+        self.assertIn(12, liked)
+        self.assertNotIn(13, liked)
+        self.assertEqual(list(LikedProductIds.frombytes(liked.tobytes())), [5, 12, 30])
+
+    def test_liked_set_is_cached_until_toggle(self):
+        self.assertEqual(list(get_liked_product_ids(self.user.id)), [self.products[1].id])
+
+        with self.assertNumQueries(0):
+            get_liked_product_ids(self.user.id)
+
+        self.client.post(
+            '/products/like',
+            json.dumps({'product_id': self.products[3].id}),
+            content_type='application/json',
+            **self.header
+        )
+
+        self.assertEqual(
+            list(get_liked_product_ids(self.user.id)),
+            [self.products[1].id, self.products[3].id]
+        )
+
+    def test_evicted_version_does_not_revive_old_liked_set(self):
+        get_liked_product_ids(self.user.id)
+        caches[LIKED_PRODUCTS_CACHE_ALIAS].delete(f'liked-products-version:{self.user.id}')
+
+        self.client.post(
+            '/products/like',
+            json.dumps({'product_id': self.products[1].id}),
+            content_type='application/json',
+            **self.header
+        )
+
+        self.assertEqual(list(get_liked_product_ids(self.user.id)), [])
+
+    def test_search_marks_only_own_likes_without_per_product_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/user/search', {'search': '코딩'}, **self.header)
+
+        like_queries = [query for query in queries.captured_queries if 'product_likes' in query['sql']]
+
+        self.assertEqual(
+            self.liked_flags(response, 'search_result'),
+            {product.id: product == self.products[1] for product in self.products}
+        )
+        self.assertEqual(len(like_queries), 1)
+
+    def test_main_page_marks_likes_per_user(self):
+        anonymous = self.client.get('/products/main')
+        user      = self.client.get('/products/main', **self.header)
+
+        self.assertFalse(any(self.liked_flags(anonymous, 'RESULT').values()))
+        self.assertEqual(
+            self.liked_flags(user, 'RESULT'),
+            {product.id: product == self.products[1] for product in self.products}
+        )
+
+
+class SearchIndexTest(TestCase):
+    def setUp(self):
+        product_search.reset()
+        patcher = patch.object(product_search, 'background', False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.client = Client()
+        self.creator = User.objects.create(name='이소헌', nick_name='소헌')
+        self.sub_category = SubCategory.objects.create(name='개발')
+        self.product = self.create_product('퇴근 후 코딩 모임', like_count=3)
+        self.create_product('드로잉 기초')
+
+    def create_product(self, name, like_count=0):
+        return Product.objects.create(
+            name            = name,
+            price           = 10000,
+            sale            = 0,
+            start_date      = date.today(),
+            thumbnail_image = 'thumbnail_image',
+            sub_category    = self.sub_category,
+            creator         = self.creator,
+            like_count      = like_count
+        )
+
+    def search(self, **params):
+        response = self.client.get('/user/search', params)
+
+        if response.status_code != 200:
+            return response.json()['message']
+
+        return [product['title'] for product in response.json()['search_result']]
+
+    def test_search_uses_index(self):
+        self.assertEqual(self.search(search='코딩'), ['퇴근 후 코딩 모임'])
+        self.assertEqual(self.search(search='개발'), ['드로잉 기초', '퇴근 후 코딩 모임'])
+        self.assertEqual(self.search(search='개발', sorting='relevance'), ['퇴근 후 코딩 모임', '드로잉 기초'])
+        self.assertEqual(self.search(search='개발', sub_category='없는 분류'), 'NO_RESULT')
+        self.assertEqual(self.search(sch='코딩'), 'WRONG_KEY')
+        self.assertEqual(product_search.stats()['products'], 2)
+
+        # 변경 로그 확인 1 + 서브 카테고리 id 0 + 상품 1 + liked set 0 (익명)
+        with self.assertNumQueries(1):
+            self.search(search='코딩모임')
+
+    def test_search_pages_through_every_match(self):
+        self.create_product('코딩 입문')
+        self.create_product('코딩 실전')
+
+        response = self.client.get('/user/search', {'search': '코딩', 'limit': 2}).json()
+
+        self.assertEqual([product['title'] for product in response['search_result']], ['코딩 실전', '코딩 입문'])
+        self.assertEqual((response['total_count'], response['next_offset']), (3, 2))
+
+        response = self.client.get('/user/search', {'search': '코딩', 'limit': 2, 'offset': 2}).json()
+
+        self.assertEqual([product['title'] for product in response['search_result']], ['퇴근 후 코딩 모임'])
+        self.assertEqual((response['total_count'], response['next_offset']), (3, None))
+
+    def test_views_sorting_ranks_every_match(self):
+        viewed = self.create_product('코딩 입문')
+        users  = [User.objects.create(name=f'유저{i}', email=f'user{i}@gmail.com') for i in range(2)]
+
+        for user in users:
+            RecentlyView.objects.create(user=user, product=viewed)
+
+        RecentlyView.objects.create(user=users[0], product=self.product)
+
+        # 관련도 상위 1개(좋아요 수가 많은 상품)가 아니라 전체 결과에서 조회 수 순으로 고른다
+        self.assertEqual(self.search(search='코딩', sorting='relevance', limit=1), ['퇴근 후 코딩 모임'])
+        self.assertEqual(self.search(search='코딩', sorting='views', limit=1), ['코딩 입문'])
+
+        with patch.object(product_search, 'rebuild'):
+            product_search.reset()
+            self.assertEqual(self.search(search='코딩', sorting='views', limit=1), ['코딩 입문'])
+
+    def test_saves_are_applied_incrementally(self):
+        self.search(search='코딩')
+
+        self.create_product('코딩 입문', like_count=10)
+        self.product.name = '퇴근 후 파이썬 모임'
+        self.product.save()
+
+        self.assertEqual(self.search(search='코딩'), ['코딩 입문'])
+        self.assertEqual(self.search(search='파이썬'), ['퇴근 후 파이썬 모임'])
+
+        self.product.delete()
+
+        self.assertEqual(self.search(search='파이썬'), 'NO_RESULT')
+        self.assertEqual(product_search.stats()['rebuilds'], 1)
+
+    def test_search_does_not_sync_on_request_thread(self):
+        self.search(search='코딩')
+        self.create_product('코딩 입문')
+
+        with patch.object(product_search, 'background', True), \
+                patch.object(product_search, 'sync') as sync, \
+                patch('product.search.threading.Thread') as thread:
+            self.search(search='코딩')
+
+        sync.assert_not_called()
+        thread.assert_called_once()
+
+    def test_kit_changes_are_indexed(self):
+        self.search(search='코딩')
+        kit = Kit.objects.create(name='아두이노 키트', main_image_url='image_url', price=1000, description='')
+        self.product.kit.add(kit)
+
+        self.assertEqual(self.search(search='아두이노'), ['퇴근 후 코딩 모임'])
+
+        kit.name = '라즈베리 키트'
+        kit.save()
+
+        self.assertEqual(self.search(search='라즈베리'), ['퇴근 후 코딩 모임'])
+        self.assertEqual(self.search(search='아두이노'), 'NO_RESULT')
+
+    def test_database_fallback_until_index_is_ready(self):
+        with patch.object(product_search, 'rebuild') as rebuild:
+            self.assertEqual(self.search(search='코딩'), ['퇴근 후 코딩 모임'])
+
+        rebuild.assert_called_once()
+        self.assertFalse(product_search.stats()['ready'])
+
+    def test_lost_change_log_rebuilds(self):
+        self.search(search='코딩')
+        caches['default'].delete(search_changes.seq_key())
+        search_changes.record(self.product.id)
+
+        self.assertEqual(self.search(search='코딩'), ['퇴근 후 코딩 모임'])
+        self.assertEqual(product_search.stats()['rebuilds'], 2)
+
+    def test_suggest_is_served_from_memory(self):
+        self.client.get('/user/search/suggest', {'search': '코'})
+
+        with self.assertNumQueries(0):
+            response = self.client.get('/user/search/suggest', {'search': 'ㅋㄷ'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['suggestions'], [{'type': 'product', 'text': '퇴근 후 코딩 모임'}])
+
+    def test_suggest_reflects_saves(self):
+        self.assertEqual(self.suggest(search='드'), ['드로잉 기초'])
+
+        self.create_product('드론 촬영', like_count=10)
+
+        self.assertEqual(self.suggest(search='드'), ['드론 촬영', '드로잉 기초'])
+        self.assertEqual(self.suggest(search='드', limit=1), ['드론 촬영'])
+        self.assertEqual(self.suggest(search='이소'), ['이소헌'])
+
+    def test_suggest_errors(self):
+        self.assertEqual(self.client.get('/user/search/suggest').json()['message'], 'WRONG_KEY')
+        self.assertEqual(
+            self.client.get('/user/search/suggest', {'search': '코', 'limit': 'a'}).json()['message'],
+            'VALUE_ERROR'
+        )
+
+    def suggest(self, **params):
+        return [suggestion['text'] for suggestion in self.client.get('/user/search/suggest', params).json()['suggestions']]
+
+    def test_typo_falls_back_to_corrected_query(self):
+        response = self.client.get('/user/search', {'search': '코팅 모임'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['did_you_mean'], '코딩 모임')
+        self.assertEqual([product['title'] for product in response.json()['search_result']], ['퇴근 후 코딩 모임'])
+        self.assertNotIn('did_you_mean', self.client.get('/user/search', {'search': '코딩'}).json())
+        self.assertEqual(self.search(search='전혀다른말'), 'NO_RESULT')
+
+    def test_facets(self):
+        main_category = MainCategory.objects.create(name='크리에이티브')
+        difficulty    = Difficulty.objects.create(name='입문자')
+        other         = SubCategory.objects.create(name='미술')
+        kit           = Kit.objects.create(name='키트', main_image_url='image_url', price=1000, description='')
+
+        Product.objects.filter(id=self.product.id).update(main_category=main_category, difficulty=difficulty)
+        self.product.kit.add(kit)
+        Product.objects.create(
+            name            = '코딩 드로잉',
+            price           = 200000,
+            sale            = 0.5,
+            start_date      = date.today(),
+            thumbnail_image = 'thumbnail_image',
+            sub_category    = other,
+            creator         = self.creator
+        )
+
+        facets = self.client.get('/user/search', {'search': '코딩'}).json()['facets']
+
+        self.assertEqual(facets['subCategory'], [
+            {'id': self.sub_category.id, 'name': '개발', 'count': 1},
+            {'id': other.id, 'name': '미술', 'count': 1}
+        ])
+        self.assertEqual(facets['mainCategory'], [{'id': main_category.id, 'name': '크리에이티브', 'count': 1}])
+        self.assertEqual(facets['difficulty'], [{'id': difficulty.id, 'name': '입문자', 'count': 1}])
+        self.assertEqual(facets['price'], [
+            {'min': 0, 'max': 50000, 'count': 1},
+            {'min': 100000, 'max': 200000, 'count': 1}
+        ])
+        self.assertEqual(facets['hasKit'], [{'value': True, 'count': 1}, {'value': False, 'count': 1}])
+
+        filtered = self.client.get('/user/search', {'search': '코딩', 'sub_category': '미술'}).json()
+
+        self.assertEqual([product['title'] for product in filtered['search_result']], ['코딩 드로잉'])
+        self.assertEqual(len(filtered['facets']['subCategory']), 2)
+        self.assertEqual(filtered['facets']['hasKit'], [{'value': False, 'count': 1}])
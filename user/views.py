@@ -2,7 +2,7 @@ import json
 import requests
 from datetime            import datetime, timedelta
 
-from django.db.models    import Count, Q
+from django.db           import IntegrityError
 from django.views        import View
 from django.http         import JsonResponse
 
@@ -10,10 +10,11 @@ from core.common_utils   import (
     CommonUtil,
     CommonConstant,
     login_decorator,
-    query_debugger,
     get_hashed_pw,
     check_password,
-    issue_access_token
+    password_needs_rehash,
+    issue_access_token,
+    login_throttle
 )
 from core.exception      import (
     NotValidEmail,
@@ -22,12 +23,24 @@ from core.exception      import (
     DuplicatedUser,
     BlankField,
     NotExistUser,
-    WrongPassword
+    WrongPassword,
+    HashingQueueFull,
+    TooManyLoginAttempts
+)
+from core.throttle       import get_client_ip
+from core.pagination     import parse_limit
+from user.recently_views import get_recently_viewed
+from user.liked_products import get_request_liked_product_ids, invalidate_liked_products
+from product.like_counts import toggle_like
+from product.search      import search_products, search_suggestions, did_you_mean
+from clnass_101.settings import (
+    S3_BUCKET_URL,
+    LOGIN_THROTTLE_TRUST_FORWARDED,
+    SEARCH_SUGGEST_LIMIT,
+    SEARCH_RESULT_LIMIT
 )
-from clnass_101.settings import S3_BUCKET_URL
 from user.models         import (
     User,
-    ProductLike,
     RecentlyView,
     UserProduct
 )
@@ -49,7 +62,6 @@ class SignUpView(View):
         History :
             2021-01-19 - 리펙토링 (심원두)
     """
-    @query_debugger
     def post(self, request):
         """ 회원 가입
             
@@ -68,9 +80,11 @@ class SignUpView(View):
                 {"message": "INVALID_EMAIL_FORMAT"},    status=400 - 잘못된 이메일 형식
                 {"message": "INVALID_PASSWORD_FORMAT"}, status=400 - 잘못된 비밀번호 형식
                 {"message": "DUPLICATED_USER"},         status=400 - 중복된 유저 정보
+                {"message": "SERVICE_UNAVAILABLE"},     status=503 - 비밀번호 해싱 풀 포화
                 
             History :
                 2021-01-19 - 리펙토링 완료 (심원두)
+                2026-10-18 - 비밀번호 해싱 워커 풀 적용
         """
         try:
             payload   = json.loads(request.body)
@@ -119,6 +133,9 @@ class SignUpView(View):
         
         except DuplicatedUser as e:
             return JsonResponse({"message": f"{e}"}, status=400)
+        
+        except HashingQueueFull as e:
+            return JsonResponse({"message": f"{e}"}, status=503)
 
 
 class SignInView(View):
@@ -129,7 +146,6 @@ class SignInView(View):
         History :
             2021-01-19 - 리텍토링 (심원두)
     """
-    @query_debugger
     def post(self, request):
         """ 로그인
             
@@ -145,9 +161,14 @@ class SignInView(View):
                 {"message": "INPUT_REQUIRED"},          status=400 - 필수 입력 값 없음
                 {"message": "NOT_EXIST_USER"},          status=400 - 존재하지 않는 유저
                 {"message": "WRONG_PASSWORD"},          status=400 - 패스워드 불일치
+                {"message": "TOO_MANY_REQUESTS"},       status=429 - 로그인 시도 횟수 초과
+                {"message": "SERVICE_UNAVAILABLE"},     status=503 - 비밀번호 해싱 풀 포화
             
             History :
                 2021-01-19 - 리펙토링 진행 중 (심원두)
+                2026-10-18 - 비밀번호 해싱 워커 풀 적용, cost 변경 시 로그인 중 재해싱
+                2026-10-18 - DB/bcrypt 작업 전 IP, 이메일 단위 로그인 시도 제한
+                2026-10-18 - 이메일 단위 제한은 요청 시작 시 예약, 로그인 성공 시 초기화
         """
         try:
             payload  = json.loads(request.body)
@@ -161,15 +182,40 @@ class SignInView(View):
             if not CommonUtil.is_email_valid(email):
                 raise NotValidEmail
             
+            if not login_throttle.allow(
+                email, get_client_ip(request, LOGIN_THROTTLE_TRUST_FORWARDED)
+            ):
+                raise TooManyLoginAttempts
+            
+            # 이메일 버킷 토큰은 allow 에서 예약되었고 실패하면 그대로 사용된다
             if not User.objects.filter(email=email, is_deleted=0).exists():
                 raise NotExistUser
             
             user = User.objects.get(email=email, is_deleted=0)
             
-            if not check_password(password, user.password):
-                return WrongPassword
+            try:
+                is_valid_password = check_password(password, user.password)
+            
+            except HashingQueueFull:
+                # 비밀번호를 확인하지 못했으므로 시도 횟수에 포함하지 않는다
+                login_throttle.release(email)
+                raise
+            
+            if not is_valid_password:
+                raise WrongPassword
             
-            access_token = issue_access_token(user.id)
+            login_throttle.record_success(email)
+            
+            if password_needs_rehash(user.password):
+                try:
+                    user.password = get_hashed_pw(password)
+                    user.save(update_fields=['password'])
+                
+                except HashingQueueFull:
+                    # 재해싱은 다음 로그인으로 미루고, 확인된 로그인은 그대로 성공시킨다
+                    pass
+            
+            access_token = issue_access_token(user.id, user)
             return JsonResponse(
                 {
                     "message": "SIGN_IN_SUCCESS",
@@ -193,6 +239,15 @@ class SignInView(View):
         except NotExistUser as e:
             return JsonResponse({"message": f"{e}"}, status=400)
         
+        except WrongPassword as e:
+            return JsonResponse({"message": f"{e}"}, status=400)
+        
+        except TooManyLoginAttempts as e:
+            return JsonResponse({"message": f"{e}"}, status=429)
+        
+        except HashingQueueFull as e:
+            return JsonResponse({"message": f"{e}"}, status=503)
+        
         except json.JSONDecodeError as e:
             return JsonResponse({"message": f"{e}"}, status=400)
 
@@ -213,10 +268,10 @@ class SocialSignInKaKaoView(View):
             kakao_user = User.objects.get_or_create(
                 name=response["properties"]["nickname"],
                 email=response["kakao_account"]["email"],
-                profile_image=response["properties"]["profile_image"],
+                profile_image_url=response["properties"]["profile_image"],
             )[0]
-            token = issue_access_token(kakao_user.id)
-            return JsonResponse({"token": token, "name": kakao_user.name, 'profile_image': kakao_user.profile_image},
+            token = issue_access_token(kakao_user.id, kakao_user)
+            return JsonResponse({"token": token, "name": kakao_user.name, 'profile_image': kakao_user.profile_image_url},
                                 status=200)
         except json.JSONDecodeError as e:
             return JsonResponse({"message": f"JSON_ERROR:{e}"}, status=400)
@@ -229,52 +284,45 @@ class SocialSignInKaKaoView(View):
 
 
 class SearchView(View):
+    @login_decorator(login_required=False)
     def get(self, request):
+        """ 상품 검색
+            
+            GET /user/search?search=<검색어>&sorting=updated|relevance|popular|views&sub_category=<이름>&offset=0&limit=100
+            
+            sorting 기본값은 생성 시각 최신순(updated)이다.
+            total_count 는 검색 결과 전체 상품 수, next_offset 은 다음 페이지 offset (마지막 페이지면 None) 이다.
+        """
         try:
             search = request.GET.get('search')
-            sorting = request.GET.get('sorting')
+            sorting = request.GET.get('sorting') or 'updated'
             sub_category_id = request.GET.get('sub_category')
+            offset = max(int(request.GET.get('offset', 0)), 0)
+            limit = parse_limit(request.GET.get('limit'), SEARCH_RESULT_LIMIT, SEARCH_RESULT_LIMIT)
             
-            products = Product.objects.select_related(
-                'main_category',
-                'sub_category',
-                'creator'
-            ).prefetch_related(
-                'kit',
-                'detail_category',
-                'product_like_user',
-                'product_view_user'
-            )
-            
-            filters = {}
-            
-            if sub_category_id:
-                filters['sub_category__name'] = sub_category_id
+            if not search:
+                return JsonResponse({'message': 'WRONG_KEY'}, status=400)
             
-            q = Q()
+            # 검색어에 맞는 한 페이지 상품 id, 전체 결과 수, 결과 전체의 facet 별 상품 수 (메모리 역색인, product/search.py)
+            product_ids, total_count, facets = search_products(search, sorting, sub_category_id, limit, offset)
+            correction                       = None
             
-            sortings = {
-                None     : '-created_at',
-                'updated': '-created_at',
-                'views'  : products.annotate(viewcount=Count('product_view_user')).order_by('-viewcount'),
-                'popular': products.annotate(count=Count('product_like_user')).order_by('-count')
-            }
-            if sorting:
-                if sorting == 'updated':
-                    products = products.order_by(sortings[sorting])
-                else:
-                    products = sortings[sorting]
-            
-            if search:
-                q &= Q(name__icontains=search) | \
-                     Q(main_category__name__icontains=search) | \
-                     Q(sub_category__name__icontains=search) | \
-                     Q(creator__name__icontains=search) | \
-                     Q(kit__name__icontains=search) | \
-                     Q(detail_category__name__icontains=search)
+            if not total_count:
+                # 결과가 없으면 오타를 교정한 검색어로 다시 검색 (product/fuzzy_index.py)
+                correction = did_you_mean(search)
+                
+                if correction:
+                    product_ids, total_count, facets = search_products(
+                        correction, sorting, sub_category_id, limit, offset
+                    )
+            
+            ranks    = {product_id: rank for rank, product_id in enumerate(product_ids)}
+            products = sorted(
+                Product.objects.select_related('sub_category', 'creator').filter(id__in=product_ids),
+                key=lambda product: ranks[product.id]
+            )
             
-            if not search:
-                return JsonResponse({'message': 'WRONG_KEY'}, status=400)
+            liked_product_ids = get_request_liked_product_ids(request)
             
             search_list = [{
                 'id'         : product.id,
@@ -282,37 +330,68 @@ class SearchView(View):
                 'thumbnail'  : product.thumbnail_image,
                 'subCategory': product.sub_category.name,
                 'creator'    : product.creator.name,
-                'isLiked'    : True if ProductLike.objects.filter(product_id=product.id).exists() else False,
-                'likeCount'  : product.creator.product_like.all().count(),
+                'isLiked'    : product.id in liked_product_ids,
+                'likeCount'  : product.like_count,
                 'price'      : int(product.price),
                 'sale'       : product.sale,
                 'finalPrice' : round(int(product.price * (1 - product.sale)), 2)
-            } for product in products.filter(q, **filters)]
+            } for product in products]
             
-            if not search_list:
+            if not total_count:
                 return JsonResponse({'message': 'NO_RESULT'}, status=400)
-            return JsonResponse({'search_result': search_list}, status=200)
+            
+            result = {
+                'search_result': search_list,
+                'total_count'  : total_count,
+                'next_offset'  : offset + limit if offset + limit < total_count else None,
+            }
+            
+            if correction:
+                result['did_you_mean'] = correction
+            
+            if facets is not None:
+                result['facets'] = facets
+            return JsonResponse(result, status=200)
         except KeyError as e:
             return JsonResponse({'message': f'KEY_ERROR:{e}'}, status=400)
         except TypeError:
             return JsonResponse({'message': 'TYPE_ERROR'}, status=400)
+        except ValueError:
+            return JsonResponse({'message': 'VALUE_ERROR'}, status=400)
         except json.JSONDecodeError as e:
             return JsonResponse({'message': f'JSON_DECODE_ERROR:{e}'}, status=400)
 
+class SearchSuggestView(View):
+    def get(self, request):
+        try:
+            search = request.GET.get('search')
+            limit = int(request.GET.get('limit', SEARCH_SUGGEST_LIMIT))
+            
+            if not search:
+                return JsonResponse({'message': 'WRONG_KEY'}, status=400)
+            
+            # 메모리 자동완성 색인만 사용 (DB 조회 없음, product/suggest_index.py)
+            suggestions = [{
+                'type': kind,
+                'text': text
+            } for kind, text in search_suggestions(search, max(limit, 0))]
+            
+            return JsonResponse({'suggestions': suggestions}, status=200)
+        except ValueError:
+            return JsonResponse({'message': 'VALUE_ERROR'}, status=400)
+
 class MyPageView(View):
     @login_decorator(login_required=True)
     def get(self, request):
         try:
             user = request.user
-            user_object = User.objects.prefetch_related('coupon', 'recently_view__product_like_user',
-                                                        'product_like__product_like_user', 'user_product',
-                                                        'recently_view__sub_category', 'recently_view__creator',
+            user_object = User.objects.prefetch_related('coupon', 'user_product',
                                                         'product_like__sub_category', 'product_like__creator').get(
                 id=user.id)
             user_profile = {
                 'id'          : user_object.id,
                 'name'        : user_object.name,
-                'profileImage': user_object.profile_image,
+                'profileImage': user_object.profile_image_url,
                 'email'       : user_object.email,
                 'point'       : user_object.point,
                 'couponNum'   : user_object.coupon.count(),
@@ -323,8 +402,9 @@ class MyPageView(View):
                 'creator').filter(creator=user.id)
             #     created_product_list = user_object.filter(creator_id=user.id)
             own_product_list = user_object.user_product.all()
-            recently_viewed_list = user_object.recently_view.all()
+            recently_viewed_list = get_recently_viewed(user.id)
             like_product_list = user_object.product_like.all()
+            liked_product_ids = {like_product.id for like_product in like_product_list}
             created_list = [{
                 'classId'   : created.id,
                 'title'     : created.name,
@@ -342,16 +422,17 @@ class MyPageView(View):
                      datetime.today() + timedelta(days=1)).days) + '일 남음',
             } for own_product in own_product_list]
             viewed_list = [{
-                'classId'    : recent.id,
-                'title'      : recent.name,
-                'thumbnail'  : recent.thumbnail_image,
-                'subCategory': recent.sub_category.name,
-                'creator'    : recent.creator.name,
-                'isLiked'    : True if recent.filter(product_id=user.recently_view.product.id).exists() else False,
-                'likeCount'  : recent.product_like_user.all().count(),
-                'price'      : recent.price,
-                'sale'       : int((recent.sale) * 100),
-                'finalPrice' : round(int(recent.price * (1 - recent.sale)), 2),
+                'classId'    : recent.product.id,
+                'title'      : recent.product.name,
+                'thumbnail'  : recent.product.thumbnail_image,
+                'subCategory': recent.product.sub_category.name,
+                'creator'    : recent.product.creator.name,
+                'isLiked'    : recent.product_id in liked_product_ids,
+                'likeCount'  : recent.product.like_count,
+                'price'      : recent.product.price,
+                'sale'       : int((recent.product.sale) * 100),
+                'finalPrice' : round(int(recent.product.price * (1 - recent.product.sale)), 2),
+                'viewedAt'   : recent.viewed_at,
             } for recent in recently_viewed_list]
             liked_list = [{
                 'classId'    : like_product.id,
@@ -360,7 +441,7 @@ class MyPageView(View):
                 'subCategory': like_product.sub_category.name,
                 'creator'    : like_product.creator.name,
                 'isLiked'    : True if like_product else False,
-                'likeCount'  : like_product.product_like_user.all().count(),
+                'likeCount'  : like_product.like_count,
                 'price'      : like_product.price,
                 'sale'       : int((like_product.sale) * 100),
                 'finalPrice' : round(int(like_product.price * (1 - like_product.sale)), 2),
@@ -445,8 +526,7 @@ class CommunityView(View):
     def get(self, request, id):
         try:
             community = Community.objects.select_related('user', 'product', 'product__sub_category',
-                                                         'product__creator').prefetch_related(
-                'user__community_like', 'user__community_like').get(pk=id)
+                                                         'product__creator').get(pk=id)
             comments = community.communitycomment_set.select_related('user').all()
             comment_count = comments.count()
             community_like = community.communitylike_set.all()
@@ -454,10 +534,10 @@ class CommunityView(View):
             community_detail = {
                 'id'          : community.id,
                 'name'        : community.user.name,
-                'profileImage': community.user.profile_image,
+                'profileImage': community.user.profile_image_url,
                 'createdAt'   : community.created_at,
                 'content'     : community.description,
-                'likeCount'   : community.user.community_like.all().count(),
+                'likeCount'   : community.like_count,
                 'isLiked'     : get_is_like(request.user.id) if request.user else False,
                 'commentCount': comment_count,
                 'thumbnail'   : community.product.thumbnail_image,
@@ -469,7 +549,7 @@ class CommunityView(View):
             comment_list = [{
                 'id'          : comment.id,
                 'name'        : comment.user.name,
-                'profileImage': comment.user.profile_image,
+                'profileImage': comment.user.profile_image_url,
                 'created_at'  : comment.created_at,
                 'content'     : comment.content
             } for comment in comments]
@@ -598,7 +678,7 @@ class LectureCommentView(View):
             comments = [{
                 'id'          : lecture_comment.id,
                 'name'        : lecture_comment.user.name,
-                'profileImage': lecture_comment.user.profile_image,
+                'profileImage': lecture_comment.user.profile_image_url,
                 'createdAt'   : lecture_comment.created_at,
                 'content'     : lecture_comment.content,
             } for lecture_comment in lecture_comments]
@@ -620,16 +700,13 @@ class CommunityLikeView(View):
             user_id = request.user.id
             community_id = data['community_id']
             
-            if CommunityLike.objects.prefetch_related('community_like_user').filter(user=user_id,
-                                                                                    community=community_id).exists():
-                CommunityLike.objects.get(user=user_id, community=community_id).delete()
-                return JsonResponse({'message': 'REMOVED'}, status=200)
+            is_liked, like_count = toggle_like('community', user_id, community_id)
             
-            CommunityLike(
-                user_id=user_id,
-                community_id=community_id
-            ).save()
-            return JsonResponse({'message': 'LIKED_COMMUNITY'}, status=201)
+            if not is_liked:
+                return JsonResponse({'message': 'REMOVED', 'isLiked': is_liked, 'likeCount': like_count}, status=200)
+            return JsonResponse({'message': 'LIKED_COMMUNITY', 'isLiked': is_liked, 'likeCount': like_count}, status=201)
+        except IntegrityError:
+            return JsonResponse({'message': 'COMMUNITY_NOT_EXIST'}, status=400)
         except KeyError as e:
             return JsonResponse({'message': f'KEY_ERROR:{e}'}, status=400)
         except json.JSONDecodeError as e:
@@ -643,16 +720,14 @@ class ProductLikeView(View):
             user_id = request.user.id
             product_id = data['product_id']
             
-            if ProductLike.objects.prefetch_related('product_like_user').filter(user=user_id,
-                                                                                product=product_id).exists():
-                ProductLike.objects.get(user=user_id, product=product_id).delete()
-                return JsonResponse({'message': 'REMOVED'}, status=200)
+            is_liked, like_count = toggle_like('product', user_id, product_id)
+            invalidate_liked_products(user_id)
             
-            ProductLike(
-                user_id=user_id,
-                product_id=data['product_id']
-            ).save()
-            return JsonResponse({'message': 'LIKED_PRODUCT'}, status=201)
+            if not is_liked:
+                return JsonResponse({'message': 'REMOVED', 'isLiked': is_liked, 'likeCount': like_count}, status=200)
+            return JsonResponse({'message': 'LIKED_PRODUCT', 'isLiked': is_liked, 'likeCount': like_count}, status=201)
+        except IntegrityError:
+            return JsonResponse({'message': 'PRODUCT_NOT_EXIST'}, status=400)
         except KeyError as e:
             return JsonResponse({'message': f'KEY_ERROR:{e}'}, status=400)
         except json.JSONDecodeError as e: